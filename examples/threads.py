@@ -0,0 +1,24 @@
+"""Measure the request rate of a client shared by an increasing number of threads.
+
+    python examples/threads.py /home/user/.kube/config 2000
+"""
+import sys
+import time
+from multiprocessing.pool import ThreadPool
+
+import kubeshift
+
+config = kubeshift.Config.from_file(sys.argv[1])
+requests = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+
+# a single client for every thread, each thread uses its own session
+client = kubeshift.KubernetesClient(config)
+
+for threads in (1, 2, 4, 8, 16, 32):
+    pool = ThreadPool(threads)
+    start = time.time()
+    pool.map(lambda _: client.namespaces().all(), range(requests))
+    elapsed = time.time() - start
+    pool.close()
+    pool.join()
+    print('%2d threads: %8.1f requests/s' % (threads, requests / elapsed))
@@ -1,9 +1,15 @@
 """Kubeshift is a multi-provider Python library for Kubernetes (kube) and Openshift (shift)."""
+import importlib
 import logging
+import os
+import sys
 
 from kubeshift.config import Config  # noqa
-from kubeshift.kubernetes import KubernetesClient  # noqa
-from kubeshift.openshift import OpenshiftClient  # noqa
+from kubeshift.constants import PROFILE_ENV
+
+if os.environ.get(PROFILE_ENV):
+    # profiling of the whole process starts with the import of the package
+    from kubeshift import profiling  # noqa
 
 logging.getLogger().addHandler(logging.NullHandler())
 
@@ -11,3 +17,27 @@ __title__ = 'kubeshift'
 __version__ = '0.0.4'
 __author__ = 'cdrage'
 __license__ = 'LGPL3'
+
+# the clients pull in the HTTP stack: they are imported on first access,
+# so that tools only needing the configuration start fast
+_LAZY = {
+    'KubernetesClient': 'kubeshift.kubernetes',
+    'OpenshiftClient': 'kubeshift.openshift',
+}
+
+__all__ = ['Config'] + sorted(_LAZY)
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        if name not in _LAZY:
+            raise AttributeError('module %r has no attribute %r' % (__name__, name))
+        value = getattr(importlib.import_module(_LAZY[name]), name)
+        globals()[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(globals()) | set(_LAZY))
+else:  # pragma: no cover
+    # no module __getattr__ (PEP 562) before python 3.7
+    from kubeshift.kubernetes import KubernetesClient  # noqa
+    from kubeshift.openshift import OpenshiftClient  # noqa
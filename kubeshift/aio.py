@@ -0,0 +1,616 @@
+"""Asyncio clients.
+
+Coroutine based variants of :py:class:`~kubeshift.KubernetesClient` and
+:py:class:`~kubeshift.OpenshiftClient` running every request on the event
+loop, so that thousands of requests can be in flight at once::
+
+    async with AsyncKubernetesClient(config) as client:
+        pods = await client.pods().items()
+        await asyncio.gather(*[client.create(o) for o in objects])
+
+Requires Python 3.6+ and aiohttp (``pip install kubeshift[aio]``).
+"""
+import asyncio
+import contextlib
+import json
+import logging
+import ssl
+import threading
+
+import aiohttp
+import six
+import yarl
+
+from kubeshift.base import (_OBJECT_ERRORS,
+                            _ClientBase,
+                            _apply_outcome,
+                            _applied_object,
+                            _batch_error,
+                            _delete_propagation,
+                            _format_url,
+                            _group_versions,
+                            _last_applied,
+                            _load_config,
+                            _object_error,
+                            _patch_data,
+                            _version_tuple,
+                            _watch_url)
+from kubeshift.constants import CASCADE_KINDS, DEFAULT_NAMESPACE, LOGGER_DEFAULT
+from kubeshift.exceptions import KubeConnectionError, KubeRequestError
+from kubeshift.openshift import _TemplateMixin, _template_batches
+from kubeshift.queries.base import Query
+from kubeshift.queries.kube_query import KubeQueryMixin
+from kubeshift.queries.shift_query import ShiftQueryMixin
+from kubeshift.queries import utils
+from kubeshift import instrumentation, profiling, templates, tracing, validator
+
+logger = logging.getLogger(LOGGER_DEFAULT)
+
+
+@contextlib.contextmanager
+def _connection_errors(url):
+    """Translate errors raised by aiohttp into KubeConnectionError."""
+    try:
+        yield
+    except aiohttp.ClientSSLError:
+        raise KubeConnectionError('SSL/TLS ERROR: invalid certificate')
+    except asyncio.TimeoutError:
+        raise KubeConnectionError('Timeout when reading from %s' % url)
+    except (aiohttp.ServerDisconnectedError, aiohttp.ClientPayloadError):
+        raise KubeConnectionError('Connection broken when reading from %s' % url)
+    except aiohttp.ClientConnectionError:
+        raise KubeConnectionError('Refused connection to %s' % url)
+
+
+class AsyncQuery(Query):
+    """Performs queries with filters, as coroutines.
+
+    :py:meth:`logs` and :py:meth:`watch` return asynchronous generators.
+    """
+
+    async def all(self):
+        """Perform query with no filters (all results)."""
+        return await self.client.request('get', self.url) or {}
+
+    async def items(self):
+        """Select the list of items from the query results."""
+        return (await self.all()).get('items', [])
+
+    async def metadata(self):
+        """Filter the results to provide only the metadata only."""
+        return [s.get('metadata', {}) for s in await self.items()]
+
+    async def filter(self, status=None):
+        """Filter by status.
+
+        :param str status: filter by `status.phace` value
+        """
+        if status:
+            return [s for s in await self.items() if s.get('status', {}).get('phase') == status]
+
+        return []
+
+    async def by_name(self, name):
+        """Fetch resource by name.
+
+        :param str name: name of a resource
+        :returns: a resource object
+        """
+        if not name:
+            return {}
+        return await self.client.request('get', self.url + '/' + name)
+
+    async def by_selector(self, selectors):
+        """Query resource by labelSelector.
+
+        :param list selectors: a list of selectors (dict) that filters resources by label(s)
+        :returns: list of resources that match selector criteria
+        :rtype: list
+        """
+        qs = utils.selectors_to_qs(selectors)
+        if not qs:
+            return []
+        return (await self.client.request('get', self.url + qs)).get('items', [])
+
+    async def delete(self, selectors=None, fields=None, dry_run=False, propagation_policy=None):
+        """Delete the resources matching the selectors in a single request.
+
+        :param list selectors: a list of selectors (dict) that filters resources by label(s)
+        :param list fields: a list of selectors (dict) that filters resources by field(s)
+        :param bool dry_run: validate the request server-side without persisting it
+        :param str propagation_policy: one of `Foreground`, `Background` or `Orphan`
+        :returns: list object of the deleted resources
+        :raises kubeshift.exceptions.KubeShiftError: if selectors are missing or invalid
+        """
+        return await super(AsyncQuery, self).delete(selectors, fields, dry_run, propagation_policy)
+
+
+class _AsyncClientBase(_ClientBase):
+    """Base asyncio client.
+
+    No request is made by the constructor: the session is opened and the APIs
+    are discovered by :py:meth:`connect`, or when entering the client as an
+    asynchronous context manager.
+    """
+
+    query_class = AsyncQuery
+
+    # a single session serves the event loop
+    session = None
+
+    def __init__(self, config, connections=100):
+        """Constructor.
+
+        :param Config config: An object of the .kube/config configuration
+        :param int connections: maximum number of simultaneous connections to the API
+        """
+        self.kubeconfig = _load_config(config)
+
+        # Check the API url
+        self.base_url = self.kubeconfig.cluster.get('server', 'http://localhost:8080')
+        validator.check_url(self.base_url)
+
+        self.connections = connections
+        self.hooks = dict((event, []) for event in instrumentation.HOOK_EVENTS)
+
+        self.api_resources = {}
+        self.api_subresources = {}
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def connect(self):
+        """Open the session, test the connection and load the API resources."""
+        if self.session is None:
+            self.session = self._connection()
+
+        await self._test_connection(self.base_url + '/api/')
+
+        await self.discover()
+
+    async def discover(self):
+        """Load the API resources served by the server.
+
+        Resources are indexed aside and replace the current ones at once, so
+        that the other tasks keep using complete indexes during a discovery.
+        """
+        start = instrumentation.timer()
+        index = self._discovering = ({}, {})
+        try:
+            await self._discover()
+        finally:
+            self._discovering = None
+        self.api_resources, self.api_subresources = index
+        self.discovery_duration = instrumentation.timer() - start
+
+    async def _discover(self):
+        await self._load_resources('api/v1/', 'v1')
+        await self._load_group_resources('apis/')
+
+    async def close(self):
+        """Close the session and its connections."""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def _connection(self):
+        """Initialize the aiohttp session from the .kube/config credentials."""
+        session_opts = self.kubeconfig.format_session()
+
+        verify = session_opts['verify']
+        context = ssl.create_default_context(cafile=verify if isinstance(verify, six.string_types) else None)
+        if not verify:
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+            logger.warning('CAUTION: TLS verification has been DISABLED')
+        else:
+            logger.debug('Verification will be required for all API calls')
+
+        if session_opts['cert']:
+            context.load_cert_chain(*session_opts['cert'])
+
+        return aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=self.connections, ssl=context),
+                                     headers=session_opts['headers'],
+                                     timeout=aiohttp.ClientTimeout(total=None))
+
+    async def _get_groups(self, url):
+        """Get the groups of APIs available."""
+        return _group_versions(await self.request('get', url))
+
+    async def _get_resources(self, url):
+        """Get the resources available to the API."""
+        data = await self.request('get', url)
+        return data.get('resources', []) if data else []
+
+    async def _add_resources(self, base_url, version):
+        self._index_resources(base_url, version, await self._get_resources(base_url) or [])
+
+    async def _load_resources(self, resource_path, version):
+        await self._add_resources(_format_url(self.base_url, resource_path), version)
+
+    async def _load_group_resources(self, group_path):
+        base_res_api = _format_url(self.base_url, group_path)
+        groups = await self._get_groups(base_res_api)
+        await asyncio.gather(*[self._add_resources(_format_url(base_res_api, g), g) for g in groups])
+
+    async def _test_connection(self, url):
+        """Provide way to validate connection is viable."""
+        await self.request('get', url)
+        logger.debug('Connection successfully tested on URL %s' % url)
+
+    async def request(self, method, url, data=None, headers=None):
+        """
+        Complete the request to the API and fails if the status_code is != 200/201.
+
+        :param str method: put/get/post/patch
+        :param str url: url of the api call
+        :param dict data: object of the data that is being passed (will be converted to json)
+        :param dict headers: request header
+        """
+        status = None
+        content = b''
+        # serialized once, for the request and the size given to the hooks
+        body = json.dumps(data).encode('utf-8') if data is not None else None
+        if body is not None:
+            headers = dict({'Content-Type': 'application/json'}, **(headers or {}))
+
+        event = self._start_request(method, url)
+        try:
+            with self._trace_request(method, url) as span:
+                # urls are already quoted, send them as is
+                with _connection_errors(url):
+                    with tracing.span('http.send'), profiling.measure('network'):
+                        res = await self.session.request(method, yarl.URL(url, encoded=True), data=body, headers=headers)
+                    async with res:
+                        status = res.status
+                        span.set_attribute('http.response.status_code', status)
+                        with tracing.span('http.read') as read_span, profiling.measure('network'):
+                            content = await res.read()
+                            read_span.set_attribute('http.response.body.size', len(content))
+
+                if status not in (200, 201, 202):
+                    raise KubeRequestError('Unable to complete request: Status: %s, Error: %s'
+                                           % (status, res.reason), status)
+                if not content:
+                    return_data = None
+                else:
+                    with tracing.span('json.decode'), profiling.measure('json'):
+                        return_data = json.loads(content.decode('utf-8'))
+        except (KubeConnectionError, KubeRequestError) as ex:
+            self._finish_request(event, status, len(content), ex, len(body or b''))
+            raise
+
+        self._finish_request(event, status, len(content), sent=len(body or b''))
+        return return_data
+
+    async def stream(self, method, url, timeout=None):
+        """
+        Complete a streaming request to the API and yield the response line by line.
+
+        :param str method: http method, usually get
+        :param str url: url of the api call
+        :param float timeout: seconds to wait for the server between two reads
+        :returns: asynchronous generator of lines (str)
+        """
+        timeout = aiohttp.ClientTimeout(total=None, sock_read=timeout)
+        event = self._start_request(method, url)
+        try:
+            with self._trace_request(method, url), _connection_errors(url):
+                res = await self.session.request(method, yarl.URL(url, encoded=True), timeout=timeout)
+        except KubeConnectionError as ex:
+            self._finish_request(event, error=ex)
+            raise
+
+        try:
+            if res.status != 200:
+                ex = KubeRequestError('Unable to complete request: Status: %s, Error: %s'
+                                      % (res.status, res.reason), res.status)
+                self._finish_request(event, res.status, error=ex)
+                raise ex
+            # the hooks see streams up to the response headers
+            self._finish_request(event, res.status)
+            # split lines ourselves, a single watch event may exceed the line limit of aiohttp
+            pending = b''
+            with _connection_errors(url):
+                async for chunk in res.content.iter_any():
+                    lines = (pending + chunk).split(b'\n')
+                    pending = lines.pop()
+                    for line in lines:
+                        yield line.rstrip(b'\r').decode('utf-8')
+            if pending:
+                yield pending.rstrip(b'\r').decode('utf-8')
+        finally:
+            res.release()
+
+    async def watch(self, url, resource_version=None, timeout=None):
+        """
+        Watch the changes of the resources of a collection.
+
+        :param str url: url of the collection, optionally with a query string
+        :param str resource_version: only changes after this version are sent
+        :param int timeout: seconds after which the server ends the watch
+        :returns: asynchronous generator of events (dict with `type` and `object`)
+        """
+        url = _watch_url(url, resource_version, timeout)
+
+        # give the server some slack to end the watch itself
+        read_timeout = timeout + 5 if timeout else None
+        async for line in self.stream('get', url, timeout=read_timeout):
+            if line:
+                with profiling.measure('json'):
+                    event = json.loads(line)
+                yield event
+
+
+class AsyncKubernetesClient(_AsyncClientBase, KubeQueryMixin):
+    """Kubernetes Provider client running on asyncio.
+
+    Query APIs return :py:class:`AsyncQuery` objects.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Constructor."""
+        super(AsyncKubernetesClient, self).__init__(*args, **kwargs)
+
+        self._init_apply()
+        self._stats_lock = threading.Lock()
+
+        # (major, minor) of the server, loaded on first use
+        self._server_version = None
+
+    async def server_version(self):
+        """Retrieve the version of the API server.
+
+        :returns: major and minor version, (0, 0) when unknown
+        :rtype: tuple
+        """
+        if self._server_version is None:
+            try:
+                data = await self.request('get', _format_url(self.base_url, 'version')) or {}
+            except (KubeConnectionError, KubeRequestError):
+                data = {}
+            self._server_version = _version_tuple(data)
+            logger.debug('Server version %s.%s', *self._server_version)
+        return self._server_version
+
+    async def _supports_propagation(self):
+        # propagationPolicy of DeleteOptions is available since Kubernetes 1.6
+        return await self.server_version() >= (1, 6)
+
+    async def create(self, obj, namespace=DEFAULT_NAMESPACE, dry_run=False):
+        """Create an object from the Kubernetes cluster.
+
+        :param dict obj: Object of the artifact being created
+        :param str namespace: Namespace of the kubernetes cluster to be used
+        :param bool dry_run: validate the request server-side without persisting it
+        """
+        kind, name, namespace, url = self._write_url(obj, namespace, dry_run, collection=True)
+        resp = await self.request('post', url, data=obj)
+
+        logger.info('%s `%s` successfully created', kind.capitalize(), name)
+
+        return resp
+
+    async def delete(self, obj, namespace=DEFAULT_NAMESPACE, dry_run=False,
+                     propagation_policy=None, grace_period=None):
+        """Delete an object from the Kubernetes cluster.
+
+        See :py:meth:`kubeshift.base.KubeBase.delete` for the default propagation policy.
+
+        :param dict obj: Object of the artifact being modified
+        :param str namesapce: Namespace of the kubernetes cluster to be used
+        :param bool dry_run: validate the request server-side without persisting it
+        :param str propagation_policy: one of `Foreground`, `Background` or `Orphan`
+        :param int grace_period: seconds given to the object before it is deleted
+        """
+        kind, name, namespace, url = self._write_url(obj, namespace, dry_run)
+
+        if propagation_policy is None and kind in CASCADE_KINDS:
+            propagation_policy, scale_down = _delete_propagation(kind, await self._supports_propagation(), dry_run)
+            if scale_down:
+                await self.scale(obj, namespace)
+
+        resp = await self.request('delete', url, data=utils.delete_options(propagation_policy, grace_period))
+
+        logger.info('%s `%s` successfully deleted', kind.capitalize(), name)
+
+        return resp
+
+    async def replace(self, obj, namespace=DEFAULT_NAMESPACE, dry_run=False):
+        """Replace a resource on the Kubernetes cluster.
+
+        :param dict obj: Object of the artifact being replaced
+        :param str namespace: Namespace of the kubernetes cluster to be used
+        :param bool dry_run: validate the request server-side without persisting it
+        """
+        kind, name, namespace, url = self._write_url(obj, namespace, dry_run)
+        resp = await self.request('put', url, data=obj)
+
+        logger.info('%s `%s` successfully replaced', kind.capitalize(), name)
+
+        return resp
+
+    async def apply(self, obj, namespace=DEFAULT_NAMESPACE, refresh=False, dry_run=False):
+        """Create or update a resource only when the desired state changed.
+
+        See :py:meth:`kubeshift.base.KubeBase.apply` for the annotations and patches.
+
+        :param dict obj: desired state of the resource
+        :param str namespace: Namespace of the kubernetes cluster to be used
+        :param bool refresh: ignore the local cache and always fetch the live resource
+        :param bool dry_run: validate the write server-side without persisting it
+        :returns: the created, patched or live resource (None when skipped from cache)
+        """
+        kind, name, namespace, url, digest = self._apply_target(obj, namespace)
+        if not refresh and self._applied_unchanged(url, digest, kind, name):
+            return None
+
+        try:
+            live = await self.request('get', url)
+        except KubeRequestError as ex:
+            if ex.status_code != 404:
+                raise
+            live = None
+
+        desired = _applied_object(obj, digest)
+        outcome = _apply_outcome(live, digest)
+        if outcome == 'created':
+            resp = await self.create(desired, namespace, dry_run=dry_run)
+        elif outcome == 'patched':
+            resp = await self._patch_applied(desired, namespace, _last_applied(live), dry_run)
+        else:
+            resp = live
+            logger.info('%s `%s` unchanged, skipped', kind.capitalize(), name)
+
+        self._record_applied(url, digest, outcome, dry_run)
+        return resp
+
+    async def _patch_applied(self, desired, namespace, last, dry_run=False):
+        if last is not None:
+            return await self.modify(desired, namespace, previous=last, patch_type='merge', dry_run=dry_run)
+        try:
+            return await self.modify(desired, namespace, dry_run=dry_run)
+        except KubeRequestError as ex:
+            # custom resources do not support strategic merge patches
+            if ex.status_code != 415:
+                raise
+            return await self.modify(desired, namespace, patch_type='merge', dry_run=dry_run)
+
+    async def modify(self, partial, namespace=DEFAULT_NAMESPACE, previous=None, patch_type='json', dry_run=False):
+        """Modify a resource.
+
+        See :py:meth:`kubeshift.base.KubeBase.modify` for the patch formats.
+
+        :param dict partial: changes to be applied to existing resource content
+        :param str namespace: object name and auth scope, such as for teams and projects
+        :param dict previous: previous state of the resource to compute the patch against
+        :param str patch_type: `json` or `merge`, format of the computed patch
+        :param bool dry_run: validate the request server-side without persisting it
+        :returns: the modified resource (None when there is no difference with previous)
+        """
+        kind, name, namespace, url = self._write_url(partial, namespace, dry_run)
+
+        headers, data = _patch_data(partial, previous, patch_type)
+        if not data:
+            logger.debug('%s `%s` unchanged, nothing to modify', kind.capitalize(), name)
+            return None
+
+        resp = await self.request('patch', url, data=data, headers=headers)
+
+        logger.info('%s `%s` successfully modified', kind.capitalize(), name)
+
+        return resp
+
+    async def scale(self, obj, namespace=DEFAULT_NAMESPACE, replicas=0):
+        """Scale replicas up or down.
+
+        :param dict obj: Object of the artifact being modified
+        :param str namesapce: Namespace of the kubernetes cluster to be used
+        :param int replicas: Default 0, size of the amount of replicas to scale
+        :returns: the Scale object or the scaled resource
+        """
+        apiver, kind, name, namespace = self._written(obj, namespace)
+        url, headers, patch = self._scale_patch(apiver, kind, namespace, name, replicas)
+        resp = await self.request('patch', url, data=patch, headers=headers)
+
+        logger.info('`%s` successfully scaled to %s', name, replicas)
+
+        return resp
+
+    async def update_status(self, obj, namespace=DEFAULT_NAMESPACE, dry_run=False):
+        """Replace the status of a resource through its `status` subresource.
+
+        :param dict obj: Object of the artifact holding the new status
+        :param str namespace: Namespace of the kubernetes cluster to be used
+        :param bool dry_run: validate the request server-side without persisting it
+        :returns: the updated resource
+        """
+        kind, name, namespace, url = self._write_url(obj, namespace, dry_run, subresource='status')
+        resp = await self.request('put', url, data=obj)
+
+        logger.info('%s `%s` status successfully updated', kind.capitalize(), name)
+
+        return resp
+
+    async def evict(self, obj, namespace=DEFAULT_NAMESPACE, grace_period=None, dry_run=False):
+        """Evict a pod, honoring its pod disruption budgets.
+
+        :param dict obj: Object of the pod being evicted
+        :param str namespace: Namespace of the kubernetes cluster to be used
+        :param int grace_period: seconds given to the pod before it is deleted
+        :param bool dry_run: validate the request server-side without persisting it
+        """
+        apiver, kind, name, namespace = self._written(obj, namespace, dry_run)
+        url, eviction = self._eviction(apiver, kind, namespace, name, grace_period, dry_run)
+        resp = await self.request('post', url, data=eviction)
+
+        logger.info('%s `%s` successfully evicted', kind.capitalize(), name)
+
+        return resp
+
+
+class AsyncOpenshiftClient(_TemplateMixin, AsyncKubernetesClient, ShiftQueryMixin):
+    """Openshift Provider client running on asyncio.
+
+    Template objects are processed as by :py:class:`~kubeshift.OpenshiftClient`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Constructor."""
+        super(AsyncOpenshiftClient, self).__init__(*args, **kwargs)
+
+        self.template_cache = templates.TemplateCache()
+
+    async def _discover(self):
+        await super(AsyncOpenshiftClient, self)._discover()
+        await self._load_resources('oapi/v1/', 'v1')
+
+    async def create(self, obj, namespace=DEFAULT_NAMESPACE, dry_run=False):
+        """Create an object from the Openshift cluster."""
+        apiver, kind, _ = validator.validate(obj)
+        if kind == 'Template':
+            return await self._process_template(apiver, kind, 'create', obj, namespace, dry_run=dry_run)
+        return await super(AsyncOpenshiftClient, self).create(obj, namespace, dry_run=dry_run)
+
+    async def delete(self, obj, namespace=DEFAULT_NAMESPACE, dry_run=False,
+                     propagation_policy=None, grace_period=None):
+        """Delete an object from the Openshift cluster."""
+        apiver, kind, _ = validator.validate(obj)
+        kwargs = dict(dry_run=dry_run, propagation_policy=propagation_policy, grace_period=grace_period)
+        if kind == 'Template':
+            return await self._process_template(apiver, kind, 'delete', obj, namespace, **kwargs)
+        return await super(AsyncOpenshiftClient, self).delete(obj, namespace, **kwargs)
+
+    async def _render_template(self, apiver, kind, obj, namespace):
+        data = self._render_locally(obj)
+        if data is None:
+            data = await self.request('post', self._processed_templates_url(apiver, kind, namespace), data=obj) or {}
+        return data
+
+    async def _process_template(self, apiver, kind, action, obj, namespace, **kwargs):
+        with self._template_span(action, obj, namespace):
+            key, generated, data = self._cached_template(obj, namespace, action)
+            if data is None:
+                data = await self._render_template(apiver, kind, obj, namespace)
+                self.template_cache.set(key, data, persist=not generated)
+
+            func = getattr(super(AsyncOpenshiftClient, self), action)
+
+            async def process(o):
+                try:
+                    await func(o, namespace, **kwargs)
+                except _OBJECT_ERRORS as ex:
+                    return _object_error(o, ex)
+
+            errors = []
+            for objects in _template_batches(data, action, errors):
+                errors.extend(e for e in await asyncio.gather(*[process(o) for o in objects]) if e)
+
+            if errors:
+                raise _batch_error(action, errors, len(data.get('objects', [])))
+
+            return data
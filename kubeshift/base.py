@@ -1,22 +1,38 @@
 """Base class for providers."""
 import abc
+import collections
+import contextlib
+import copy
+import hashlib
+import json
 import logging
+import math
 import os
+import re
+import threading
+import time
 
 import requests
 import six
 import six.moves.urllib.parse as urlparse
-import yaml
 
 from kubeshift.config import Config
-from kubeshift.constants import (DEFAULT_NAMESPACE,
+from kubeshift.constants import (CASCADE_KINDS,
+                                 DEFAULT_NAMESPACE,
+                                 LAST_APPLIED_ANNOTATION,
+                                 LAST_APPLIED_CONFIG_ANNOTATION,
                                  LOGGER_DEFAULT)
-from kubeshift.exceptions import KubeConnectionError, KubeRequestError, KubeShiftError
+from kubeshift.exceptions import KubeBatchError, KubeConnectionError, KubeRequestError, KubeShiftError, KubeTimeoutError
+from kubeshift.queries.base import Query
 from kubeshift.queries.kube_query import KubeQueryMixin
-from kubeshift import validator
+from kubeshift.queries import utils
+from kubeshift import conditions, diff, instrumentation, profiling, tracing, validator
 
 logger = logging.getLogger(LOGGER_DEFAULT)
 
+#: errors of the requests on an object, collected by the batches
+_OBJECT_ERRORS = (KubeShiftError, KubeConnectionError, KubeRequestError)
+
 
 def _format_url(urlbase, urlpath):
     if not urlbase.endswith('/'):
@@ -26,51 +42,359 @@ def _format_url(urlbase, urlpath):
     return urlparse.urljoin(urlbase, urlpath)
 
 
+@contextlib.contextmanager
+def _connection_errors(url):
+    """Translate errors raised by requests into KubeConnectionError."""
+    try:
+        yield
+    except requests.exceptions.SSLError:
+        raise KubeConnectionError('SSL/TLS ERROR: invalid certificate')
+    except requests.exceptions.ConnectTimeout:
+        raise KubeConnectionError('Timeout when connecting to  %s' % url)
+    except requests.exceptions.ReadTimeout:
+        raise KubeConnectionError('Timeout when reading from %s' % url)
+    except requests.exceptions.ConnectionError:
+        raise KubeConnectionError('Refused connection to %s' % url)
+    except requests.exceptions.ChunkedEncodingError:
+        raise KubeConnectionError('Connection broken when reading from %s' % url)
+
+
+def _concurrent_map(func, items, workers=1):
+    """Apply func to every item using up to `workers` threads.
+
+    Results are returned in the order of the items. The first error raised
+    by func is propagated to the caller.
+    """
+    items = list(items)
+    if not workers or workers <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
+
+    # imported on first use, like yaml, to keep the import of the package fast
+    from multiprocessing.pool import ThreadPool
+    pool = ThreadPool(min(workers, len(items)))
+    try:
+        return pool.map(tracing.wrap(func), items)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def _batch_map(func, objs, workers=1, action='process', fail_fast=False):
+    """Apply func to every object, collecting the failures rather than stopping.
+
+    Every object is processed whatever the number of workers, the results
+    are returned in the order of the objects. With `fail_fast`, objects are
+    processed one by one and the first error is raised as is instead.
+
+    :raises kubeshift.exceptions.KubeBatchError: once every object was processed, if any failed
+    """
+    if fail_fast:
+        return [func(obj) for obj in objs]
+
+    def process(obj):
+        try:
+            return func(obj), None
+        except _OBJECT_ERRORS as ex:
+            return None, _object_error(obj, ex)
+
+    outcomes = _concurrent_map(process, objs, workers)
+    results = [result for result, _ in outcomes]
+    errors = [error for _, error in outcomes if error]
+    if errors:
+        raise _batch_error(action, errors, len(outcomes), results)
+    return results
+
+
+def _object_error(obj, ex):
+    """(kind, name, exception) of an object which failed to be processed."""
+    meta = (obj.get('metadata') or {}) if isinstance(obj, dict) else {}
+    kind = obj.get('kind') if isinstance(obj, dict) else None
+    return kind, meta.get('name') if isinstance(meta, dict) else None, ex
+
+
+def _batch_error(action, errors, count, results=None):
+    """Error reporting the objects of a batch which failed to be processed."""
+    return KubeBatchError('Unable to %s %d of %d objects: %s' % (
+        action, len(errors), count, ', '.join('%s `%s`: %s' % e for e in errors)), errors, results)
+
+
+def _load_config(config):
+    """Load a configuration given as a Config, a dict or the path of a file."""
+    if isinstance(config, dict):
+        config = Config(config)
+    # assume type is string as the previous handled input
+    # as a dict, so the only remaining option when not
+    # an instance of Config is a file location.
+    if not isinstance(config, Config):
+        config = Config.from_file(config)
+    return config
+
+
+def _group_versions(data):
+    """List the group versions of an API groups list."""
+    groups = []
+    for group in (data or {}).get('groups', []):
+        for ver in group.get('versions', []):
+            if ver.get('groupVersion'):
+                groups.append(ver.get('groupVersion'))
+    return groups
+
+
+def _watch_url(url, resource_version=None, timeout=None):
+    """Add the watch parameters to the url of a collection."""
+    params = [('watch', 'true')]
+    if resource_version:
+        params.append(('resourceVersion', resource_version))
+    if timeout:
+        params.append(('timeoutSeconds', int(timeout)))
+    return url + ('&' if '?' in url else '?') + urlparse.urlencode(params)
+
+
+def _content_length(res):
+    """Size of the content of a response, 0 when there is no response."""
+    return len(res.content or b'') if res is not None else 0
+
+
+def _request_length(res):
+    """Size of the content sent by the request of a response, 0 when there is no response."""
+    request = getattr(res, 'request', None)
+    return len(request.body or b'') if request is not None else 0
+
+
+def _version_tuple(data):
+    """Parse the (major, minor) version of a server version object."""
+    # minor versions may carry a suffix such as `6+`
+    return tuple(int(re.sub('[^0-9]', '', data.get(k) or '') or 0) for k in ('major', 'minor'))
+
+
+def _patch_data(partial, previous=None, patch_type='json'):
+    """Compute the headers and content of the patch of a resource.
+
+    The status and server side metadata are left out of the difference, so
+    that ``previous`` may be the live object.
+    """
+    if previous is None and patch_type == 'merge':
+        headers = {'Content-Type': 'application/merge-patch+json'}
+        data = partial
+    elif previous is None:
+        headers = {'Content-Type': 'application/strategic-merge-patch+json'}
+        data = partial
+    elif patch_type == 'json':
+        headers = {'Content-Type': 'application/json-patch+json'}
+        data = diff.json_patch(diff.without_server_fields(previous), diff.without_server_fields(partial))
+        version = previous.get('metadata', {}).get('resourceVersion')
+        if data and version:
+            data.insert(0, {'op': 'test', 'path': '/metadata/resourceVersion', 'value': version})
+    elif patch_type == 'merge':
+        headers = {'Content-Type': 'application/merge-patch+json'}
+        data = diff.merge_patch(diff.without_server_fields(previous), diff.without_server_fields(partial))
+    else:
+        raise KubeShiftError('Unknown patch type: %s' % patch_type)
+    return headers, data
+
+
+def _applied_config(obj):
+    """Serialize the object without the last-applied annotations."""
+    content = copy.deepcopy(obj)
+    annotations = content.get('metadata', {}).get('annotations', {})
+    annotations.pop(LAST_APPLIED_ANNOTATION, None)
+    annotations.pop(LAST_APPLIED_CONFIG_ANNOTATION, None)
+    return json.dumps(content, sort_keys=True, separators=(',', ':'))
+
+
+def _applied_hash(obj):
+    """Compute a stable hash of the object ignoring the last-applied annotations."""
+    return hashlib.sha1(_applied_config(obj).encode('utf-8')).hexdigest()
+
+
+def _last_applied(live):
+    """Last applied state of a live object, with the annotations it carries.
+
+    :returns: the applied object, None when it was not applied by kubeshift
+    """
+    annotations = (live.get('metadata') or {}).get('annotations') or {}
+    try:
+        last = json.loads(annotations[LAST_APPLIED_CONFIG_ANNOTATION])
+    except (KeyError, TypeError, ValueError):
+        return None
+    if not isinstance(last, dict):
+        return None
+    last_annotations = last.setdefault('metadata', {}).setdefault('annotations', {})
+    for key in (LAST_APPLIED_ANNOTATION, LAST_APPLIED_CONFIG_ANNOTATION):
+        if key in annotations:
+            last_annotations[key] = annotations[key]
+    return last
+
+
+def _applied_object(obj, digest):
+    """Desired state of an applied object, with its last-applied annotations."""
+    desired = copy.deepcopy(obj)
+    annotations = desired.setdefault('metadata', {}).setdefault('annotations', {})
+    annotations[LAST_APPLIED_ANNOTATION] = digest
+    annotations[LAST_APPLIED_CONFIG_ANNOTATION] = _applied_config(obj)
+    return desired
+
+
+def _apply_outcome(live, digest):
+    """How an object is applied given its live state: `created`, `skipped` or `patched`."""
+    if not live:
+        return 'created'
+    if live.get('metadata', {}).get('annotations', {}).get(LAST_APPLIED_ANNOTATION) == digest:
+        return 'skipped'
+    return 'patched'
+
+
+def _delete_propagation(kind, supported, dry_run=False):
+    """Default propagation policy of the delete of a controller.
+
+    :param str kind: kind of the controller, one of CASCADE_KINDS
+    :param bool supported: whether the server supports propagation policies
+    :param bool dry_run: whether the delete is only validated
+    :returns: the policy and whether the controller must be scaled down first
+    :rtype: tuple
+    """
+    if supported:
+        return 'Background', False
+    # legacy servers: scale down so that the pods are removed
+    return None, kind == 'ReplicationController' and not dry_run
+
+
 @six.add_metaclass(abc.ABCMeta)
 class _ClientBase(object):
-    """Base Client."""
+    """Base Client.
+
+    A client can be shared by many threads: each thread sends its requests
+    through its own session (see :py:attr:`session`), all of them sharing the
+    connections of the client, and the API resources are replaced at once
+    by :py:meth:`discover`.
+
+    A client can be used by forked processes or pickled to be sent to other
+    processes: sessions are created again in the new process while the
+    configuration and the API resources are kept, skipping the discovery.
+    """
+
+    #: class of the queries returned by the query APIs
+    query_class = Query
 
-    def __init__(self, config):
+    # indexes being built by a discovery, see discover()
+    _discovering = None
+    # options of the sessions, see _session_options()
+    _session_opts = None
+    # attributes bound to the current process, see _init_process()
+    _process_attrs = ('_pid', '_local', '_discovery_lock', '_pool')
+    # api_resources and the kinds of their collections, see _resource_index()
+    _resource_index_cache = None
+
+    #: seconds taken by the last discovery of the API resources
+    discovery_duration = None
+
+    #: transport adapter mounted on the sessions for the API server, if any
+    adapter = None
+
+    # last applied hashes keyed by url, see _init_apply()
+    _applied = None
+
+    #: maximum number of connections kept open by host, shared by the threads
+    pool_maxsize = 32
+
+    def __init__(self, config, adapter=None):
         """Establish session using configurations.
 
         :param Config config: An object of the .kube/config configuration
+        :param requests.adapters.BaseAdapter adapter: transport adapter of the
+            requests to the API, such as the recorder of a :py:class:`~kubeshift.cassette.Cassette`
         """
-        if isinstance(config, dict):
-            config = Config(config)
-        # assume type is string as the previous handled input
-        # as a dict, so the only remaining option when not
-        # an instance of Config is a file location.
-        if not isinstance(config, Config):
-            config = Config.from_file(config)
-        self.kubeconfig = config
+        self.kubeconfig = _load_config(config)
+        self.adapter = adapter
 
         # Check the API url
         self.base_url = self.kubeconfig.cluster.get('server', 'http://localhost:8080')
         validator.check_url(self.base_url)
 
+        # hooks called around requests, see register_hook()
+        self.hooks = dict((event, []) for event in instrumentation.HOOK_EVENTS)
+
         # Initialize the connection using all the .kube/config credentials
+        self._init_process()
         self.session = self._connection()
 
         # Test the connection before proceeding
         self._test_connection(self.base_url + '/api/')
 
         self.api_resources = {}
+        self.api_subresources = {}
         # Load API Resources
+        self.discover()
+
+    def __getstate__(self):
+        """Pickle the client without its sessions and locks."""
+        state = self.__dict__.copy()
+        for attr in self._process_attrs:
+            state.pop(attr, None)
+        return state
+
+    def __setstate__(self, state):
+        """Restore a pickled client, sessions are created on first use."""
+        self.__dict__.update(state)
+        self._init_process()
+
+    def _init_process(self):
+        """Create the sessions storage, connection pool and locks of the current process."""
+        self._pid = os.getpid()
+        self._local = threading.local()
+        self._discovery_lock = threading.RLock()
+        # connections pooled for every session, which come and go with the
+        # threads of the batches (the adapter is thread-safe, sessions are not)
+        self._pool = requests.adapters.HTTPAdapter(pool_maxsize=self.pool_maxsize)
+
+    @property
+    def session(self):
+        """Session of the current thread.
+
+        requests sessions are not meant to be shared by threads, every thread
+        gets its own session, created on first use with the same options. The
+        sessions share the connection pool of the client, so that the threads
+        of a batch reuse the connections opened by the previous ones.
+
+        A forked process gets new sessions and connections as well: the
+        connections of the parent process must not be used by both processes.
+        """
+        if self._pid != os.getpid():
+            logger.debug('Process forked, creating new sessions')
+            self._init_process()
+
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = self._connection()
+        return session
+
+    @session.setter
+    def session(self, session):
+        self._local.session = session
+
+    def discover(self):
+        """Load the API resources served by the server.
+
+        Resources are indexed aside and replace the current ones at once, so
+        that other threads keep using complete indexes during a discovery.
+        """
+        with self._discovery_lock:
+            start = instrumentation.timer()
+            index = self._discovering = ({}, {})
+            try:
+                self._discover()
+            finally:
+                self._discovering = None
+            self.api_resources, self.api_subresources = index
+            self.discovery_duration = instrumentation.timer() - start
+
+    def _discover(self):
         self._load_resources('api/v1/', 'v1')
         self._load_group_resources('apis/')
 
     def _get_groups(self, url):
         """Get the groups of APIs available."""
-        data = self.request('get', url)
-        if not data:
-            return []
-
-        groups = []
-        for group in data.get('groups', []):
-            for ver in group.get('versions', []):
-                if ver.get('groupVersion'):
-                    groups.append(ver.get('groupVersion'))
-        return groups
+        return _group_versions(self.request('get', url))
 
     def _get_resources(self, url):
         """
@@ -82,15 +406,41 @@ class _ClientBase(object):
         return data.get('resources', []) if data else []
 
     def _add_resources(self, base_url, version):
-        self.api_resources.setdefault(version, {})
+        self._index_resources(base_url, version, self._get_resources(base_url) or [])
 
-        for res in self._get_resources(base_url) or []:
+    def _index_resources(self, base_url, version, resources):
+        api_resources, api_subresources = self._discovering or (self.api_resources, self.api_subresources)
+        api_resources.setdefault(version, {})
+        api_subresources.setdefault(version, {})
+
+        # several resources may serve the same kind (ex. deploymentconfigs and
+        # generatedeploymentconfigs), prefer the one named after the kind.
+        names = {}
+        for res in resources:
             if '/' in res['name']:
                 continue
+            if res['kind'] in names and not res['name'].startswith(res['kind'].lower()):
+                continue
+            names[res['kind']] = res['name']
             ep = res['name']
             if res['namespaced']:
                 ep = 'namespaces/{namespace}/' + ep
-            self.api_resources[version][res['kind']] = _format_url(base_url, ep)
+            api_resources[version][res['kind']] = _format_url(base_url, ep)
+
+        # subresources are indexed by the kind of their parent resource, kinds
+        # with the same subresources share a single frozenset
+        kinds = dict((name, kind) for kind, name in names.items())
+        subresources = {}
+        for res in resources:
+            if '/' not in res['name']:
+                continue
+            parent, sub = res['name'].split('/', 1)
+            if parent in kinds:
+                subresources.setdefault(kinds[parent], set()).add(sub)
+        shared = {}
+        for kind, subs in subresources.items():
+            subs = frozenset(subs)
+            api_subresources[version][kind] = shared.setdefault(subs, subs)
 
     def _load_resources(self, resource_path, version):
         # Gather what end-points we will be using
@@ -117,26 +467,59 @@ class _ClientBase(object):
         """
         connection = requests.Session()
 
-        session_opts = self.kubeconfig.format_session()
-
-        # Check to see if verification has been disabled, if it has
-        # disable tls-verification
-        if not session_opts['verify']:
-            # Disable the 'InsecureRequestWarning' notifications.
-            # As per: https://github.com/kennethreitz/requests/issues/2214
-            # Instead make a large one-time noticable warning instead
-            requests.packages.urllib3.disable_warnings()
-            logger.warning('CAUTION: TLS verification has been DISABLED')
-        else:
-            logger.debug('Verification will be required for all API calls')
-
+        # sessions must not share mutable options such as headers
+        session_opts = copy.deepcopy(self._session_options())
         for opt in session_opts:
             if opt:
                 setattr(connection, opt, session_opts[opt])
 
+        for prefix in ('https://', 'http://'):
+            connection.mount(prefix, self._pool)
+        if self.adapter is not None:
+            connection.mount(self.base_url, self.adapter)
+
         return connection
 
-    def _generate_url(self, api_version, kind, namespace=None, name=None, params=None):
+    def _session_options(self):
+        """Read the session options from the configuration, once."""
+        if self._session_opts is None:
+            session_opts = self.kubeconfig.format_session()
+
+            # Check to see if verification has been disabled, if it has
+            # disable tls-verification
+            if not session_opts['verify']:
+                # Disable the 'InsecureRequestWarning' notifications.
+                # As per: https://github.com/kennethreitz/requests/issues/2214
+                # Instead make a large one-time noticable warning instead
+                requests.packages.urllib3.disable_warnings()
+                logger.warning('CAUTION: TLS verification has been DISABLED')
+            else:
+                logger.debug('Verification will be required for all API calls')
+
+            self._session_opts = session_opts
+        return self._session_opts
+
+    def has_subresource(self, api_version, kind, subresource):
+        """Check if the API provides a subresource for a kind.
+
+        :param str api_version: version of API to use
+        :param str kind: the object type of API to use
+        :param str subresource: name of the subresource such as `scale`, `status` or `eviction`
+        :rtype: bool
+        """
+        return subresource in self.api_subresources.get(api_version, {}).get(kind, ())
+
+    def subresources(self, api_version, kind):
+        """List the subresources the API provides for a kind.
+
+        :param str api_version: version of API to use
+        :param str kind: the object type of API to use
+        :rtype: list
+        """
+        return sorted(self.api_subresources.get(api_version, {}).get(kind, ()))
+
+    @profiling.measured('url')
+    def _generate_url(self, api_version, kind, namespace=None, name=None, params=None, subresource=None):
         """
         Generate the required URL using API resources.
 
@@ -146,6 +529,7 @@ class _ClientBase(object):
             namespace (str): k8s namespace
             name (str): Name of the object being passed
             params (arr): Extra params passed such as timeout=300
+            subresource (str): Subresource of the named object such as scale, status or log
 
         Returns:
             url (str): The URL to be used / artifact URL
@@ -159,11 +543,175 @@ class _ClientBase(object):
         if name:
             url = _format_url(url, name)
 
+        if subresource:
+            if not name or not self.has_subresource(api_version, kind, subresource):
+                raise KubeShiftError('No API matching version={} kind={} subresource={}'.format(
+                    api_version, kind, subresource))
+            url = _format_url(url, subresource)
+
         if params:
             url = url + '?{}'.format(urlparse.urlencode(params))
 
         return url
 
+    def _scale_patch(self, apiver, kind, namespace, name, replicas):
+        # url, headers and content of the patch scaling an object
+        if self.has_subresource(apiver, kind, 'scale'):
+            url = self._generate_url(apiver, kind, namespace, name, subresource='scale')
+            headers = {'Content-Type': 'application/merge-patch+json'}
+            patch = {'spec': {'replicas': replicas}}
+        else:
+            url = self._generate_url(apiver, kind, namespace, name)
+            headers = {'Content-Type': 'application/json-patch+json'}
+            patch = [{'op': 'replace',
+                      'path': '/spec/replicas',
+                      'value': replicas}]
+        return url, headers, patch
+
+    def _eviction(self, apiver, kind, namespace, name, grace_period=None, dry_run=False):
+        # url and content of the eviction of a pod
+        url = self._generate_url(apiver, kind, namespace, name, utils.dry_run_params(dry_run), subresource='eviction')
+        eviction = {'apiVersion': 'policy/v1beta1', 'kind': 'Eviction',
+                    'metadata': {'name': name, 'namespace': namespace}}
+        options = utils.delete_options(grace_period=grace_period)
+        if options:
+            eviction['deleteOptions'] = options
+        return url, eviction
+
+    def _written(self, obj, namespace, dry_run=False):
+        """Validate an object about to be written, forgetting its applied hash.
+
+        :returns: api version, kind, name and namespace of the object
+        :rtype: tuple
+        """
+        apiver, kind, name = validator.validate(obj)
+        namespace = validator.check_namespace(obj, namespace)
+        self._forget_applied(apiver, kind, namespace, name, dry_run)
+        return apiver, kind, name, namespace
+
+    def _write_url(self, obj, namespace, dry_run=False, collection=False, subresource=None):
+        """Validate an object about to be written and compute the url of the request.
+
+        :returns: kind, name and namespace of the object, url of the request
+        :rtype: tuple
+        """
+        apiver, kind, name, namespace = self._written(obj, namespace, dry_run)
+        url = self._generate_url(apiver, kind, namespace, None if collection else name,
+                                 utils.dry_run_params(dry_run), subresource=subresource)
+        return kind, name, namespace, url
+
+    def _init_apply(self):
+        # counters and last applied hashes (keyed by url) used by apply
+        self.apply_stats = {'created': 0, 'patched': 0, 'skipped': 0}
+        self._applied = {}
+
+    def _apply_target(self, obj, namespace):
+        """Validate an object being applied.
+
+        :returns: kind, name and namespace of the object, its url and hash
+        :rtype: tuple
+        """
+        apiver, kind, name = validator.validate(obj)
+        namespace = validator.check_namespace(obj, namespace)
+        return kind, name, namespace, self._generate_url(apiver, kind, namespace, name), _applied_hash(obj)
+
+    def _applied_unchanged(self, url, digest, kind, name):
+        # applied unchanged by this client, counted as skipped
+        if self._applied.get(url) != digest:
+            return False
+        self._count_applied('skipped')
+        logger.debug('%s `%s` unchanged since last apply', kind.capitalize(), name)
+        return True
+
+    def _record_applied(self, url, digest, outcome, dry_run=False):
+        self._count_applied(outcome)
+        if not dry_run:
+            self._applied[url] = digest
+
+    def _forget_applied(self, apiver, kind, namespace, name, dry_run=False):
+        # writes other than apply leave the live object unknown to the cache
+        if self._applied and not dry_run:
+            self._applied.pop(self._generate_url(apiver, kind, namespace, name), None)
+
+    def _forget_applied_collection(self, url):
+        # every object of a collection, after a delete by selectors
+        if not self._applied:
+            return
+        prefix = url.split('?', 1)[0].rstrip('/') + '/'
+        for key in [k for k in list(self._applied) if k.startswith(prefix)]:
+            self._applied.pop(key, None)
+
+    def _count_applied(self, outcome):
+        with self._stats_lock:
+            self.apply_stats[outcome] += 1
+
+    def register_hook(self, event, hook):
+        """Register a hook called around every request.
+
+        Hooks receive a :py:class:`~kubeshift.instrumentation.RequestEvent`:
+        `before` hooks before the request is sent, `after` hooks once the
+        response is read and `error` hooks when the request fails. Errors
+        raised by hooks are logged and ignored.
+
+        :param str event: one of `before`, `after` or `error`
+        :param hook: callable receiving the event
+        :raises kubeshift.exceptions.KubeShiftError: if the event is unknown
+        """
+        if event not in self.hooks:
+            raise KubeShiftError('Unknown hook event: %s' % event)
+        self.hooks[event].append(hook)
+
+    def deregister_hook(self, event, hook):
+        """Remove a hook.
+
+        :returns: True if the hook was registered
+        :rtype: bool
+        """
+        try:
+            self.hooks[event].remove(hook)
+            return True
+        except (KeyError, ValueError):
+            return False
+
+    def _resource_index(self):
+        # rebuilt when the discovery replaces api_resources
+        resources = getattr(self, 'api_resources', {})
+        cached = self._resource_index_cache
+        if cached is None or cached[0] is not resources:
+            cached = self._resource_index_cache = (resources, instrumentation.resource_index(resources))
+        return cached[1]
+
+    def _call_hooks(self, name, event):
+        for hook in list(self.hooks[name]):
+            try:
+                hook(event)
+            except Exception:
+                logger.warning('Request hook %r failed', hook, exc_info=True)
+
+    def _start_request(self, method, url):
+        """Describe a request to the hooks, None when no hook is registered."""
+        if not any(self.hooks.values()):
+            return None
+        template, kind = instrumentation.describe_url(url, self._resource_index())
+        event = instrumentation.RequestEvent(method, url, template, kind)
+        self._call_hooks('before', event)
+        event.start = instrumentation.timer()
+        return event
+
+    def _finish_request(self, event, status=None, size=0, error=None, sent=0):
+        # sizes are given as callables to only be computed for the hooks
+        if event is not None:
+            event.finish(status, size() if callable(size) else size, error, sent() if callable(sent) else sent)
+            self._call_hooks('error' if error else 'after', event)
+
+    def _trace_request(self, method, url):
+        """Span of a request, named after its method and url template."""
+        if not tracing.enabled():
+            return tracing.span(method)
+        template, kind = instrumentation.describe_url(url, self._resource_index())
+        return tracing.span('%s %s' % (method.upper(), template), {
+            'http.request.method': method.upper(), 'url.full': url, 'kubeshift.kind': kind})
+
     def request(self, method, url, data=None, headers=None):
         """
         Complete the request to the API and fails if the status_code is != 200/201.
@@ -175,29 +723,94 @@ class _ClientBase(object):
         """
         status_code = None
         return_data = None
+        res = None
 
+        event = self._start_request(method, url)
         try:
-            res = self.session.request(method, url, headers=headers, json=data)
-            status_code = res.status_code
-            if res.ok and res.text:
-                return_data = res.json()
-        except requests.exceptions.SSLError:
-            raise KubeConnectionError('SSL/TLS ERROR: invalid certificate')
-        except requests.exceptions.ConnectTimeout:
-            raise KubeConnectionError('Timeout when connecting to  %s' % url)
-        except requests.exceptions.ReadTimeout:
-            raise KubeConnectionError('Timeout when reading from %s' % url)
-        except requests.exceptions.ConnectionError:
-            raise KubeConnectionError('Refused connection to %s' % url)
-
-        # 200 = OK
-        # 201 = PENDING
-        # EVERYTHING ELSE == FAIL
-        if status_code is not 200 and status_code is not 201:
-            raise KubeRequestError('Unable to complete request: Status: %s, Error: %s'
-                                   % (status_code, res.reason))
+            with self._trace_request(method, url) as span:
+                with _connection_errors(url):
+                    # connection, TLS and sending up to the response headers
+                    with tracing.span('http.send'), profiling.measure('network'):
+                        res = self.session.request(method, url, headers=headers, json=data, stream=True)
+                    status_code = res.status_code
+                    span.set_attribute('http.response.status_code', status_code)
+                    with tracing.span('http.read') as read_span, profiling.measure('network'):
+                        read_span.set_attribute('http.response.body.size', len(res.content or b''))
+                    if res.ok and res.text:
+                        with tracing.span('json.decode'), profiling.measure('json'):
+                            return_data = res.json()
+
+                # 200 = OK
+                # 201 = PENDING
+                # 202 = ACCEPTED
+                # EVERYTHING ELSE == FAIL
+                if status_code not in (200, 201, 202):
+                    raise KubeRequestError('Unable to complete request: Status: %s, Error: %s'
+                                           % (status_code, res.reason), status_code)
+        except (KubeConnectionError, KubeRequestError) as ex:
+            self._finish_request(event, status_code, lambda: _content_length(res), ex, lambda: _request_length(res))
+            raise
+
+        self._finish_request(event, status_code, lambda: _content_length(res), sent=lambda: _request_length(res))
         return return_data
 
+    def stream(self, method, url, timeout=None):
+        """
+        Complete a streaming request to the API and yield the response line by line.
+
+        The response content is never loaded as a whole, which suits watches and
+        logs of unbounded size. The connection is released once the generator is
+        exhausted or closed.
+
+        :param str method: http method, usually get
+        :param str url: url of the api call
+        :param float timeout: seconds to wait for the server between two reads
+        :returns: generator of lines (str)
+        """
+        event = self._start_request(method, url)
+        try:
+            # the span ends at the response headers, like the hooks
+            with self._trace_request(method, url), profiling.measure('network'), _connection_errors(url):
+                res = self.session.request(method, url, stream=True, timeout=timeout)
+        except KubeConnectionError as ex:
+            self._finish_request(event, error=ex)
+            raise
+
+        try:
+            if res.status_code != 200:
+                ex = KubeRequestError('Unable to complete request: Status: %s, Error: %s'
+                                      % (res.status_code, res.reason), res.status_code)
+                self._finish_request(event, res.status_code, error=ex)
+                raise ex
+            # the hooks see streams up to the response headers
+            self._finish_request(event, res.status_code)
+            if res.encoding is None:
+                res.encoding = 'utf-8'
+            with _connection_errors(url):
+                for line in res.iter_lines(decode_unicode=True):
+                    yield line
+        finally:
+            res.close()
+
+    def watch(self, url, resource_version=None, timeout=None):
+        """
+        Watch the changes of the resources of a collection.
+
+        :param str url: url of the collection, optionally with a query string
+        :param str resource_version: only changes after this version are sent
+        :param int timeout: seconds after which the server ends the watch
+        :returns: generator of events (dict with `type` and `object`)
+        """
+        url = _watch_url(url, resource_version, timeout)
+
+        # give the server some slack to end the watch itself
+        read_timeout = timeout + 5 if timeout else None
+        for line in self.stream('get', url, timeout=read_timeout):
+            if line:
+                with profiling.measure('json'):
+                    event = json.loads(line)
+                yield event
+
 
 class KubeBase(_ClientBase, KubeQueryMixin):
     """Provide common base for each provider.
@@ -207,128 +820,273 @@ class KubeBase(_ClientBase, KubeQueryMixin):
     Kubernetes-based APIs (OpenShift/Kubernetes).
     """
 
-    def _by_file(self, filepath, func):
+    _process_attrs = _ClientBase._process_attrs + ('_stats_lock',)
+
+    def __init__(self, *args, **kwargs):
+        """Constructor."""
+        super(KubeBase, self).__init__(*args, **kwargs)
+
+        self._init_apply()
+
+        # (major, minor) of the server, loaded on first use
+        self._server_version = None
+
+    def _init_process(self):
+        super(KubeBase, self)._init_process()
+        self._stats_lock = threading.Lock()
+
+    def server_version(self):
+        """Retrieve the version of the API server.
+
+        :returns: major and minor version, (0, 0) when unknown
+        :rtype: tuple
+        """
+        if self._server_version is None:
+            try:
+                data = self.request('get', _format_url(self.base_url, 'version')) or {}
+            except (KubeConnectionError, KubeRequestError):
+                data = {}
+            self._server_version = _version_tuple(data)
+            logger.debug('Server version %s.%s', *self._server_version)
+        return self._server_version
+
+    def _supports_propagation(self):
+        # propagationPolicy of DeleteOptions is available since Kubernetes 1.6
+        return self.server_version() >= (1, 6)
+
+    def _by_file(self, filepath, func, workers=1, **kwargs):
         if not os.path.isfile(filepath):
             raise KubeShiftError('File not found: %s' % filepath)
 
-        with open(filepath, 'r') as fd:
-            resources = yaml.safe_load_all(fd.read())
+        with tracing.span('kubeshift.%s_by_file' % func.__name__, {'kubeshift.file': filepath}):
+            import yaml
+            with open(filepath, 'r') as fd, profiling.measure('yaml'):
+                resources = list(yaml.safe_load_all(fd.read()))
 
-        results = []
-        for res in resources:
-            results.append(func(res))
-
-        return results
+            # resources depend on the previous ones (namespaces...): a plain
+            # sequential run stops at the first failure
+            fail_fast = (not workers or workers <= 1) and not kwargs.get('dry_run')
+            return _batch_map(lambda res: func(res, **kwargs), resources, workers, func.__name__, fail_fast)
 
-    def create(self, obj, namespace=DEFAULT_NAMESPACE):
-        """Create an object from the Kubernetes cluster."""
-        apiver, kind, name = validator.validate(obj)
-        namespace = validator.check_namespace(obj, namespace)
-        url = self._generate_url(apiver, kind, namespace)
+    def create(self, obj, namespace=DEFAULT_NAMESPACE, dry_run=False):
+        """Create an object from the Kubernetes cluster.
 
+        :param dict obj: Object of the artifact being created
+        :param str namespace: Namespace of the kubernetes cluster to be used
+        :param bool dry_run: validate the request server-side without persisting it
+        """
+        kind, name, namespace, url = self._write_url(obj, namespace, dry_run, collection=True)
         resp = self.request('post', url, data=obj)
 
         logger.info('%s `%s` successfully created', kind.capitalize(), name)
 
         return resp
 
-    def create_by_file(self, filepath):
+    def create_by_file(self, filepath, dry_run=False, workers=1):
         """Create resource by file.
 
         :params str filepath: file location
+        :params bool dry_run: validate the requests server-side without persisting them
+        :params int workers: number of resources sent concurrently (default: 1)
         :returns: created resource(s)
         :rtype: list
         :raises kubeshift.exceptions.KubeShiftError: if file not found
+        :raises kubeshift.exceptions.KubeBatchError: with dry_run or several workers, once every resource was sent, if any failed
         """
-        return self._by_file(filepath, self.create)
+        return self._by_file(filepath, self.create, workers, dry_run=dry_run)
 
-    def delete(self, obj, namespace=DEFAULT_NAMESPACE):
+    def delete(self, obj, namespace=DEFAULT_NAMESPACE, dry_run=False,
+               propagation_policy=None, grace_period=None):
         """Delete an object from the Kubernetes cluster.
 
+        Controllers (replication controllers, replica sets, deployments...) are
+        deleted with the ``Background`` propagation policy unless specified
+        otherwise, leaving the garbage collector to remove their pods.
+
         .. note::
 
-            Replication controllers must scale to 0 in order to delete pods.
-            Kubernetes 1.3 will implement server-side cascading deletion, but
-            until then, it's mandatory to scale to 0
+            Servers older than Kubernetes 1.6 do not support propagation policies,
+            replication controllers are then scaled to 0 before being deleted.
             https://github.com/kubernetes/kubernetes/blob/master/docs/proposals/garbage-collection.md
 
         :param dict obj: Object of the artifact being modified
         :param str namesapce: Namespace of the kubernetes cluster to be used
+        :param bool dry_run: validate the request server-side without persisting it
+        :param str propagation_policy: one of `Foreground`, `Background` or `Orphan`
+        :param int grace_period: seconds given to the object before it is deleted
         """
-        apiver, kind, name = validator.validate(obj)
-        namespace = validator.check_namespace(obj, namespace)
-        url = self._generate_url(apiver, kind, namespace, name)
+        kind, name, namespace, url = self._write_url(obj, namespace, dry_run)
+
+        if propagation_policy is None and kind in CASCADE_KINDS:
+            propagation_policy, scale_down = _delete_propagation(kind, self._supports_propagation(), dry_run)
+            if scale_down:
+                self.scale(obj, namespace)
 
-        if kind in ['ReplicationController']:
-            self.scale(obj, namespace)
-        resp = self.request('delete', url)
+        resp = self.request('delete', url, data=utils.delete_options(propagation_policy, grace_period))
 
         logger.info('%s `%s` successfully deleted', kind.capitalize(), name)
 
         return resp
 
-    def delete_by_file(self, filepath):
+    def delete_by_file(self, filepath, dry_run=False, workers=1, propagation_policy=None, grace_period=None):
         """Delete resource by file.
 
         :params str filepath: file location
+        :params bool dry_run: validate the requests server-side without persisting them
+        :params int workers: number of resources sent concurrently (default: 1)
+        :params str propagation_policy: one of `Foreground`, `Background` or `Orphan`
+        :params int grace_period: seconds given to the objects before they are deleted
         :returns: deleted resource(s)
         :rtype: list
         :raises kubeshift.exceptions.KubeShiftError: if file not found
+        :raises kubeshift.exceptions.KubeBatchError: with dry_run or several workers, once every resource was sent, if any failed
         """
-        return self._by_file(filepath, self.delete)
+        return self._by_file(filepath, self.delete, workers, dry_run=dry_run,
+                             propagation_policy=propagation_policy, grace_period=grace_period)
 
-    def replace(self, obj, namespace=DEFAULT_NAMESPACE):
-        """Replace a resource on the Kubernetes cluster."""
-        apiver, kind, name = validator.validate(obj)
-        namespace = validator.check_namespace(obj, namespace)
-        url = self._generate_url(apiver, kind, namespace, name)
+    def replace(self, obj, namespace=DEFAULT_NAMESPACE, dry_run=False):
+        """Replace a resource on the Kubernetes cluster.
 
+        :param dict obj: Object of the artifact being replaced
+        :param str namespace: Namespace of the kubernetes cluster to be used
+        :param bool dry_run: validate the request server-side without persisting it
+        """
+        kind, name, namespace, url = self._write_url(obj, namespace, dry_run)
         resp = self.request('put', url, data=obj)
 
         logger.info('%s `%s` successfully replaced', kind.capitalize(), name)
 
         return resp
 
-    def replace_by_file(self, filepath):
+    def replace_by_file(self, filepath, dry_run=False, workers=1):
         """Replace resource by file.
 
         :params str filepath: file location
+        :params bool dry_run: validate the requests server-side without persisting them
+        :params int workers: number of resources sent concurrently (default: 1)
         :returns: replaced resource(s)
         :rtype: list
         :raises kubeshift.exceptions.KubeShiftError: if file not found
+        :raises kubeshift.exceptions.KubeBatchError: with dry_run or several workers, once every resource was sent, if any failed
+        """
+        return self._by_file(filepath, self.replace, workers, dry_run=dry_run)
+
+    def apply(self, obj, namespace=DEFAULT_NAMESPACE, refresh=False, dry_run=False):
+        """Create or update a resource only when the desired state changed.
+
+        The desired object and its hash are stored in the ``kubeshift.io/last-applied-configuration``
+        and ``kubeshift.io/last-applied-hash`` annotations. When the live resource carries
+        the same hash, no write is issued. Hashes applied by this client are also remembered
+        locally so that re-applying an unchanged object skips fetching the live resource altogether.
+
+        A changed object is patched with the difference between the last applied and
+        the desired states, as a merge patch: fields dropped from the desired object are
+        removed from the live resource. Resources not applied by kubeshift yet are patched
+        with the desired object, as a strategic merge patch or a merge patch for the
+        custom resources which do not support the former.
+
+        Counts of created, patched and skipped objects are kept in ``apply_stats``.
+
+        :param dict obj: desired state of the resource
+        :param str namespace: Namespace of the kubernetes cluster to be used
+        :param bool refresh: ignore the local cache and always fetch the live resource
+        :param bool dry_run: validate the write server-side without persisting it
+        :returns: the created, patched or live resource (None when skipped from cache)
+        """
+        kind, name, namespace, url, digest = self._apply_target(obj, namespace)
+        if not refresh and self._applied_unchanged(url, digest, kind, name):
+            return None
+
+        try:
+            live = self.request('get', url)
+        except KubeRequestError as ex:
+            if ex.status_code != 404:
+                raise
+            live = None
+
+        desired = _applied_object(obj, digest)
+        outcome = _apply_outcome(live, digest)
+        if outcome == 'created':
+            resp = self.create(desired, namespace, dry_run=dry_run)
+        elif outcome == 'patched':
+            resp = self._patch_applied(desired, namespace, _last_applied(live), dry_run)
+        else:
+            resp = live
+            logger.info('%s `%s` unchanged, skipped', kind.capitalize(), name)
+
+        self._record_applied(url, digest, outcome, dry_run)
+        return resp
+
+    def _patch_applied(self, desired, namespace, last, dry_run=False):
+        if last is not None:
+            return self.modify(desired, namespace, previous=last, patch_type='merge', dry_run=dry_run)
+        try:
+            return self.modify(desired, namespace, dry_run=dry_run)
+        except KubeRequestError as ex:
+            # custom resources do not support strategic merge patches
+            if ex.status_code != 415:
+                raise
+            return self.modify(desired, namespace, patch_type='merge', dry_run=dry_run)
+
+    def apply_by_file(self, filepath, dry_run=False, workers=1):
+        """Apply resource by file.
+
+        :params str filepath: file location
+        :params bool dry_run: validate the requests server-side without persisting them
+        :params int workers: number of resources sent concurrently (default: 1)
+        :returns: applied resource(s)
+        :rtype: list
+        :raises kubeshift.exceptions.KubeShiftError: if file not found
+        :raises kubeshift.exceptions.KubeBatchError: with dry_run or several workers, once every resource was sent, if any failed
         """
-        return self._by_file(filepath, self.replace)
+        return self._by_file(filepath, self.apply, workers, dry_run=dry_run)
 
-    def modify(self, partial, namespace=DEFAULT_NAMESPACE):
+    def modify(self, partial, namespace=DEFAULT_NAMESPACE, previous=None, patch_type='json', dry_run=False):
         """Modify a resource.
 
         The partial object provided will be strategically merged with the existing
-        resource content. The top level meta data is required to enable modifying
-        the correct resource instance.
+        resource content, or sent as a JSON Merge Patch when ``patch_type`` is `merge`.
+        The top level meta data is required to enable modifying the correct resource
+        instance.
+
+        When the previous state of the resource is provided, only the difference
+        between ``previous`` and ``partial`` (the desired state) is sent, either as
+        a JSON Patch or a JSON Merge Patch. A JSON Patch is guarded by a test of
+        the previous ``metadata.resourceVersion`` when one is available. ``previous``
+        may be the live resource: its status and server side metadata are ignored.
 
         :param dict partial: changes to be applied to existing resource content
         :param str namespace: object name and auth scope, such as for teams and projects
+        :param dict previous: previous state of the resource to compute the patch against
+        :param str patch_type: `json` or `merge`, format of the computed patch
+        :param bool dry_run: validate the request server-side without persisting it
+        :returns: the modified resource (None when there is no difference with previous)
         """
-        apiver, kind, name = validator.validate(partial)
-        namespace = validator.check_namespace(partial, namespace)
-        url = self._generate_url(apiver, kind, namespace, name)
+        kind, name, namespace, url = self._write_url(partial, namespace, dry_run)
 
-        headers = {'Content-Type': 'application/strategic-merge-patch+json'}
-        resp = self.request('patch', url, data=partial, headers=headers)
+        headers, data = _patch_data(partial, previous, patch_type)
+        if not data:
+            logger.debug('%s `%s` unchanged, nothing to modify', kind.capitalize(), name)
+            return None
+
+        resp = self.request('patch', url, data=data, headers=headers)
 
         logger.info('%s `%s` successfully modified', kind.capitalize(), name)
 
         return resp
 
-    def modify_by_file(self, filepath):
+    def modify_by_file(self, filepath, dry_run=False, workers=1):
         """Modify resource by file.
 
         :params str filepath: file location
+        :params bool dry_run: validate the requests server-side without persisting them
+        :params int workers: number of resources sent concurrently (default: 1)
         :returns: modified resource(s)
         :rtype: list
         :raises kubeshift.exceptions.KubeShiftError: if file not found
+        :raises kubeshift.exceptions.KubeBatchError: with dry_run or several workers, once every resource was sent, if any failed
         """
-        return self._by_file(filepath, self.modify)
+        return self._by_file(filepath, self.modify, workers, dry_run=dry_run)
 
     def scale(self, obj, namespace=DEFAULT_NAMESPACE, replicas=0):
         """Scale replicas up or down.
@@ -336,18 +1094,171 @@ class KubeBase(_ClientBase, KubeQueryMixin):
         By default we scale back down to 0. This function takes an object and scales said
         object down to a specified value on the Kubernetes cluster
 
+        The `scale` subresource is patched when the API provides one for the kind,
+        which only requires permissions on the subresource and returns a small
+        `Scale` object. Otherwise the object itself is patched.
+
         :param dict obj: Object of the artifact being modified
         :param str namesapce: Namespace of the kubernetes cluster to be used
         :param int replicas: Default 0, size of the amount of replicas to scale
+        :returns: the Scale object or the scaled resource
         """
-        apiver, kind, name = validator.validate(obj)
-        namespace = validator.check_namespace(obj, namespace)
-        url = self._generate_url(apiver, kind, namespace, name)
-
-        headers = {'Content-Type': 'application/json-patch+json'}
-        patch = [{'op': 'replace',
-                  'path': '/spec/replicas',
-                  'value': replicas}]
-        self.request('patch', url, data=patch, headers=headers)
+        apiver, kind, name, namespace = self._written(obj, namespace)
+        url, headers, patch = self._scale_patch(apiver, kind, namespace, name, replicas)
+        resp = self.request('patch', url, data=patch, headers=headers)
 
         logger.info('`%s` successfully scaled to %s', name, replicas)
+
+        return resp
+
+    def update_status(self, obj, namespace=DEFAULT_NAMESPACE, dry_run=False):
+        """Replace the status of a resource through its `status` subresource.
+
+        Only the status of the object is changed, its spec and metadata are
+        left as they are on the server.
+
+        :param dict obj: Object of the artifact holding the new status
+        :param str namespace: Namespace of the kubernetes cluster to be used
+        :param bool dry_run: validate the request server-side without persisting it
+        :returns: the updated resource
+        :raises kubeshift.exceptions.KubeShiftError: if the kind has no status subresource
+        """
+        kind, name, namespace, url = self._write_url(obj, namespace, dry_run, subresource='status')
+        resp = self.request('put', url, data=obj)
+
+        logger.info('%s `%s` status successfully updated', kind.capitalize(), name)
+
+        return resp
+
+    def evict(self, obj, namespace=DEFAULT_NAMESPACE, grace_period=None, dry_run=False):
+        """Evict a pod, honoring its pod disruption budgets.
+
+        The server refuses the eviction with a 429 status while it would
+        violate a disruption budget, the eviction may then be retried.
+
+        :param dict obj: Object of the pod being evicted
+        :param str namespace: Namespace of the kubernetes cluster to be used
+        :param int grace_period: seconds given to the pod before it is deleted
+        :param bool dry_run: validate the request server-side without persisting it
+        :raises kubeshift.exceptions.KubeShiftError: if the kind has no eviction subresource
+        """
+        apiver, kind, name, namespace = self._written(obj, namespace, dry_run)
+        url, eviction = self._eviction(apiver, kind, namespace, name, grace_period, dry_run)
+        resp = self.request('post', url, data=eviction)
+
+        logger.info('%s `%s` successfully evicted', kind.capitalize(), name)
+
+        return resp
+
+    def wait_for(self, obj, condition, timeout=300, namespace=DEFAULT_NAMESPACE):
+        """Wait until an object satisfies a condition.
+
+        The current state is listed once and changes are then received through a
+        watch on the collection, filtered by name, returning as soon as the
+        condition is satisfied.
+
+        :param dict obj: Object of the artifact being waited on
+        :param condition: callable receiving the object (None when missing) or one
+            of the names in :py:data:`kubeshift.conditions.NAMED`
+        :param int timeout: seconds to wait before giving up (default: 300)
+        :param str namespace: Namespace of the kubernetes cluster to be used
+        :returns: the object satisfying the condition (None when deleted)
+        :raises kubeshift.exceptions.KubeTimeoutError: if the condition is not met in time
+        """
+        return self.wait_for_all([obj], condition, timeout, namespace)[0]
+
+    def wait_for_all(self, objs, condition, timeout=300, namespace=DEFAULT_NAMESPACE):
+        """Wait until every object satisfies a condition.
+
+        Objects are grouped by kind and namespace, each group being waited on
+        with a single watch.
+
+        :param list objs: Objects of the artifacts being waited on
+        :param condition: callable receiving the object (None when missing) or one
+            of the names in :py:data:`kubeshift.conditions.NAMED`
+        :param int timeout: seconds to wait before giving up (default: 300)
+        :param str namespace: Namespace of the kubernetes cluster to be used
+        :returns: the objects satisfying the condition, in the order given
+        :rtype: list
+        :raises kubeshift.exceptions.KubeTimeoutError: if the condition is not met in time
+        """
+        check = conditions.get(condition)
+        deadline = time.time() + timeout
+
+        keys = []
+        groups = collections.OrderedDict()
+        for obj in objs:
+            apiver, kind, name = validator.validate(obj)
+            ns = validator.check_namespace(obj, namespace)
+            groups.setdefault((apiver, kind, ns), set()).add(name)
+            keys.append((apiver, kind, ns, name))
+
+        results = {}
+        for (apiver, kind, ns), names in groups.items():
+            url = self._generate_url(apiver, kind, ns)
+            for name, state in self._wait_for_names(url, names, check, deadline).items():
+                results[(apiver, kind, ns, name)] = state
+
+        return [results[key] for key in keys]
+
+    def _wait_for_names(self, url, names, check, deadline):
+        pending = set(names)
+        done = {}
+
+        def evaluate(name, obj):
+            if name in pending and check(obj):
+                pending.discard(name)
+                done[name] = obj
+
+        if len(names) == 1:
+            url += utils.fields_to_qs([{'key': 'metadata.name', 'value': list(names)[0]}])
+
+        version = None
+        while True:
+            if version is None:
+                data = self.request('get', url) or {}
+                version = data.get('metadata', {}).get('resourceVersion')
+                items = dict((i.get('metadata', {}).get('name'), i) for i in data.get('items') or [])
+                for name in list(pending):
+                    evaluate(name, items.get(name))
+
+            if not pending:
+                return done
+
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                raise KubeTimeoutError('Timed out waiting for %s' % ', '.join(sorted(pending)))
+
+            try:
+                for event in self.watch(url, version, int(math.ceil(remaining))):
+                    if event.get('type') == 'ERROR':
+                        status = event.get('object') or {}
+                        if status.get('code') != 410:
+                            raise KubeRequestError('Unable to watch %s: Status: %s, Error: %s' % (
+                                url, status.get('code'), status.get('message')), status.get('code'))
+                        # resource version is too old, list again
+                        version = None
+                        break
+                    obj = event.get('object') or {}
+                    version = obj.get('metadata', {}).get('resourceVersion') or version
+                    evaluate(obj.get('metadata', {}).get('name'),
+                             None if event.get('type') == 'DELETED' else obj)
+                    if not pending:
+                        break
+            except KubeConnectionError:
+                logger.debug('Watch on %s interrupted, listing again', url)
+                version = None
+
+    def scale_many(self, objs, namespace=DEFAULT_NAMESPACE, replicas=0, workers=10):
+        """Scale many objects concurrently.
+
+        :param list objs: Objects of the artifacts being modified
+        :param str namesapce: Namespace of the kubernetes cluster to be used
+        :param int replicas: Default 0, size of the amount of replicas to scale
+        :param int workers: number of objects scaled concurrently (default: 10)
+        :returns: the Scale objects or scaled resources
+        :rtype: list
+        :raises kubeshift.exceptions.KubeBatchError: once every object was scaled, if any failed,
+            with the failures and the results of the objects scaled
+        """
+        return _batch_map(lambda obj: self.scale(obj, namespace, replicas), objs, workers, 'scale')
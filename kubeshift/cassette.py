@@ -0,0 +1,284 @@
+"""Record and replay the HTTP traffic of the clients.
+
+A cassette records the requests of a client and their responses to a
+compact (gzipped JSON lines) file, then replays them without network,
+for tests or to measure the client side overhead::
+
+    cassette = Cassette('session.jsonl.gz')
+    client = KubernetesClient(config, adapter=cassette.recorder())
+    ...
+    cassette.save()
+
+    cassette = Cassette.load('session.jsonl.gz')
+    client = KubernetesClient(config, adapter=cassette.player(timing=1.0))
+
+Requests are matched by method and path (with the query string): the
+responses of a request are replayed in the recorded order, starting over
+once all of them have been replayed.
+"""
+import base64
+import gzip
+import io
+import json
+import threading
+import time
+from timeit import default_timer as timer
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+import six
+import six.moves.urllib.parse as urlparse
+from urllib3.response import HTTPResponse
+
+from kubeshift.exceptions import KubeShiftError
+
+#: headers of the responses kept by the recordings
+RECORDED_HEADERS = ('Content-Type', 'Retry-After')
+
+
+def _path(url):
+    parts = urlparse.urlsplit(url)
+    return parts.path + ('?' + parts.query if parts.query else '')
+
+
+class Interaction(object):
+    """Recorded request and response.
+
+    :ivar str method: http method of the request
+    :ivar str path: path and query string of the request
+    :ivar bytes body: content of the request
+    :ivar int status: status code of the response
+    :ivar str reason: reason of the status
+    :ivar dict headers: headers of the response, see RECORDED_HEADERS
+    :ivar float elapsed: seconds between the request and the response headers
+    """
+
+    def __init__(self, method, path, body=None, status=None, reason=None, headers=None, elapsed=0.0):
+        """Constructor."""
+        self.method = method
+        self.path = path
+        self.body = body
+        self.status = status
+        self.reason = reason
+        self.headers = headers or {}
+        self.elapsed = elapsed
+        # response content, received by chunks while recording
+        self.chunks = []
+
+    @property
+    def content(self):
+        """Content of the response (as much as was read while recording)."""
+        return b''.join(self.chunks)
+
+    def to_dict(self):
+        """Serialize the interaction."""
+        data = {'m': self.method, 'p': self.path, 's': self.status, 'r': self.reason,
+                'h': self.headers, 't': round(self.elapsed, 6)}
+        for key, value in (('b', self.body), ('c', self.content)):
+            if not value:
+                continue
+            try:
+                data[key] = value.decode('utf-8')
+            except UnicodeDecodeError:
+                data[key + '64'] = base64.b64encode(value).decode('ascii')
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        """Deserialize an interaction."""
+        def content(key):
+            if key + '64' in data:
+                return base64.b64decode(data[key + '64'])
+            return data[key].encode('utf-8') if key in data else b''
+
+        interaction = cls(data['m'], data['p'], content('b') or None, data['s'], data['r'], data['h'], data['t'])
+        interaction.chunks = [content('c')]
+        return interaction
+
+
+class Cassette(object):
+    """Recorded interactions of clients.
+
+    :ivar list interactions: recorded interactions, in order
+    """
+
+    def __init__(self, path=None):
+        """Constructor.
+
+        :param str path: file the cassette is saved to and loaded from
+        """
+        self.path = path
+        self.interactions = []
+        self._lock = threading.Lock()
+        # interactions keyed by (method, path) and the position of the next one to replay
+        self._index = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path):
+        """Load a saved cassette.
+
+        :param str path: file of the cassette
+        :rtype: Cassette
+        """
+        cassette = cls(path)
+        with gzip.open(path, 'rb') as fd:
+            for line in io.TextIOWrapper(fd, encoding='utf-8'):
+                if line.strip():
+                    cassette.interactions.append(Interaction.from_dict(json.loads(line)))
+        return cassette
+
+    def save(self, path=None):
+        """Save the interactions, one JSON object per line, gzipped.
+
+        :param str path: file to save to (default: the file of the cassette)
+        """
+        path = path or self.path
+        if not path:
+            raise KubeShiftError('No file to save the cassette to')
+        with self._lock:
+            interactions = list(self.interactions)
+        with gzip.open(path, 'wb') as fd:
+            for interaction in interactions:
+                fd.write(json.dumps(interaction.to_dict(), sort_keys=True).encode('utf-8') + b'\n')
+
+    def recorder(self, adapter=None):
+        """Build a transport adapter recording the interactions.
+
+        :param requests.adapters.BaseAdapter adapter: adapter sending the requests (default: a new HTTPAdapter)
+        """
+        return RecordingAdapter(self, adapter)
+
+    def player(self, timing=0):
+        """Build a transport adapter replaying the interactions.
+
+        :param float timing: factor applied to the recorded latency of the responses (0 to reply at once)
+        """
+        return ReplayingAdapter(self, timing)
+
+    def record(self, interaction):
+        """Add an interaction."""
+        with self._lock:
+            self.interactions.append(interaction)
+            self._index = None
+
+    def next(self, method, path):
+        """Find the next recorded interaction of a request, None when there is none."""
+        with self._lock:
+            if self._index is None:
+                self._index = {}
+                for interaction in self.interactions:
+                    self._index.setdefault((interaction.method, interaction.path), [[], 0])[0].append(interaction)
+            entry = self._index.get((method, path))
+            if entry is None:
+                return None
+            matches, position = entry
+            entry[1] = (position + 1) % len(matches)
+            return matches[position]
+
+    def rewind(self):
+        """Replay every request from its first recorded interaction."""
+        with self._lock:
+            self._index = None
+
+
+class _RecordingReader(object):
+    """Raw response recording the content read through it."""
+
+    def __init__(self, raw, interaction):
+        self._raw = raw
+        self._interaction = interaction
+
+    def stream(self, amt=2 ** 16, decode_content=None):
+        for chunk in self._raw.stream(amt, decode_content=decode_content):
+            self._interaction.chunks.append(chunk)
+            yield chunk
+
+    def read(self, *args, **kwargs):
+        data = self._raw.read(*args, **kwargs)
+        self._interaction.chunks.append(data)
+        return data
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+
+class RecordingAdapter(BaseAdapter):
+    """Transport adapter recording the interactions to a cassette."""
+
+    def __init__(self, cassette, adapter=None):
+        """Constructor.
+
+        :param Cassette cassette: cassette the interactions are recorded to
+        :param requests.adapters.BaseAdapter adapter: adapter sending the requests
+        """
+        super(RecordingAdapter, self).__init__()
+        self.cassette = cassette
+        self.adapter = adapter or HTTPAdapter()
+
+    def send(self, request, **kwargs):
+        """Send the request and record the response."""
+        # requests sets the elapsed time of the response after the adapter returns
+        start = timer()
+        response = self.adapter.send(request, **kwargs)
+        elapsed = timer() - start
+        body = request.body.encode('utf-8') if isinstance(request.body, six.text_type) else request.body
+        interaction = Interaction(request.method, _path(request.url), body, response.status_code, response.reason,
+                                  dict((h, response.headers[h]) for h in RECORDED_HEADERS if h in response.headers),
+                                  elapsed)
+        # the content is recorded as the client reads it, streams included
+        response.raw = _RecordingReader(response.raw, interaction)
+        self.cassette.record(interaction)
+        return response
+
+    def close(self):
+        """Close the adapter sending the requests."""
+        self.adapter.close()
+
+
+class ReplayingAdapter(BaseAdapter):
+    """Transport adapter answering requests from a cassette, without network."""
+
+    def __init__(self, cassette, timing=0):
+        """Constructor.
+
+        :param Cassette cassette: cassette of the recorded interactions
+        :param float timing: factor applied to the recorded latency of the responses
+        """
+        super(ReplayingAdapter, self).__init__()
+        self.cassette = cassette
+        self.timing = timing
+
+    def send(self, request, **kwargs):
+        """Build the response of a request from its recording."""
+        interaction = self.cassette.next(request.method, _path(request.url))
+        if interaction is None:
+            raise requests.exceptions.ConnectionError('No recorded response for %s %s' % (request.method, request.url),
+                                                      request=request)
+        if self.timing and interaction.elapsed:
+            time.sleep(interaction.elapsed * self.timing)
+
+        response = requests.Response()
+        response.status_code = interaction.status
+        response.reason = interaction.reason
+        response.headers = CaseInsensitiveDict(interaction.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = HTTPResponse(io.BytesIO(interaction.content), headers=interaction.headers,
+                                    status=interaction.status, reason=interaction.reason, preload_content=False)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self):
+        """Nothing to release."""
@@ -0,0 +1,80 @@
+"""Conditions evaluated against the state of an object.
+
+A condition is a callable receiving the current state of an object, or None
+when the object does not exist, and returning True once satisfied.
+"""
+import six
+
+from kubeshift.exceptions import KubeShiftError
+
+
+def _status_condition(obj, type_):
+    for cond in obj.get('status', {}).get('conditions') or []:
+        if cond.get('type') == type_:
+            return cond.get('status') == 'True'
+    return False
+
+
+def phase(value):
+    """Build a condition satisfied when `status.phase` equals value."""
+    def check(obj):
+        return bool(obj) and obj.get('status', {}).get('phase') == value
+    return check
+
+
+def ready(obj):
+    """Satisfied when the `Ready` status condition is true (pods, nodes)."""
+    return bool(obj) and _status_condition(obj, 'Ready')
+
+
+def observed(obj):
+    """Satisfied when the latest generation was observed by its controller."""
+    if not obj:
+        return False
+    generation = obj.get('metadata', {}).get('generation')
+    observed_generation = obj.get('status', {}).get('observedGeneration')
+    if generation is None:
+        return True
+    return observed_generation is not None and observed_generation >= generation
+
+
+def available(obj):
+    """Satisfied when every desired replica is updated and available (deployments)."""
+    if not observed(obj):
+        return False
+    status = obj.get('status', {})
+    replicas = obj.get('spec', {}).get('replicas', 1)
+    updated = status.get('updatedReplicas', status.get('replicas', 0))
+    return updated >= replicas and status.get('availableReplicas', 0) >= replicas
+
+
+def deleted(obj):
+    """Satisfied when the object no longer exists."""
+    return obj is None
+
+
+#: conditions available by name
+NAMED = {
+    'Running': phase('Running'),
+    'Succeeded': phase('Succeeded'),
+    'Failed': phase('Failed'),
+    'Active': phase('Active'),
+    'Ready': ready,
+    'Observed': observed,
+    'Available': available,
+    'Deleted': deleted,
+}
+
+
+def get(condition):
+    """Resolve a condition.
+
+    :param condition: a callable or the name of a condition in :py:data:`NAMED`
+    :returns: the condition callable
+    :raises kubeshift.exceptions.KubeShiftError: if the condition is unknown
+    """
+    if callable(condition):
+        return condition
+    if isinstance(condition, six.string_types) and condition in NAMED:
+        return NAMED[condition]
+    raise KubeShiftError('Unknown condition: %s' % condition)
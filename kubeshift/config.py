@@ -5,8 +5,6 @@ import logging
 import os
 import tempfile
 
-import yaml
-
 from kubeshift.constants import LOGGER_DEFAULT
 
 logger = logging.getLogger(LOGGER_DEFAULT)
@@ -321,6 +319,7 @@ class Config(object):
         if not os.path.exists(config_path_dir):
             os.makedirs(config_path_dir)
 
+        import yaml
         yaml.dump(self.content, open(self.filepath, 'w'))
 
     @classmethod
@@ -338,6 +337,7 @@ class Config(object):
 
         logger.debug("Parsing %s", filepath)
 
+        import yaml
         with open(filepath) as f:
             content = yaml.safe_load(f.read())
         return cls(content, filepath)
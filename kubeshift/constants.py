@@ -3,5 +3,34 @@
 #: logger namespace `kubeshift`
 LOGGER_DEFAULT = "kubeshift"
 
+#: environment variable enabling the profiling of the whole process
+PROFILE_ENV = "KUBESHIFT_PROFILE"
+
 #: default namespace value `default`
 DEFAULT_NAMESPACE = "default"
+
+#: annotation holding the hash of the last applied object state
+LAST_APPLIED_ANNOTATION = "kubeshift.io/last-applied-hash"
+
+#: annotation holding the last applied object state
+LAST_APPLIED_CONFIG_ANNOTATION = "kubeshift.io/last-applied-configuration"
+
+#: metadata fields populated by the server, never part of a desired state
+SERVER_METADATA_FIELDS = ("uid", "resourceVersion", "generation", "creationTimestamp",
+                          "selfLink", "managedFields")
+
+#: delete propagation policies supported by DeleteOptions
+PROPAGATION_POLICIES = ("Foreground", "Background", "Orphan")
+
+#: kinds owning dependents that are removed by cascading deletion
+CASCADE_KINDS = ("ReplicationController", "ReplicaSet", "Deployment",
+                 "DaemonSet", "StatefulSet", "PetSet", "Job", "DeploymentConfig")
+
+#: creation order of kinds, kinds not listed are created last
+KIND_ORDER = (
+    ("Namespace", "Project", "ProjectRequest"),
+    ("ResourceQuota", "LimitRange", "ServiceAccount", "Secret", "ConfigMap",
+     "PersistentVolume", "PersistentVolumeClaim", "ImageStream",
+     "ClusterRole", "Role", "ClusterRoleBinding", "RoleBinding"),
+    ("Service", "Endpoints"),
+)
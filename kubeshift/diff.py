@@ -0,0 +1,108 @@
+"""Compute minimal patches between two states of an object."""
+import copy
+
+from kubeshift.constants import SERVER_METADATA_FIELDS
+
+
+def _escape(token):
+    """Escape a key as a JSON pointer reference token (RFC 6901)."""
+    return token.replace('~', '~0').replace('/', '~1')
+
+
+def without_server_fields(obj):
+    """Copy of an object without the fields populated by the server.
+
+    The ``status`` and the server side metadata (uid, resourceVersion...) of
+    a live object are not part of its desired state: patches never change them.
+
+    :param dict obj: object, possibly read from the server
+    :returns: copy of the object
+    :rtype: dict
+    """
+    if not isinstance(obj, dict):
+        return obj
+    obj = dict(obj)
+    obj.pop('status', None)
+    if isinstance(obj.get('metadata'), dict):
+        obj['metadata'] = dict((k, v) for k, v in obj['metadata'].items() if k not in SERVER_METADATA_FIELDS)
+    return obj
+
+
+def _changed(previous, desired):
+    # bool is a subclass of int in python, compare types as well so that
+    # 1 -> True is considered a change.
+    return type(previous) is not type(desired) or previous != desired
+
+
+def json_patch(previous, desired, path=''):
+    """Compute a JSON Patch (RFC 6902) transforming previous into desired.
+
+    Dictionaries are compared key by key and lists element by element so
+    that only the changed leaves are sent. Items appended to or removed from
+    the end of a list result in ``add`` / ``remove`` operations.
+
+    :param previous: original object
+    :param desired: target object
+    :param str path: JSON pointer of the objects being compared
+    :returns: list of patch operations (empty when there is no difference)
+    :rtype: list
+    """
+    ops = []
+
+    if isinstance(previous, dict) and isinstance(desired, dict):
+        for key in sorted(previous):
+            if key not in desired:
+                ops.append({'op': 'remove', 'path': path + '/' + _escape(key)})
+        for key in sorted(desired):
+            subpath = path + '/' + _escape(key)
+            if key not in previous:
+                ops.append({'op': 'add', 'path': subpath, 'value': copy.deepcopy(desired[key])})
+            else:
+                ops.extend(json_patch(previous[key], desired[key], subpath))
+
+    elif isinstance(previous, list) and isinstance(desired, list):
+        common = min(len(previous), len(desired))
+        for idx in range(common):
+            ops.extend(json_patch(previous[idx], desired[idx], '{}/{}'.format(path, idx)))
+        for item in desired[common:]:
+            ops.append({'op': 'add', 'path': path + '/-', 'value': copy.deepcopy(item)})
+        # remove from the end so that earlier indexes remain valid
+        for idx in reversed(range(common, len(previous))):
+            ops.append({'op': 'remove', 'path': '{}/{}'.format(path, idx)})
+
+    elif _changed(previous, desired):
+        ops.append({'op': 'replace', 'path': path, 'value': copy.deepcopy(desired)})
+
+    return ops
+
+
+def merge_patch(previous, desired):
+    """Compute a JSON Merge Patch (RFC 7386) transforming previous into desired.
+
+    Nested dictionaries only carry the changed keys, removed keys are set
+    to ``None`` and lists are replaced as a whole.
+
+    :param previous: original object
+    :param desired: target object
+    :returns: merge patch (empty dict when there is no difference)
+    :rtype: dict
+    """
+    if not isinstance(previous, dict) or not isinstance(desired, dict):
+        return copy.deepcopy(desired)
+
+    patch = {}
+    for key in previous:
+        if key not in desired:
+            patch[key] = None
+
+    for key, value in desired.items():
+        if key not in previous:
+            patch[key] = copy.deepcopy(value)
+        elif isinstance(value, dict) and isinstance(previous[key], dict):
+            sub = merge_patch(previous[key], value)
+            if sub:
+                patch[key] = sub
+        elif _changed(previous[key], value):
+            patch[key] = copy.deepcopy(value)
+
+    return patch
@@ -7,4 +7,21 @@ class KubeConnectionError(Exception):
 
 
 class KubeRequestError(Exception):
+
+    def __init__(self, message, status_code=None):
+        super(KubeRequestError, self).__init__(message)
+        self.status_code = status_code
+
+
+class KubeTimeoutError(Exception):
     pass
+
+
+class KubeBatchError(KubeShiftError):
+
+    def __init__(self, message, errors=None, results=None):
+        super(KubeBatchError, self).__init__(message)
+        # (kind, name, exception) of the objects which failed
+        self.errors = errors or []
+        # results of every object, in order, None for the failed ones
+        self.results = results or []
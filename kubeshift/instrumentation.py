@@ -0,0 +1,231 @@
+"""Instrumentation of the requests sent by the clients.
+
+Hooks are called around every request of a client with a
+:py:class:`RequestEvent`::
+
+    client.register_hook('after', lambda event: print(event.kind, event.duration))
+
+    collector = LatencyCollector().attach(client)
+    ...
+    for stats in collector.slowest():
+        print(stats)
+"""
+import bisect
+import collections
+import logging
+import threading
+from timeit import default_timer as timer
+
+import six.moves.urllib.parse as urlparse
+
+from kubeshift.constants import LOGGER_DEFAULT
+
+logger = logging.getLogger(LOGGER_DEFAULT)
+
+#: events hooks can be registered for
+HOOK_EVENTS = ('before', 'after', 'error')
+
+#: upper bounds (seconds) of the latency histogram buckets
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class RequestEvent(object):
+    """Description of a request given to the hooks.
+
+    :ivar str method: http method, in upper case
+    :ivar str url: url of the request
+    :ivar str template: path of the url with the namespace, name and query
+        string replaced by placeholders such as ``/api/v1/namespaces/{namespace}/pods/{name}``
+    :ivar str kind: kind of the resource (None for other APIs such as discovery)
+    :ivar int status: status code of the response (None before the response)
+    :ivar int bytes_sent: size of the request content (0 before the request is sent)
+    :ivar int bytes_received: size of the response content
+    :ivar float duration: seconds between the request and the response content
+        (the response headers for streams such as watches and logs)
+    :ivar Exception error: exception raised by the request (error hooks only)
+    """
+
+    def __init__(self, method, url, template=None, kind=None, bytes_sent=0):
+        """Constructor."""
+        self.method = method.upper()
+        self.url = url
+        self.template = template
+        self.kind = kind
+        self.bytes_sent = bytes_sent
+        self.status = None
+        self.bytes_received = 0
+        self.duration = None
+        self.error = None
+        self.start = timer()
+
+    def finish(self, status=None, bytes_received=0, error=None, bytes_sent=0):
+        """Record the outcome of the request."""
+        self.duration = timer() - self.start
+        self.status = status
+        self.bytes_sent = bytes_sent or self.bytes_sent
+        self.bytes_received = bytes_received
+        self.error = error
+
+    def __repr__(self):
+        return '<RequestEvent %s %s %s>' % (self.method, self.template, self.status)
+
+
+def resource_index(api_resources):
+    """Map the collections of the API to their kind.
+
+    :param dict api_resources: url templates by version and kind, as discovered by a client
+    :returns: kinds keyed by (root path, resource name), such as ('/api/v1', 'pods')
+    :rtype: dict
+    """
+    index = {}
+    for kinds in api_resources.values():
+        for kind, url in kinds.items():
+            path = urlparse.urlparse(url).path
+            root, resource = path.rstrip('/').rsplit('/', 1)
+            if root.endswith('/namespaces/{namespace}'):
+                root = root[:-len('/namespaces/{namespace}')]
+            index[(root, resource)] = kind
+    return index
+
+
+def describe_url(url, index):
+    """Find the url template and the kind of the resources of a url.
+
+    :param str url: url of a request
+    :param dict index: kinds by collection, see :py:func:`resource_index`
+    :returns: url template and kind (None when the url does not target resources)
+    :rtype: tuple
+    """
+    path = urlparse.urlparse(url).path
+    segments = path.strip('/').split('/')
+    root_size = 3 if segments[0] == 'apis' else 2
+    root = '/' + '/'.join(segments[:root_size])
+    rest = segments[root_size:]
+
+    # namespaced collection, unless it is a subresource of a namespace
+    if len(rest) >= 3 and rest[0] == 'namespaces' and (root, rest[2]) in index:
+        namespaced, rest = ['namespaces', '{namespace}'], rest[2:]
+    else:
+        namespaced = []
+
+    kind = index.get((root, rest[0])) if rest else None
+    if kind is None:
+        return path, None
+
+    template = [root] + namespaced + rest[:1]
+    if len(rest) > 1:
+        template += ['{name}'] + rest[2:]
+    return '/'.join(template), kind
+
+
+class Histogram(object):
+    """Latency histogram with fixed buckets."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """Constructor.
+
+        :param tuple buckets: sorted upper bounds of the buckets, in seconds
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        """Add a value to the histogram."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    @property
+    def mean(self):
+        """Mean of the values."""
+        return self.sum / self.count if self.count else 0.0
+
+    def quantile(self, q):
+        """Estimate a quantile as the upper bound of the bucket holding it.
+
+        :param float q: quantile between 0 and 1
+        :returns: upper bound, or the maximum value for the last bucket
+        """
+        rank = q * self.count
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            if total >= rank and total:
+                return bound
+        return self.max
+
+
+class LatencyCollector(object):
+    """Collect latency histograms and counters of the requests by verb and kind.
+
+    Requests to other APIs than resources (discovery, version...) are
+    collected under the kind ``None``.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """Constructor.
+
+        :param tuple buckets: upper bounds of the histogram buckets, in seconds
+        """
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self.reset()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def attach(self, client):
+        """Collect the requests of a client.
+
+        :returns: the collector
+        """
+        client.register_hook('after', self.record)
+        client.register_hook('error', self.record)
+        return self
+
+    def reset(self):
+        """Forget every collected request."""
+        with self._lock:
+            #: latency histograms keyed by (verb, kind)
+            self.histograms = {}
+            #: number of requests keyed by (verb, kind, status), status is None on connection errors
+            self.requests = collections.Counter()
+            #: bytes sent and received keyed by (verb, kind)
+            self.bytes_sent = collections.Counter()
+            self.bytes_received = collections.Counter()
+
+    def record(self, event):
+        """Record a finished request.
+
+        :param RequestEvent event: request described by the hooks
+        """
+        key = (event.method, event.kind)
+        with self._lock:
+            if key not in self.histograms:
+                self.histograms[key] = Histogram(self.buckets)
+            self.histograms[key].observe(event.duration)
+            self.requests[key + (event.status,)] += 1
+            self.bytes_sent[key] += event.bytes_sent or 0
+            self.bytes_received[key] += event.bytes_received or 0
+
+    def slowest(self, count=10, q=0.99):
+        """List the verbs and kinds with the slowest requests.
+
+        :param int count: maximum number of results
+        :param float q: quantile of the latency used to compare requests
+        :returns: (verb, kind, quantile, mean, count) tuples, slowest first
+        :rtype: list
+        """
+        with self._lock:
+            stats = [k + (h.quantile(q), h.mean, h.count) for k, h in self.histograms.items()]
+        return sorted(stats, key=lambda s: (s[2], s[3]), reverse=True)[:count]
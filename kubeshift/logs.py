@@ -0,0 +1,210 @@
+"""Follow the logs of many pods at once."""
+import logging
+import threading
+import time
+
+import six
+from six.moves import queue
+
+from kubeshift.constants import DEFAULT_NAMESPACE, LOGGER_DEFAULT
+from kubeshift.exceptions import KubeConnectionError, KubeRequestError
+
+logger = logging.getLogger(LOGGER_DEFAULT)
+
+
+def _started_statuses(pod):
+    """Statuses of the containers of a pod which logs are available."""
+    statuses = []
+    for status in pod.get('status', {}).get('containerStatuses') or []:
+        state = status.get('state') or {}
+        if 'running' in state or 'terminated' in state:
+            statuses.append(status)
+    return statuses
+
+
+def _started_containers(pod):
+    """Names of the containers of a pod which logs are available."""
+    return [status.get('name') for status in _started_statuses(pod)]
+
+
+def _timestamp(seconds):
+    """RFC3339 timestamp, with microseconds, of a time since the epoch."""
+    return time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(seconds)) + '.%06dZ' % int(seconds % 1 * 1000000)
+
+
+class LogMultiplexer(object):
+    """Tail the logs of every pod matching label selectors.
+
+    Pods are tracked through a watch: containers of new pods are attached as
+    soon as they start and streams of deleted pods end with them. Terminated
+    containers are followed once up to their last line, restarted containers
+    from the start of their new logs. Lines of
+    every container are interleaved and prefixed with the pod and container
+    names::
+
+        for line in LogMultiplexer(client, [{'key': 'app', 'value': 'web'}]):
+            print(line)
+
+    Lines are buffered in a bounded queue, streams wait for the consumer when
+    it is full. Iteration ends when :py:meth:`stop` is called, or raises the
+    errors of the watch.
+    """
+
+    #: seconds to wait before watching pods again once a watch ends
+    retry_interval = 1
+
+    def __init__(self, client, selectors, namespace=DEFAULT_NAMESPACE, since=None, tail_lines=None,
+                 buffer_size=1000, prefix='[{pod} {container}] '):
+        """Constructor.
+
+        :param client: provider client
+        :param list selectors: a list of selectors (dict) that filters pods by label(s)
+        :param str namespace: namespace of the pods
+        :param since: logs newer than a number of seconds (int) or a RFC3339 timestamp (str)
+        :param int tail_lines: number of lines from the end of the logs to start with
+        :param int buffer_size: maximum number of lines waiting for the consumer
+        :param str prefix: format of the prefix, with `pod` and `container` fields
+        """
+        self.query = client.pods(namespace)
+        self.selectors = selectors
+        self.since = since
+        self.tail_lines = tail_lines
+        self.prefix = prefix
+
+        self._queue = queue.Queue(maxsize=buffer_size)
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._watcher = None
+        # token of the attached streams and (container id, end time, finished)
+        # of the detached streams, by (pod, container)
+        self._streams = {}
+        self._ended = {}
+
+    def __iter__(self):
+        """Yield the prefixed log lines."""
+        self.start()
+        try:
+            while not self._stopped.is_set():
+                try:
+                    item = self._queue.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            self.stop()
+
+    def start(self):
+        """Start watching pods, done automatically on iteration."""
+        if self._watcher is None:
+            self._watcher = self._spawn(self._watch)
+
+    def stop(self):
+        """Stop following the logs.
+
+        Streams end with the next line they receive or when the server closes them.
+        """
+        self._stopped.set()
+
+    @property
+    def streams(self):
+        """(pod, container) of the logs currently followed."""
+        with self._lock:
+            return sorted(self._streams)
+
+    def _spawn(self, target, *args):
+        thread = threading.Thread(target=target, args=args)
+        thread.daemon = True
+        thread.start()
+        return thread
+
+    def _put(self, item):
+        # block while the queue is full (backpressure) but give up once stopped
+        while not self._stopped.is_set():
+            try:
+                self._queue.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _watch(self):
+        version = None
+        try:
+            while not self._stopped.is_set():
+                for event in self.query.watch(selectors=self.selectors, resource_version=version):
+                    if self._stopped.is_set():
+                        return
+                    if event.get('type') == 'ERROR':
+                        status = event.get('object') or {}
+                        if status.get('code') != 410:
+                            raise KubeRequestError('Unable to watch pods: Status: %s, Error: %s' % (
+                                status.get('code'), status.get('message')), status.get('code'))
+                        # resource version is too old, start over with current pods
+                        version = None
+                        break
+                    pod = event.get('object') or {}
+                    version = pod.get('metadata', {}).get('resourceVersion') or version
+                    if event.get('type') in ('ADDED', 'MODIFIED'):
+                        self._attach(pod)
+                    elif event.get('type') == 'DELETED':
+                        self._forget(pod)
+                self._stopped.wait(self.retry_interval)
+        except (KubeConnectionError, KubeRequestError) as ex:
+            self._put(ex)
+
+    def _attach(self, pod):
+        name = pod.get('metadata', {}).get('name')
+        for status in _started_statuses(pod):
+            container = status.get('name')
+            instance = status.get('containerID')
+            terminated = 'terminated' in status['state']
+            key = (name, container)
+            with self._lock:
+                if key in self._streams:
+                    continue
+                ended = self._ended.get(key)
+                if ended is not None and ended[0] == instance and ended[2]:
+                    # every line of this terminated container was read
+                    continue
+                token = self._streams[key] = object()
+
+            if ended is None:
+                since, tail_lines = self.since, self.tail_lines
+            elif ended[0] != instance:
+                # restarted container: the logs of the new container start empty
+                since, tail_lines = None, None
+            else:
+                # only what was written since the last stream ended
+                since, tail_lines = _timestamp(ended[1]), None
+
+            logger.debug('Following logs of %s/%s', name, container)
+            self._spawn(self._tail, name, container, since, tail_lines, token, instance, terminated)
+
+    def _forget(self, pod):
+        # streams of a deleted pod end with it
+        name = pod.get('metadata', {}).get('name')
+        with self._lock:
+            for key in [k for k in list(self._streams) + list(self._ended) if k[0] == name]:
+                self._streams.pop(key, None)
+                self._ended.pop(key, None)
+
+    def _tail(self, pod, container, since, tail_lines, token, instance, terminated):
+        prefix = self.prefix.format(pod=pod, container=container)
+        finished = False
+        try:
+            for line in self.query.logs(pod, container, follow=True, since=since, tail_lines=tail_lines):
+                if not self._put(prefix + six.text_type(line)):
+                    break
+            else:
+                # the logs of a terminated container are complete
+                finished = terminated
+        except (KubeConnectionError, KubeRequestError) as ex:
+            logger.debug('Logs of %s/%s interrupted: %s', pod, container, ex)
+        finally:
+            with self._lock:
+                if self._streams.get((pod, container)) is token:
+                    del self._streams[(pod, container)]
+                    self._ended[(pod, container)] = (instance, time.time(), finished)
+            logger.debug('Detached from logs of %s/%s', pod, container)
@@ -0,0 +1,168 @@
+"""Metrics of the clients in the Prometheus text exposition format.
+
+No Prometheus library is required::
+
+    metrics = ClientMetrics().attach(client)
+    metrics.render()       # text to expose from an existing endpoint
+    metrics.serve(9100)    # or a minimal HTTP server in a background thread
+"""
+import threading
+import weakref
+
+from six.moves import BaseHTTPServer
+from six.moves import socketserver
+
+from kubeshift.instrumentation import DEFAULT_BUCKETS, LatencyCollector
+
+#: content type of the text exposition format
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels):
+    if not labels:
+        return ''
+    return '{%s}' % ','.join('%s="%s"' % (k, _escape(v)) for k, v in sorted(labels.items()))
+
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class ClientMetrics(LatencyCollector):
+    """Collect the activity of clients and render it for Prometheus.
+
+    Exposed metrics (``kubeshift_`` prefix):
+
+    * ``requests_total`` counter by verb, kind and status (`error` on connection errors)
+    * ``request_duration_seconds`` histogram by verb and kind
+    * ``sent_bytes_total`` and ``received_bytes_total`` counters by verb and kind
+    * ``watch_requests_total`` counter of watches (re)opened by kind
+    * ``discovery_duration_seconds`` gauge of the last discovery by server
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, prefix='kubeshift'):
+        """Constructor.
+
+        :param tuple buckets: upper bounds of the histogram buckets, in seconds
+        :param str prefix: prefix of the metric names
+        """
+        self.prefix = prefix
+        self._clients = weakref.WeakSet()
+        super(ClientMetrics, self).__init__(buckets)
+
+    def __getstate__(self):
+        state = super(ClientMetrics, self).__getstate__()
+        del state['_clients']
+        return state
+
+    def __setstate__(self, state):
+        super(ClientMetrics, self).__setstate__(state)
+        self._clients = weakref.WeakSet()
+
+    def attach(self, client):
+        """Collect the requests of a client.
+
+        :returns: the metrics
+        """
+        self._clients.add(client)
+        return super(ClientMetrics, self).attach(client)
+
+    def reset(self):
+        """Forget every collected request."""
+        super(ClientMetrics, self).reset()
+        with self._lock:
+            #: number of watch requests keyed by kind
+            self.watches = {}
+
+    def record(self, event):
+        """Record a finished request.
+
+        :param kubeshift.instrumentation.RequestEvent event: request described by the hooks
+        """
+        super(ClientMetrics, self).record(event)
+        if 'watch=true' in event.url:
+            with self._lock:
+                self.watches[event.kind] = self.watches.get(event.kind, 0) + 1
+
+    def render(self):
+        """Render the metrics in the Prometheus text exposition format.
+
+        :rtype: str
+        """
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            name = '%s_%s' % (self.prefix, name)
+            lines.append('# HELP %s %s' % (name, help_text))
+            lines.append('# TYPE %s %s' % (name, kind))
+            for suffix, labels, value in samples:
+                lines.append('%s%s%s %s' % (name, suffix, _labels(**labels), _number(value)))
+
+        with self._lock:
+            requests = sorted(self.requests.items(), key=str)
+            histograms = sorted(self.histograms.items(), key=str)
+            sent = sorted(self.bytes_sent.items(), key=str)
+            received = sorted(self.bytes_received.items(), key=str)
+            watches = sorted(self.watches.items(), key=str)
+
+        metric('requests_total', 'counter', 'Requests sent to the API.',
+               [('', dict(verb=v, kind=k or '', status=s or 'error'), n) for (v, k, s), n in requests])
+
+        samples = []
+        for (verb, kind), hist in histograms:
+            labels = dict(verb=verb, kind=kind or '')
+            total = 0
+            for bound, count in zip(hist.buckets + (float('inf'),), hist.counts):
+                total += count
+                samples.append(('_bucket', dict(labels, le=_number(bound)), total))
+            samples.append(('_sum', labels, hist.sum))
+            samples.append(('_count', labels, hist.count))
+        metric('request_duration_seconds', 'histogram', 'Duration of the requests.', samples)
+
+        metric('sent_bytes_total', 'counter', 'Bytes of the request contents.',
+               [('', dict(verb=v, kind=k or ''), n) for (v, k), n in sent])
+        metric('received_bytes_total', 'counter', 'Bytes of the response contents.',
+               [('', dict(verb=v, kind=k or ''), n) for (v, k), n in received])
+        metric('watch_requests_total', 'counter', 'Watches opened, including reconnections.',
+               [('', dict(kind=k or ''), n) for k, n in watches])
+        metric('discovery_duration_seconds', 'gauge', 'Duration of the last discovery of the API resources.',
+               [('', dict(server=c.base_url), c.discovery_duration)
+                for c in list(self._clients) if c.discovery_duration is not None])
+
+        return '\n'.join(lines) + '\n'
+
+    def serve(self, port=9100, address='127.0.0.1'):
+        """Expose the metrics over HTTP from a background thread.
+
+        :param int port: port to listen on (0 picks a free port)
+        :param str address: address to listen on
+        :returns: the server, stopped by its `shutdown` method
+        """
+        metrics = self
+
+        class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = metrics.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        class Server(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+            daemon_threads = True
+
+        server = Server((address, port), Handler)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        return server
@@ -3,15 +3,49 @@ import logging
 
 import six
 
-from kubeshift.base import KubeBase
+from kubeshift.base import KubeBase, _OBJECT_ERRORS, _batch_error, _concurrent_map, _format_url, _object_error
 from kubeshift.constants import (DEFAULT_NAMESPACE,
+                                 KIND_ORDER,
                                  LOGGER_DEFAULT)
 from kubeshift.queries.shift_query import ShiftQueryMixin
+from kubeshift import templates
+from kubeshift import tracing
 from kubeshift import validator
 
 logger = logging.getLogger(LOGGER_DEFAULT)
 
 
+def _rank_objects(objects):
+    """Group objects by the creation rank of their kind, in order."""
+    ranks = {}
+    for o in objects:
+        rank = next((idx for idx, kinds in enumerate(KIND_ORDER) if o['kind'] in kinds), len(KIND_ORDER))
+        ranks.setdefault(rank, []).append(o)
+    return [ranks[rank] for rank in sorted(ranks)]
+
+
+def _template_batches(data, action, errors):
+    """Objects of a processed template processed together, a rank at a time.
+
+    The objects are validated first. Ranks are processed in creation order,
+    reversed by a delete. A create stops after the first rank with errors,
+    appended to `errors` by the caller: dependents of objects which failed
+    to be created would fail as well.
+    """
+    objects = data.get('objects', [])
+    for o in objects:
+        validator.validate(o)
+
+    ranks = _rank_objects(objects)
+    if action == 'delete':
+        ranks.reverse()
+
+    for objects in ranks:
+        yield objects
+        if errors and action == 'create':
+            return
+
+
 def template(action):
     """Handle template actions.
 
@@ -21,46 +55,120 @@ def template(action):
     """
     def decorator(func):
         @six.wraps(func)
-        def handler(self, obj, namespace=None):
+        def handler(self, obj, namespace=DEFAULT_NAMESPACE, **kwargs):
             apiver, kind, _ = validator.validate(obj)
             if kind == 'Template':
-                return self._process_template(apiver, kind, action, obj, namespace)
+                return self._process_template(apiver, kind, action, obj, namespace, **kwargs)
             else:
-                return func(self, obj, namespace)
+                return func(self, obj, namespace, **kwargs)
         return handler
     return decorator
 
 
-class OpenshiftClient(KubeBase, ShiftQueryMixin):
-    """Openshift Provider client that provides access to APIs."""
+class _TemplateMixin(object):
+    """Processing of templates shared by the Openshift clients, requests aside."""
+
+    #: process templates locally when they only use supported features
+    local_templates = True
+
+    def _template_span(self, action, obj, namespace):
+        return tracing.span('kubeshift.%s_template' % action, {
+            'kubeshift.template': obj.get('metadata', {}).get('name'), 'kubeshift.namespace': namespace})
+
+    def _cached_template(self, obj, namespace, action):
+        """Look a processed template up in the cache.
+
+        :returns: cache key, whether the template generates values and the
+            processed template, None when it must be processed
+        :rtype: tuple
+        """
+        key = self.template_cache.key(obj, namespace)
+        # generated values (passwords, tokens...) are never reused by a create
+        generated = templates.generates_values(obj)
+        data = None if generated and action == 'create' else self.template_cache.get(key)
+        if data is not None:
+            logger.debug('Using cached processed template %s', key)
+        return key, generated, data
+
+    def _render_locally(self, obj):
+        """Render a template locally, None when the server must process it."""
+        if self.local_templates:
+            try:
+                return templates.render(obj)
+            except templates.UnsupportedTemplate as ex:
+                logger.debug('Processing template server-side: %s', ex)
+        return None
+
+    def _processed_templates_url(self, apiver, kind, namespace):
+        # processedtemplates is served next to templates, for the same kind
+        return _format_url(self._generate_url(apiver, kind, namespace).rsplit('/', 1)[0], 'processedtemplates')
+
+
+class OpenshiftClient(_TemplateMixin, KubeBase, ShiftQueryMixin):
+    """Openshift Provider client that provides access to APIs.
+
+    Templates are processed locally when possible, falling back to the server
+    otherwise. Processed templates are cached in memory by ``template_cache``;
+    assign a :py:class:`~kubeshift.templates.TemplateCache` with a directory to
+    keep them on disk as well.
+    """
+
+    #: number of template objects processed concurrently
+    template_workers = 8
 
     def __init__(self, *args, **kwargs):
         """Constructor."""
         super(OpenshiftClient, self).__init__(*args, **kwargs)
 
-        # Load API Resources
+        self.template_cache = templates.TemplateCache()
+
+    def _discover(self):
+        super(OpenshiftClient, self)._discover()
         self._load_resources('oapi/v1/', 'v1')
 
-    @template(action='post')
-    def create(self, obj, namespace=DEFAULT_NAMESPACE):
+    @template(action='create')
+    def create(self, obj, namespace=DEFAULT_NAMESPACE, dry_run=False):
         """Create an object from the Openshift cluster."""
-        return super(OpenshiftClient, self).create(obj, namespace)
+        return super(OpenshiftClient, self).create(obj, namespace, dry_run=dry_run)
 
     @template(action='delete')
-    def delete(self, obj, namespace=DEFAULT_NAMESPACE):
+    def delete(self, obj, namespace=DEFAULT_NAMESPACE, dry_run=False,
+               propagation_policy=None, grace_period=None):
         """Delete an object from the Openshift cluster."""
-        return super(OpenshiftClient, self).delete(obj, namespace)
-
-    def _process_template(self, apiver, kind, method, obj, namespace):
-        url = self._generate_url(apiver, kind, namespace)
-        data = self.request('post', url, data=obj) or {}
-
-        for o in data.get('objects', []):
-            apiver, kind, name = validator.validate(o)
-            object_url = self._generate_url(apiver, kind, namespace)
-            self.request(method, object_url, data=o)
-            logger.debug('%sd template object: %s', method, name)
-
-        logger.debug('Processed template with %d objects successfully',
-                     len(data.get('objects', [])))
+        return super(OpenshiftClient, self).delete(obj, namespace, dry_run=dry_run,
+                                                   propagation_policy=propagation_policy,
+                                                   grace_period=grace_period)
+
+    def _render_template(self, apiver, kind, obj, namespace):
+        data = self._render_locally(obj)
+        if data is None:
+            data = self.request('post', self._processed_templates_url(apiver, kind, namespace), data=obj) or {}
         return data
+
+    def _process_template(self, apiver, kind, action, obj, namespace, **kwargs):
+        with self._template_span(action, obj, namespace):
+            key, generated, data = self._cached_template(obj, namespace, action)
+            if data is None:
+                data = self._render_template(apiver, kind, obj, namespace)
+                self.template_cache.set(key, data, persist=not generated)
+
+            # objects of a template are handled by the default (non-template) processing
+            func = getattr(super(OpenshiftClient, self), action)
+
+            def process(o):
+                try:
+                    func(o, namespace, **kwargs)
+                except _OBJECT_ERRORS as ex:
+                    return _object_error(o, ex)
+                logger.debug('%sd template object: %s', action, o['metadata']['name'])
+
+            errors = []
+            for objects in _template_batches(data, action, errors):
+                errors.extend(e for e in _concurrent_map(process, objects, self.template_workers) if e)
+
+            if errors:
+                raise _batch_error(action, errors, len(data.get('objects', [])))
+
+            logger.debug('Processed template with %d objects successfully',
+                         len(data.get('objects', [])))
+            return data
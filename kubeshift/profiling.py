@@ -0,0 +1,185 @@
+"""Profiling of the time spent by the clients, by subsystem.
+
+Profiling is disabled by default. It is enabled for a block of code::
+
+    from kubeshift import profiling
+
+    with profiling.profile() as profiler:
+        client.create_by_file('app.yaml', workers=4)
+    print(profiler.report())
+
+or for the whole process with the ``KUBESHIFT_PROFILE`` environment
+variable: the report is written to stderr at exit, and when the variable
+holds a path instead of ``1`` the pstats of the main thread are dumped to
+that file as well.
+
+Subsystems are timed on every thread:
+
+* ``yaml``: parsing of the files given to the ``*_by_file`` methods
+* ``url``: url generation from the discovered resources
+* ``network``: sending requests and reading responses, including the wait for the server
+* ``json``: decoding of the responses
+"""
+import atexit
+import collections
+import cProfile
+import functools
+import os
+import sys
+import threading
+from timeit import default_timer as timer
+
+from kubeshift.constants import PROFILE_ENV
+
+#: subsystems timed by the profiler
+SUBSYSTEMS = ('yaml', 'url', 'network', 'json')
+
+_active = None
+
+
+class _NoopMeasure(object):
+    """Measure used while profiling is disabled."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NOOP_MEASURE = _NoopMeasure()
+
+
+class _Measure(object):
+
+    def __init__(self, profiler, subsystem):
+        self.profiler = profiler
+        self.subsystem = subsystem
+
+    def __enter__(self):
+        self.start = timer()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.add(self.subsystem, timer() - self.start)
+        return False
+
+
+class Profiler(object):
+    """Aggregate the time spent by subsystem.
+
+    :ivar dict seconds: time spent keyed by subsystem, summed over threads
+    :ivar dict calls: number of measures keyed by subsystem
+    """
+
+    def __init__(self, stats_path=None):
+        """Constructor.
+
+        :param str stats_path: file to dump the pstats of the profiled thread to (no deterministic profiling when None)
+        """
+        self.stats_path = stats_path
+        self.seconds = collections.Counter()
+        self.calls = collections.Counter()
+        self.elapsed = None
+        self._lock = threading.Lock()
+        self._profile = None
+        self._start = None
+
+    def start(self):
+        """Start profiling, deterministically for the current thread when a stats path is set."""
+        global _active
+        self._start = timer()
+        if self.stats_path:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        _active = self
+        return self
+
+    def stop(self):
+        """Stop profiling and dump the pstats, if any."""
+        global _active
+        if _active is self:
+            _active = None
+        self.elapsed = timer() - self._start
+        if self._profile is not None:
+            self._profile.disable()
+            self._profile.dump_stats(self.stats_path)
+            self._profile = None
+
+    def add(self, subsystem, seconds):
+        """Record time spent in a subsystem."""
+        with self._lock:
+            self.seconds[subsystem] += seconds
+            self.calls[subsystem] += 1
+
+    def report(self):
+        """Describe the time spent by subsystem, slowest first.
+
+        Shares are relative to the elapsed time, subsystems running in
+        worker threads may add up to more than 100%.
+
+        :rtype: str
+        """
+        elapsed = self.elapsed if self.elapsed is not None else timer() - self._start
+        with self._lock:
+            rows = sorted(self.seconds.items(), key=lambda r: r[1], reverse=True)
+            calls = dict(self.calls)
+        lines = ['kubeshift profile: %.3fs elapsed' % elapsed,
+                 '%-10s %10s %10s %8s' % ('subsystem', 'calls', 'seconds', 'share')]
+        for subsystem, seconds in rows:
+            share = 100.0 * seconds / elapsed if elapsed else 0.0
+            lines.append('%-10s %10d %10.3f %7.1f%%' % (subsystem, calls[subsystem], seconds, share))
+        if self.stats_path:
+            lines.append('pstats dumped to %s' % self.stats_path)
+        return '\n'.join(lines)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+        return False
+
+
+def profile(stats_path=None):
+    """Profile a block of code.
+
+    :param str stats_path: file to dump the pstats of the current thread to
+    :returns: context manager giving the :py:class:`Profiler`
+    """
+    return Profiler(stats_path)
+
+
+def measure(subsystem):
+    """Time a block of code as part of a subsystem, a no-op while profiling is disabled."""
+    profiler = _active
+    if profiler is None:
+        return _NOOP_MEASURE
+    return _Measure(profiler, subsystem)
+
+
+def measured(subsystem):
+    """Decorate a function to time its calls as part of a subsystem."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with measure(subsystem):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _profile_process(value):
+    # `1` only reports, any other value is the path of the pstats file
+    profiler = Profiler(None if value.lower() in ('1', 'true', 'yes') else value).start()
+
+    def finish():
+        profiler.stop()
+        sys.stderr.write(profiler.report() + '\n')
+
+    atexit.register(finish)
+    return profiler
+
+
+if os.environ.get(PROFILE_ENV):
+    _profile_process(os.environ[PROFILE_ENV])
@@ -1,7 +1,9 @@
 """Perform API query for any provider with filtering features."""
 import six
+import six.moves.urllib.parse as url_parse
 
 from kubeshift.constants import DEFAULT_NAMESPACE
+from kubeshift.exceptions import KubeShiftError
 from kubeshift.queries import utils
 
 
@@ -76,6 +78,90 @@ class Query(object):
             return []
         return self.client.request('get', self.url + qs).get('items', [])
 
+    def logs(self, name, container=None, follow=False, since=None, tail_lines=None):
+        """Stream the logs of a resource such as a pod or a build.
+
+        Lines are read from the connection as they arrive, logs are never loaded
+        as a whole. With `follow` the generator keeps waiting for new lines until
+        the resource terminates or the generator is closed.
+
+        :param str name: name of the resource
+        :param str container: container of the pod (required for pods of many containers)
+        :param bool follow: keep streaming new lines as they are written
+        :param since: logs newer than a number of seconds (int) or a RFC3339 timestamp (str)
+        :param int tail_lines: number of lines from the end of the logs to start with
+        :returns: generator of log lines (str)
+        """
+        params = []
+        if container:
+            params.append(('container', container))
+        if follow:
+            params.append(('follow', 'true'))
+        if isinstance(since, six.string_types):
+            params.append(('sinceTime', since))
+        elif since is not None:
+            params.append(('sinceSeconds', int(since)))
+        if tail_lines is not None:
+            params.append(('tailLines', int(tail_lines)))
+
+        url = self.url + '/' + name + '/log'
+        if params:
+            url += '?' + url_parse.urlencode(params)
+        return self.client.stream('get', url)
+
+    def _selectors_qs(self, selectors=None, fields=None):
+        qs_list = []
+        for values, to_qs in [(selectors, utils.selectors_to_qs), (fields, utils.fields_to_qs)]:
+            if values:
+                qs = to_qs(values)
+                if not qs:
+                    raise KubeShiftError('Invalid selectors: %s' % values)
+                qs_list.append(qs.lstrip('?'))
+        return qs_list
+
+    def watch(self, selectors=None, fields=None, resource_version=None, timeout=None):
+        """Watch the changes of the resources, optionally filtered by selectors.
+
+        :param list selectors: a list of selectors (dict) that filters resources by label(s)
+        :param list fields: a list of selectors (dict) that filters resources by field(s)
+        :param str resource_version: only changes after this version are sent
+        :param int timeout: seconds after which the server ends the watch
+        :returns: generator of events (dict with `type` and `object`)
+        :raises kubeshift.exceptions.KubeShiftError: if selectors are invalid
+        """
+        qs_list = self._selectors_qs(selectors, fields)
+        url = self.url + ('?' + '&'.join(qs_list) if qs_list else '')
+        return self.client.watch(url, resource_version, timeout)
+
+    def delete(self, selectors=None, fields=None, dry_run=False, propagation_policy=None):
+        """Delete the resources matching the selectors in a single request.
+
+        Label selectors use the same format as :py:meth:`by_selector`, field selectors
+        are dicts of `key`, `value` and `op` (one of ['=', '==', '!=']). At least one
+        selector is required to avoid deleting the whole collection by accident.
+
+        :param list selectors: a list of selectors (dict) that filters resources by label(s)
+        :param list fields: a list of selectors (dict) that filters resources by field(s)
+        :param bool dry_run: validate the request server-side without persisting it
+        :param str propagation_policy: one of `Foreground`, `Background` or `Orphan`
+        :returns: list object of the deleted resources
+        :raises kubeshift.exceptions.KubeShiftError: if selectors are missing or invalid
+        """
+        qs_list = self._selectors_qs(selectors, fields)
+        if not qs_list:
+            raise KubeShiftError('Selectors are required to delete a collection')
+
+        if dry_run:
+            qs_list.append(url_parse.urlencode(utils.dry_run_params(dry_run)))
+        else:
+            # objects applied by the client may be among the deleted ones
+            forget = getattr(self.client, '_forget_applied_collection', None)
+            if forget is not None:
+                forget(self.url)
+
+        return self.client.request('delete', self.url + '?' + '&'.join(qs_list),
+                                   data=utils.delete_options(propagation_policy))
+
 
 def queryapi(version, kind, nsarg=True):
     """Make Query API.
@@ -92,6 +178,6 @@ def queryapi(version, kind, nsarg=True):
             url = self._generate_url(api_version=version,
                                      kind=kind,
                                      namespace=namespace)
-            return Query(self, url)
+            return self.query_class(self, url)
         return handler
     return decorator
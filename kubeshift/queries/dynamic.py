@@ -0,0 +1,124 @@
+"""Query APIs of every discovered resource."""
+import re
+
+from kubeshift.constants import DEFAULT_NAMESPACE
+from kubeshift.exceptions import KubeShiftError
+
+# v1, v2beta1, v1alpha2...
+_VERSION = re.compile(r'^v(\d+)(?:(alpha|beta)(\d+))?$')
+_STABILITY = {'alpha': 0, 'beta': 1, None: 2}
+
+
+def version_order(api_version):
+    """Sort key of API versions, the newest stable version first.
+
+    Versions are ordered as by Kubernetes: GA before beta before alpha,
+    then by decreasing version numbers. Between groups serving the same
+    version, the core group comes first then the groups by name.
+
+    :param str api_version: version of API such as `apps/v1beta2`
+    """
+    group, _, version = api_version.rpartition('/')
+    match = _VERSION.match(version)
+    if not match:
+        return (1, 0, 0, 0, bool(group), group, version)
+    major, stability, minor = match.groups()
+    return (0, -_STABILITY[stability], -int(major), -int(minor or 0), bool(group), group, version)
+
+
+def _plural(url):
+    # the name of a resource ends its url template
+    return url.rstrip('/').rsplit('/', 1)[-1]
+
+
+class QueryAccessor(object):
+    """Query API of a discovered resource, called like the named query APIs.
+
+    :ivar str version: version of API of the resource
+    :ivar str kind: kind of the resource
+    :ivar bool namespaced: whether the resources belong to namespaces
+    """
+
+    def __init__(self, client, version, kind):
+        """Constructor."""
+        self.client = client
+        self.version = version
+        self.kind = kind
+        self.namespaced = '{namespace}' in client.api_resources[version][kind]
+
+    def __call__(self, namespace=DEFAULT_NAMESPACE):
+        """:py:class:`~kubeshift.queries.base.Query` of the resources, in a namespace when namespaced."""
+        url = self.client._generate_url(self.version, self.kind, namespace if self.namespaced else None)
+        return self.client.query_class(self.client, url)
+
+    def __repr__(self):
+        return '<QueryAccessor {} {}>'.format(self.version, self.kind)
+
+
+class DynamicQueryMixin(object):
+    """Provide query APIs built from the discovered resources.
+
+    Any discovered kind, custom resources included, is queried with
+    :py:meth:`resource` or as an attribute named after its plural name::
+
+        client.resource('CronJob', namespace='dev').items()
+        client.cronjobs('dev').items()
+    """
+
+    # api_resources, the preferred version of each kind and plural name,
+    # the plural names and the accessors built, see _dynamic_index()
+    _dynamic_index_cache = None
+
+    def _dynamic_index(self):
+        # rebuilt when the discovery replaces api_resources
+        resources = self.__dict__.get('api_resources') or {}
+        cached = self._dynamic_index_cache
+        if cached is None or cached[0] is not resources:
+            index = {}
+            plurals = set()
+            for api_version, kinds in resources.items():
+                for kind, url in kinds.items():
+                    plurals.add(_plural(url))
+                    for key in (kind, _plural(url)):
+                        index.setdefault(key, set()).add((api_version, kind))
+            preferred = dict((key, min(candidates, key=lambda c: version_order(c[0])))
+                             for key, candidates in index.items())
+            cached = self._dynamic_index_cache = (resources, preferred, plurals, {})
+        return cached
+
+    def resource(self, kind, version=None, namespace=DEFAULT_NAMESPACE):
+        """Query the resources of a kind.
+
+        :param str kind: kind (`Deployment`) or plural name (`deployments`)
+        :param str version: version of API, the newest served version when None
+        :param str namespace: namespace of the resources, ignored by cluster wide resources
+        :returns: :py:class:`~kubeshift.queries.base.Query`
+        :raises kubeshift.exceptions.KubeShiftError: if no API serves the kind
+        """
+        return self._accessor(kind, version)(namespace)
+
+    def _accessor(self, kind, version=None):
+        resources, preferred, _, accessors = self._dynamic_index()
+        if version is None:
+            if kind not in preferred:
+                raise KubeShiftError('No API matching kind={}'.format(kind))
+            version, kind = preferred[kind]
+        elif kind not in resources.get(version, {}):
+            # a plural name of the given version
+            kinds = [k for k, url in resources.get(version, {}).items() if _plural(url) == kind]
+            kind = kinds[0] if kinds else kind
+
+        accessor = accessors.get((version, kind))
+        if accessor is None:
+            # fails early for an unknown kind, not on every call
+            self._generate_url(version, kind)
+            accessor = accessors[(version, kind)] = QueryAccessor(self, version, kind)
+        return accessor
+
+    def __getattr__(self, name):
+        """Query API of a discovered resource, named after its plural name."""
+        # private and special names are never resources, nor is anything
+        # looked up before the discovery
+        if name.startswith('_') or not self.__dict__.get('api_resources') or name not in self._dynamic_index()[2]:
+            raise AttributeError("'{}' object has no attribute '{}'".format(type(self).__name__, name))
+        return self._accessor(name)
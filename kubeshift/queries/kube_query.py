@@ -1,10 +1,15 @@
 """Kubernetes names query APIs."""
 from kubeshift.constants import DEFAULT_NAMESPACE
 from kubeshift.queries import base
+from kubeshift.queries.dynamic import DynamicQueryMixin
 
 
-class KubeQueryMixin(object):
-    """Provide Kubernetes name query APIs."""
+class KubeQueryMixin(DynamicQueryMixin):
+    """Provide Kubernetes name query APIs.
+
+    The named query APIs use fixed versions, any discovered resource is
+    also queried with :py:meth:`resource`, preferring its newest version.
+    """
 
     # v1
 
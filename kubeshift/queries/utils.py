@@ -1,6 +1,9 @@
 """Query helpers."""
 import six.moves.urllib.parse as url_parse
 
+from kubeshift.constants import PROPAGATION_POLICIES
+from kubeshift.exceptions import KubeShiftError
+
 
 def selectors_to_qs(selectors):
     """Convert list of selector dict to query string.
@@ -51,3 +54,62 @@ def selectors_to_qs(selectors):
         qs = '?labelSelector=' + url_parse.quote_plus(','.join(qs_list))
 
     return qs
+
+
+def fields_to_qs(fields):
+    """Convert list of field selector dict to query string.
+
+    selector attributes:
+        * key: (str) field path such as `metadata.name` **REQUIRED**
+        * value: (str) field value **REQUIRED**
+        * op: (str|None) one of the support operations ['=', '==', '!='] default `=`
+
+    :param list fields: list of dicts representing field selectors
+    :returns: querystring
+    :rtype: str|None
+    """
+    if not isinstance(fields, list) or not fields:
+        return None
+
+    qs_list = []
+    for f in fields:
+        key = f.get('key')
+        val = f.get('value')
+        op = f.get('op', '=')
+        if not key or val is None or op not in ['=', '==', '!=']:
+            return None
+        qs_list.append('{}{}{}'.format(key, op, val))
+
+    return '?fieldSelector=' + url_parse.quote_plus(','.join(qs_list))
+
+
+def dry_run_params(dry_run):
+    """Query parameters requesting server-side dry-run.
+
+    :param bool dry_run: whether dry-run is requested
+    :returns: params
+    :rtype: dict|None
+    """
+    return {'dryRun': 'All'} if dry_run else None
+
+
+def delete_options(propagation_policy=None, grace_period=None):
+    """Build the DeleteOptions body of a delete request.
+
+    :param str propagation_policy: one of `Foreground`, `Background` or `Orphan`
+    :param int grace_period: seconds given to the object(s) before deletion
+    :returns: DeleteOptions object
+    :rtype: dict|None
+    :raises kubeshift.exceptions.KubeShiftError: if propagation policy is unknown
+    """
+    if propagation_policy is None and grace_period is None:
+        return None
+
+    opts = {'kind': 'DeleteOptions', 'apiVersion': 'v1'}
+    if propagation_policy is not None:
+        if propagation_policy not in PROPAGATION_POLICIES:
+            raise KubeShiftError('Unknown propagation policy: %s' % propagation_policy)
+        opts['propagationPolicy'] = propagation_policy
+    if grace_period is not None:
+        opts['gracePeriodSeconds'] = int(grace_period)
+    return opts
@@ -0,0 +1,289 @@
+"""Openshift template helpers."""
+import collections
+import copy
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import string
+import tempfile
+import threading
+
+import six
+
+from kubeshift.constants import LOGGER_DEFAULT
+from kubeshift.exceptions import KubeShiftError
+
+logger = logging.getLogger(LOGGER_DEFAULT)
+
+PARAM_EXP = re.compile(r'\$\{([a-zA-Z0-9_]+)\}')
+NONSTRING_PARAM_EXP = re.compile(r'^\$\{\{([a-zA-Z0-9_]+)\}\}$')
+GENERATOR_EXP = re.compile(r'\[([a-zA-Z0-9\-\\]+)\]\{([0-9]+)\}')
+
+# character classes of expression generators, as defined by Openshift
+SYMBOLS = '~!@#$%^&*()-_+={}[]\\|<,>.?/"\';:`'
+CHAR_CLASSES = {
+    '\\w': string.ascii_letters + string.digits + '_',
+    '\\d': string.digits,
+    '\\a': string.ascii_letters + string.digits,
+    '\\A': SYMBOLS,
+}
+MAX_GENERATED_LENGTH = 255
+
+_random = random.SystemRandom()
+
+
+class UnsupportedTemplate(Exception):
+    """Template uses features which can only be processed server-side."""
+
+
+def _charset(expr):
+    """Expand the content of a generator bracket expression into characters."""
+    chars = ''
+    idx = 0
+    while idx < len(expr):
+        if expr[idx] == '\\':
+            token = expr[idx:idx + 2]
+            if token not in CHAR_CLASSES:
+                raise UnsupportedTemplate('Unknown character class: %s' % token)
+            chars += CHAR_CLASSES[token]
+            idx += 2
+        elif idx + 2 < len(expr) and expr[idx + 1] == '-':
+            start, end = expr[idx], expr[idx + 2]
+            if start > end:
+                raise UnsupportedTemplate('Invalid range: %s' % expr[idx:idx + 3])
+            chars += ''.join(six.unichr(c) for c in range(ord(start), ord(end) + 1))
+            idx += 3
+        else:
+            chars += expr[idx]
+            idx += 1
+    return chars
+
+
+def generate(expression):
+    """Generate a value from an expression such as `[a-zA-Z0-9]{16}`.
+
+    Every `[chars]{length}` generator of the expression is replaced by random
+    characters, any other text is kept as is.
+
+    :param str expression: generator expression
+    :returns: generated value
+    :rtype: str
+    :raises UnsupportedTemplate: if the expression cannot be generated locally
+    """
+    def replace(match):
+        length = int(match.group(2))
+        if length > MAX_GENERATED_LENGTH:
+            raise UnsupportedTemplate('Generated value too long: %s' % match.group(0))
+        chars = _charset(match.group(1))
+        return ''.join(_random.choice(chars) for _ in range(length))
+
+    if not GENERATOR_EXP.search(expression or ''):
+        raise UnsupportedTemplate('Unsupported expression: %s' % expression)
+    return GENERATOR_EXP.sub(replace, expression)
+
+
+def _parameter_values(template):
+    values = {}
+    parameters = copy.deepcopy(template.get('parameters') or [])
+    for param in parameters:
+        name = param.get('name')
+        if not name:
+            raise KubeShiftError('Template parameter missing name')
+
+        if param.get('value'):
+            pass
+        elif param.get('generate'):
+            if param['generate'] != 'expression':
+                raise UnsupportedTemplate('Unsupported generator: %s' % param['generate'])
+            param['value'] = generate(param.get('from'))
+        elif param.get('required'):
+            raise KubeShiftError('Template parameter %s is required' % name)
+        else:
+            param['value'] = ''
+
+        value = param['value']
+        values[name] = value if isinstance(value, six.string_types) else json.dumps(value)
+    return parameters, values
+
+
+def generates_values(template):
+    """Check if processing a template generates parameter values.
+
+    :param dict template: template object
+    :rtype: bool
+    """
+    return any(p.get('generate') and not p.get('value') for p in template.get('parameters') or [])
+
+
+def _substitute(value, values):
+    if isinstance(value, dict):
+        return dict((_substitute(k, values), _substitute(v, values)) for k, v in value.items())
+    if isinstance(value, list):
+        return [_substitute(v, values) for v in value]
+    if not isinstance(value, six.string_types):
+        return value
+
+    match = NONSTRING_PARAM_EXP.match(value)
+    if match and match.group(1) in values:
+        try:
+            return json.loads(values[match.group(1)])
+        except ValueError:
+            return values[match.group(1)]
+    if '${{' in value:
+        raise UnsupportedTemplate('Unsupported non-string parameter: %s' % value)
+
+    return PARAM_EXP.sub(lambda m: values.get(m.group(1), m.group(0)), value)
+
+
+def render(template):
+    """Process a template locally.
+
+    Parameters are resolved from their value, generated from their `expression`
+    or rejected when required and missing, then substituted in every object
+    (`${NAME}` as string, `${{NAME}}` as JSON value).
+
+    :param dict template: template object
+    :returns: processed template, as returned by the server
+    :rtype: dict
+    :raises UnsupportedTemplate: if the template requires server-side processing
+    :raises kubeshift.exceptions.KubeShiftError: if a required parameter is missing
+    """
+    if template.get('labels'):
+        raise UnsupportedTemplate('Template labels are only applied server-side')
+
+    parameters, values = _parameter_values(template)
+
+    processed = copy.deepcopy(template)
+    processed['parameters'] = parameters
+    processed['objects'] = [_substitute(o, values) for o in template.get('objects') or []]
+    return processed
+
+
+class TemplateCache(object):
+    """Cache of processed templates.
+
+    Entries are keyed by a hash of the template content, which includes the
+    parameter values, and of the namespace. They are kept in memory (least
+    recently used entries are evicted first) and optionally on disk to be
+    shared across processes.
+
+    .. note::
+
+        Templates generating values (`generate: expression` parameters) are
+        processed again by every create, so that passwords and tokens are
+        never reused. Their processed output is only kept in memory, for the
+        delete of the objects created.
+    """
+
+    # names of the files written to the directory, which may hold other files
+    prefix = 'kubeshift-template-'
+    suffix = '.json'
+
+    def __init__(self, directory=None, size=128):
+        """Constructor.
+
+        :param str directory: directory where processed templates are saved (default: memory only)
+        :param int size: maximum number of processed templates kept in memory
+        """
+        self.directory = directory
+        self.size = size
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(template, namespace=None):
+        """Compute the cache key of a template.
+
+        :param dict template: template object
+        :param str namespace: namespace the template is processed in
+        :returns: hash of the template content and namespace
+        :rtype: str
+        """
+        content = {'namespace': namespace, 'template': template}
+        return hashlib.sha256(json.dumps(content, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, self.prefix + key + self.suffix)
+
+    def get(self, key):
+        """Get a processed template.
+
+        :param str key: cache key of the template
+        :returns: processed template or None when not cached
+        :rtype: dict
+        """
+        with self._lock:
+            data = self._entries.pop(key, None)
+            if data is not None:
+                self._entries[key] = data
+                return copy.deepcopy(data)
+
+        if not self.directory or not os.path.isfile(self._path(key)):
+            return None
+
+        try:
+            with open(self._path(key), 'r') as fd:
+                data = json.load(fd)
+        except (IOError, OSError, ValueError):
+            logger.warning('Ignoring unreadable processed template %s', self._path(key))
+            return None
+
+        self._remember(key, data)
+        return copy.deepcopy(data)
+
+    def set(self, key, data, persist=True):
+        """Save a processed template.
+
+        :param str key: cache key of the template
+        :param dict data: processed template
+        :param bool persist: whether the template is saved on disk as well, when a directory is set
+        """
+        self._remember(key, copy.deepcopy(data))
+
+        if not self.directory or not persist:
+            return
+
+        if not os.path.exists(self.directory):
+            os.makedirs(self.directory)
+
+        # write then rename so that readers never see a partial file
+        fd, tmp = tempfile.mkstemp(prefix=self.prefix, suffix='.tmp', dir=self.directory)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f)
+            os.rename(tmp, self._path(key))
+        except Exception:
+            os.remove(tmp)
+            raise
+
+    def _remember(self, key, data):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = data
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove every processed template from memory and disk.
+
+        Only the files written by the cache are removed from its directory.
+        """
+        with self._lock:
+            self._entries.clear()
+
+        if self.directory and os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                if name.startswith(self.prefix) and name.endswith(self.suffix):
+                    os.remove(os.path.join(self.directory, name))
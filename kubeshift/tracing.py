@@ -0,0 +1,112 @@
+"""Tracing of the requests sent by the clients.
+
+Tracing is disabled by default and costs next to nothing. Once enabled
+with OpenTelemetry (``pip install kubeshift[tracing]``), every request is
+recorded as a span with children for its phases, and operations made of
+several requests (files, templates) as parent spans::
+
+    from kubeshift import tracing
+
+    tracing.enable()            # tracer of the global tracer provider
+    tracing.enable(provider)    # or of a given provider
+
+Any object providing the ``start_as_current_span`` method of OpenTelemetry
+tracers may be given with ``enable(tracer=...)``.
+"""
+import functools
+
+from kubeshift.exceptions import KubeShiftError
+
+_tracer = None
+# context module of OpenTelemetry, imported once tracing is enabled
+_otel_context = None
+
+
+class _NoopSpan(object):
+    """Span used while tracing is disabled, also its own context manager."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def set_attribute(self, key, value):
+        pass
+
+    def is_recording(self):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def enable(tracer_provider=None, tracer=None):
+    """Record the spans of every client.
+
+    :param tracer_provider: OpenTelemetry tracer provider (default: the global provider)
+    :param tracer: tracer to use instead of one of the tracer provider
+    """
+    global _tracer, _otel_context
+    try:
+        from opentelemetry import context as otel_context
+        from opentelemetry import trace as otel_trace
+    except ImportError:
+        otel_context = otel_trace = None
+    if tracer is None:
+        if otel_trace is None:
+            raise KubeShiftError('Tracing requires the opentelemetry-api package')
+        tracer = otel_trace.get_tracer('kubeshift', tracer_provider=tracer_provider)
+    _otel_context = otel_context
+    _tracer = tracer
+
+
+def disable():
+    """Stop recording spans."""
+    global _tracer
+    _tracer = None
+
+
+def enabled():
+    """Whether spans are recorded."""
+    return _tracer is not None
+
+
+def span(name, attributes=None):
+    """Start a span, the current span until the context manager exits.
+
+    Attributes with a None value are left out. While tracing is disabled a
+    no-op span is returned.
+
+    :param str name: name of the span
+    :param dict attributes: attributes of the span
+    :returns: context manager giving the span
+    """
+    tracer = _tracer
+    if tracer is None:
+        return _NOOP_SPAN
+    if attributes:
+        attributes = dict((k, v) for k, v in attributes.items() if v is not None)
+    return tracer.start_as_current_span(name, attributes=attributes)
+
+
+def wrap(func):
+    """Run func in the tracing context of the caller, wherever it is called.
+
+    Threads do not inherit the current span of the thread starting them;
+    functions run by worker threads are wrapped so their spans get the
+    right parent.
+    """
+    otel_context = _otel_context
+    if _tracer is None or otel_context is None:
+        return func
+    ctx = otel_context.get_current()
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        token = otel_context.attach(ctx)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            otel_context.detach(token)
+    return wrapper
@@ -36,6 +36,10 @@ setup(
     license="LGPL3",
     packages=find_packages(),
     install_requires=_install_requirements(),
+    extras_require={
+        'aio': ['aiohttp>=3.0'],
+        'tracing': ['opentelemetry-api'],
+    },
     keywords=['kubernetes', 'kubeshift', 'openshift', 'docker'],
     classifiers=[]
 )
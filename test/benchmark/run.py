@@ -0,0 +1,325 @@
+"""Benchmarks of the clients against an in-process fake API server.
+
+Every benchmark is repeated and its best run is kept, results can be
+saved and compared with the results of another version::
+
+    python test/benchmark/run.py --output before.json
+    python test/benchmark/run.py --compare before.json
+
+Adverse conditions are injected by the server with the fault options,
+such as ``--latency 20 --throttle 0.05 --drops 0.01``. Failed requests
+are then counted rather than aborting the benchmarks.
+
+The traffic of the benchmarks can be recorded to a cassette, then
+replayed without server nor network to measure the client side alone::
+
+    python test/benchmark/run.py discovery list_10k --record session.jsonl.gz
+    python test/benchmark/run.py --replay session.jsonl.gz
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from multiprocessing.pool import ThreadPool
+from timeit import default_timer as timer
+
+import yaml
+
+ROOT = os.path.join(os.path.dirname(os.path.realpath(__file__)), os.pardir, os.pardir)
+sys.path.insert(0, ROOT)
+
+import kubeshift  # noqa: E402
+from kubeshift import KubernetesClient  # noqa: E402
+from kubeshift.cassette import Cassette  # noqa: E402
+from kubeshift.exceptions import KubeConnectionError, KubeRequestError  # noqa: E402
+
+from server import FakeApiServer, Faults, make_pod  # noqa: E402
+
+NAMESPACE = 'bench'
+PODS = '/api/v1/namespaces/%s/pods' % NAMESPACE
+
+BENCHMARKS = []
+
+# cassette recording the traffic of the benchmarks, if any
+_recording = None
+
+
+def benchmark(name, unit):
+    """Register a benchmark.
+
+    The function prepares the server (and a temporary directory) and returns
+    a (run, count) tuple, count being the number of units handled by each
+    call of run. run may return the number of units which failed.
+    """
+    def decorator(func):
+        BENCHMARKS.append((name, unit, func))
+        return func
+    return decorator
+
+
+def new_client(server):
+    """Build a client of the server, recording its traffic when requested."""
+    adapter = _recording.recorder() if _recording is not None else None
+    return KubernetesClient(server.config(), adapter=adapter)
+
+
+def _bench_import(statement):
+    # a new interpreter per import, its startup is part of the measure
+    def setup(server, scale, tmpdir):
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join([ROOT, os.environ.get('PYTHONPATH', '')]))
+
+        def run():
+            subprocess.check_call([sys.executable, '-c', statement], env=env)
+        return run, 1
+    return setup
+
+
+benchmark('import_config', 'imports')(_bench_import('import kubeshift.config'))
+benchmark('import_client', 'imports')(_bench_import('from kubeshift import KubernetesClient'))
+
+
+@benchmark('construction', 'clients')
+def bench_construction(server, scale, tmpdir):
+    def run():
+        new_client(server)
+    return run, 1
+
+
+@benchmark('discovery', 'discoveries')
+def bench_discovery(server, scale, tmpdir):
+    client = new_client(server)
+    return client.discover, 1
+
+
+def _bench_list(size):
+    def setup(server, scale, tmpdir):
+        count = int(size * scale)
+        server.populate(PODS, count, lambda idx: make_pod(idx, NAMESPACE))
+        client = new_client(server)
+
+        def run():
+            client.pods(NAMESPACE).all()
+        return run, count
+    return setup
+
+
+benchmark('list_10k', 'items')(_bench_list(10000))
+benchmark('list_100k', 'items')(_bench_list(100000))
+
+
+def _bench_create(workers, size=500):
+    def setup(server, scale, tmpdir):
+        count = int(size * scale)
+        client = new_client(server)
+        path = os.path.join(tmpdir, 'pods.yaml')
+        with open(path, 'w') as fd:
+            yaml.safe_dump_all([make_pod(idx, NAMESPACE) for idx in range(count)], fd)
+
+        def create(obj):
+            try:
+                client.create(obj, NAMESPACE)
+            except (KubeConnectionError, KubeRequestError):
+                return 1
+            return 0
+
+        def run():
+            server.clear()
+            # objects are created one by one so that failures do not end the batch
+            with open(path) as fd:
+                objs = list(yaml.safe_load_all(fd))
+            pool = ThreadPool(workers)
+            try:
+                return sum(pool.map(create, objs))
+            finally:
+                pool.close()
+                pool.join()
+        return run, count
+    return setup
+
+
+benchmark('create_serial', 'objects')(_bench_create(1))
+benchmark('create_10_workers', 'objects')(_bench_create(10))
+
+
+@benchmark('watch', 'events')
+def bench_watch(server, scale, tmpdir):
+    count = int(20000 * scale)
+    server.populate(PODS, count, lambda idx: make_pod(idx, NAMESPACE))
+    client = new_client(server)
+
+    def run():
+        # the watch starts with an event per existing pod, then waits for changes
+        events = client.pods(NAMESPACE).watch()
+        try:
+            received = sum(1 for _ in itertools.islice(events, count))
+        finally:
+            events.close()
+        return count - received
+    return run, count
+
+
+def run_benchmarks(names=None, repeat=3, scale=1.0, faults=None):
+    """Run the benchmarks, each against a new server.
+
+    :param list names: benchmarks to run, all of them when empty
+    :param int repeat: runs of each benchmark, the best one is kept
+    :param float scale: factor applied to the sizes of the benchmarks
+    :param dict faults: arguments of the Faults injected by the server
+    :returns: results keyed by benchmark name
+    """
+    results = {}
+    for name, unit, setup in BENCHMARKS:
+        if names and name not in names:
+            continue
+        tmpdir = tempfile.mkdtemp(prefix='kubeshift-bench-')
+        try:
+            with FakeApiServer() as server:
+                run, count = setup(server, scale, tmpdir)
+                # faults are injected once the benchmark is set up
+                server.faults = Faults(**faults) if faults else None
+                runs = []
+                for _ in range(repeat):
+                    start = timer()
+                    try:
+                        failures = run() or 0
+                    except (KubeConnectionError, KubeRequestError):
+                        failures = count
+                    runs.append((timer() - start, failures))
+        finally:
+            shutil.rmtree(tmpdir)
+        # the best run handled the most units per second
+        seconds, failures = max(runs, key=lambda r: (count - r[1]) / r[0])
+        rate = (count - failures) / seconds
+        results[name] = {'unit': unit, 'count': count, 'seconds': seconds, 'rate': rate, 'failures': failures}
+        sys.stderr.write('%-20s %12.1f %s/s%s\n' % (name, rate, unit, ' (%d failed)' % failures if failures else ''))
+    return results
+
+
+def replay(cassette, repeat=3, timing=0):
+    """Replay the interactions of a cassette through the client, in order.
+
+    The client is built from the cassette, discovery included, and every
+    recorded request is issued again, watches and logs as streams. Recorded
+    error statuses are expected, only requests the cassette cannot answer
+    count as failures.
+
+    :param Cassette cassette: recorded interactions
+    :param int repeat: runs of the replay, the best one is kept
+    :param float timing: factor applied to the recorded latency of the responses
+    :returns: results keyed by benchmark name
+    """
+    # requests are matched by path, the server of the recording does not matter
+    config = {
+        'kind': 'Config', 'apiVersion': 'v1', 'current-context': 'replay',
+        'contexts': [{'name': 'replay', 'context': {'cluster': 'replay', 'user': 'replay'}}],
+        'clusters': [{'name': 'replay', 'cluster': {'server': 'http://replay.invalid'}}],
+        'users': [{'name': 'replay', 'user': {'token': 'replay'}}],
+    }
+    client = KubernetesClient(config, adapter=cassette.player(timing))
+    base_url = client.base_url
+    count = len(cassette.interactions)
+
+    def issue(interaction):
+        url = base_url + interaction.path
+        try:
+            if 'watch=' in interaction.path or interaction.path.split('?')[0].endswith('/log'):
+                sum(1 for _ in client.stream(interaction.method.lower(), url))
+            else:
+                data = json.loads(interaction.body.decode('utf-8')) if interaction.body else None
+                client.request(interaction.method.lower(), url, data)
+        except KubeRequestError:
+            pass
+        except KubeConnectionError:
+            return 1
+        return 0
+
+    runs = []
+    for _ in range(repeat):
+        cassette.rewind()
+        start = timer()
+        failures = sum(issue(interaction) for interaction in cassette.interactions)
+        runs.append((timer() - start, failures))
+    seconds, failures = min(runs)
+    rate = (count - failures) / seconds
+    sys.stderr.write('%-20s %12.1f requests/s%s\n' % ('replay', rate, ' (%d failed)' % failures if failures else ''))
+    return {'replay': {'unit': 'requests', 'count': count, 'seconds': seconds, 'rate': rate, 'failures': failures}}
+
+
+def environment():
+    """Describe what the results were measured with."""
+    return {
+        'kubeshift': kubeshift.__version__,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'date': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+    }
+
+
+def compare(results, baseline):
+    """Describe the change of the rates relative to a baseline."""
+    lines = ['%-20s %14s %14s %8s' % ('benchmark', 'baseline', 'current', 'change')]
+    for name in sorted(results):
+        if name not in baseline:
+            continue
+        before, after = baseline[name]['rate'], results[name]['rate']
+        lines.append('%-20s %14.1f %14.1f %+7.1f%%' % (name, before, after, 100.0 * (after - before) / before))
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('names', nargs='*', metavar='name',
+                        help='benchmarks to run among %s (default: all of them)' % ', '.join(b[0] for b in BENCHMARKS))
+    parser.add_argument('--repeat', type=int, default=3, help='runs of each benchmark, the best one is kept')
+    parser.add_argument('--scale', type=float, default=1.0, help='factor applied to the sizes of the benchmarks')
+    parser.add_argument('--output', help='file to save the results to (JSON)')
+    parser.add_argument('--compare', help='results of a previous run to compare to')
+    parser.add_argument('--record', metavar='FILE', help='record the traffic of the benchmarks to a cassette')
+    parser.add_argument('--replay', metavar='FILE', help='replay a cassette instead of running the benchmarks')
+    parser.add_argument('--replay-timing', type=float, default=0,
+                        help='factor applied to the recorded latency while replaying (default: 0, no wait)')
+    group = parser.add_argument_group('faults injected by the server')
+    group.add_argument('--latency', type=float, default=0, help='milliseconds added to every response')
+    group.add_argument('--jitter', type=float, default=0, help='maximum random milliseconds added to the latency')
+    group.add_argument('--throttle', type=float, default=0, help='ratio of requests rejected with 429')
+    group.add_argument('--errors', type=float, default=0, help='ratio of requests failing with 500 or 503')
+    group.add_argument('--drops', type=float, default=0, help='ratio of connections closed without response')
+    group.add_argument('--seed', type=int, help='seed of the faults, for reproducible runs')
+    args = parser.parse_args(argv)
+    unknown = set(args.names) - set(b[0] for b in BENCHMARKS)
+    if unknown:
+        parser.error('unknown benchmarks: %s' % ', '.join(sorted(unknown)))
+
+    if args.replay and (args.names or args.record):
+        parser.error('--replay runs no other benchmark')
+
+    faults = dict(latency=args.latency / 1000.0, jitter=args.jitter / 1000.0, throttle=args.throttle,
+                  errors=args.errors, drops=args.drops, seed=args.seed)
+    if not any((args.latency, args.jitter, args.throttle, args.errors, args.drops)):
+        faults = None
+    if args.replay:
+        results = replay(Cassette.load(args.replay), args.repeat, args.replay_timing)
+    else:
+        global _recording
+        _recording = Cassette(args.record) if args.record else None
+        results = run_benchmarks(args.names, args.repeat, args.scale, faults)
+        if _recording is not None:
+            _recording.save()
+
+    if args.output:
+        with open(args.output, 'w') as fd:
+            json.dump({'environment': environment(), 'faults': faults, 'results': results}, fd, indent=2, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as fd:
+            print(compare(results, json.load(fd)['results']))
+
+
+if __name__ == '__main__':
+    main()
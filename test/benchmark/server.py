@@ -0,0 +1,692 @@
+"""In-process fake Kubernetes/OpenShift API server.
+
+The discovery is served from the fixtures of the unit tests and objects
+are kept in memory. Lists (with label and field selectors), get, create,
+replace, patch, delete and watch are supported for every discovered
+resource, as well as the status, scale, log and eviction subresources and
+the processing of OpenShift templates::
+
+    with FakeApiServer() as server:
+        server.populate('/api/v1/namespaces/bench/pods', 10000, make_pod)
+        client = KubernetesClient(server.config())
+
+Adverse conditions can be injected to measure the clients under load::
+
+    server.faults = Faults(latency=0.05, jitter=0.02, throttle=0.1, errors=0.01, drops=0.01, seed=1)
+"""
+import collections
+import copy
+import itertools
+import json
+import os
+import random
+import re
+import socket
+import string
+import threading
+import time
+import uuid
+
+from six.moves import BaseHTTPServer
+from six.moves import socketserver
+import six.moves.urllib.parse as urlparse
+
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), os.pardir, 'unit', 'fixtures')
+
+#: discovery documents keyed by path
+DISCOVERY = {
+    '/api/v1': 'kubernetes_resources_v1.json',
+    '/apis': 'kubernetes_apigroups.json',
+    '/apis/apps/v1alpha1': 'kubernetes_resources_apps_v1alpha1.json',
+    '/apis/authentication.k8s.io/v1beta1': 'kubernetes_resources_authentication_v1beta1.json',
+    '/apis/autoscaling/v1': 'kubernetes_resources_autoscaling_v1.json',
+    '/apis/batch/v1': 'kubernetes_resources_batch_v1.json',
+    '/apis/batch/v2alpha1': 'kubernetes_resources_batch_v2alpha1.json',
+    '/apis/extensions/v1beta1': 'kubernetes_resources_extensions_v1beta1.json',
+    '/oapi/v1': 'openshift_resources_v1.json',
+}
+
+#: paths of the discovery besides the discovery documents
+DISCOVERY_PATHS = ('/api', '/oapi', '/version')
+
+#: target of a request: collection (root path and resource name), namespace, name and subresource
+Target = collections.namedtuple('Target', 'root resource namespace name subresource')
+
+
+def make_pod(index, namespace='default'):
+    """Build a synthetic pod of a realistic size."""
+    name = 'pod-%d' % index
+    return {
+        'apiVersion': 'v1',
+        'kind': 'Pod',
+        'metadata': {
+            'name': name,
+            'namespace': namespace,
+            'labels': {'app': 'bench', 'shard': str(index % 10)},
+            'annotations': {'kubeshift.io/index': str(index)},
+        },
+        'spec': {
+            'containers': [{
+                'name': 'app',
+                'image': 'registry.example.com/bench/app:1.0',
+                'ports': [{'containerPort': 8080, 'protocol': 'TCP'}],
+                'resources': {'requests': {'cpu': '100m', 'memory': '64Mi'}},
+            }],
+            'restartPolicy': 'Always',
+        },
+        'status': {'phase': 'Running', 'podIP': '10.0.%d.%d' % (index // 250 % 250, index % 250)},
+    }
+
+
+def status(code, reason, message=''):
+    """Build the Status object of a failed request."""
+    return {'kind': 'Status', 'apiVersion': 'v1', 'status': 'Failure',
+            'code': code, 'reason': reason, 'message': message}
+
+
+class ApiError(Exception):
+    """Error of a request, sent as a Status object."""
+
+    def __init__(self, code, reason, message=''):
+        super(ApiError, self).__init__(message)
+        self.code = code
+        self.body = status(code, reason, message)
+
+
+_SET_SELECTOR = re.compile(r'^\s*([^\s!=]+)\s+(in|notin)\s+\(([^)]*)\)\s*$')
+
+
+def _split_selector(expr):
+    # commas also separate the values of set based requirements
+    parts, depth, current = [], 0, ''
+    for char in expr:
+        depth += {'(': 1, ')': -1}.get(char, 0)
+        if char == ',' and not depth:
+            parts.append(current)
+            current = ''
+        else:
+            current += char
+    return [p.strip() for p in parts + [current] if p.strip()]
+
+
+def label_matcher(expr):
+    """Build a predicate on labels from a label selector.
+
+    :param str expr: selector such as ``app in (web,db),tier!=cache,!legacy``
+    :rtype: callable
+    """
+    requirements = []
+    for part in _split_selector(expr or ''):
+        match = _SET_SELECTOR.match(part)
+        if match:
+            key, values = match.group(1), set(v.strip() for v in match.group(3).split(','))
+            negate = match.group(2) == 'notin'
+            requirements.append(lambda labels, k=key, v=values, n=negate: (labels.get(k) in v) != n)
+        elif '=' in part:
+            negate = '!=' in part
+            key, value = [p.strip() for p in re.split('!=|==|=', part, 1)]
+            requirements.append(lambda labels, k=key, v=value, n=negate: (labels.get(k) == v) != n)
+        elif part.startswith('!'):
+            requirements.append(lambda labels, k=part[1:]: k not in labels)
+        else:
+            requirements.append(lambda labels, k=part: k in labels)
+    return lambda labels: all(r(labels) for r in requirements)
+
+
+def field_matcher(expr):
+    """Build a predicate on objects from a field selector such as ``metadata.name=web``."""
+    requirements = []
+    for part in _split_selector(expr or ''):
+        negate = '!=' in part
+        path, value = [p.strip() for p in re.split('!=|==|=', part, 1)]
+
+        def get(obj, path=path):
+            for key in path.split('.'):
+                obj = obj.get(key) if isinstance(obj, dict) else None
+            return '' if obj is None else str(obj)
+        requirements.append(lambda obj, g=get, v=value, n=negate: (g(obj) == v) != n)
+    return lambda obj: all(r(obj) for r in requirements)
+
+
+def merge_patch(target, patch):
+    """Apply a JSON merge patch (RFC 7386)."""
+    if not isinstance(patch, dict):
+        return copy.deepcopy(patch)
+    result = copy.deepcopy(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            result[key] = merge_patch(result.get(key), value)
+    return result
+
+
+def json_patch(target, operations):
+    """Apply a JSON patch (RFC 6902), the add, remove, replace and test operations."""
+    result = copy.deepcopy(target)
+    for op in operations:
+        tokens = [t.replace('~1', '/').replace('~0', '~') for t in op['path'].lstrip('/').split('/')]
+        parent = result
+        try:
+            for token in tokens[:-1]:
+                parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+            last = tokens[-1]
+            if isinstance(parent, list):
+                last = len(parent) if last == '-' else int(last)
+            if op['op'] == 'test':
+                if parent[last] != op['value']:
+                    raise ApiError(422, 'Invalid', 'test operation failed on %s' % op['path'])
+            elif op['op'] == 'remove':
+                del parent[last]
+            elif op['op'] == 'replace':
+                if isinstance(parent, dict) and last not in parent:
+                    raise KeyError(last)
+                parent[last] = op['value']
+            elif op['op'] == 'add' and isinstance(parent, list):
+                parent.insert(last, op['value'])
+            elif op['op'] == 'add':
+                parent[last] = op['value']
+            else:
+                raise ApiError(422, 'Invalid', 'unsupported operation %s' % op['op'])
+        except (KeyError, IndexError, TypeError, ValueError):
+            raise ApiError(422, 'Invalid', 'invalid path %s' % op['path'])
+    return result
+
+
+class Faults(object):
+    """Adverse conditions injected into the requests.
+
+    Ratios are probabilities between 0 and 1, drawn for each request.
+    """
+
+    def __init__(self, latency=0, jitter=0, throttle=0, errors=0, drops=0, retry_after=1,
+                 discovery=False, seed=None):
+        """Constructor.
+
+        :param float latency: seconds added before every response
+        :param float jitter: maximum random seconds added to the latency
+        :param float throttle: ratio of requests rejected with 429 Too Many Requests
+        :param float errors: ratio of requests failing with 500 or 503
+        :param float drops: ratio of connections closed without a response
+        :param int retry_after: seconds given by the Retry-After header of throttled requests
+        :param bool discovery: whether faults also hit the discovery
+        :param int seed: seed of the random draws, for reproducible runs
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.throttle = throttle
+        self.errors = errors
+        self.drops = drops
+        self.retry_after = retry_after
+        self.discovery = discovery
+        self.random = random.Random(seed)
+
+    def delay(self):
+        """Seconds to wait before responding."""
+        return self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0)
+
+    def pick(self):
+        """Pick the fault of a request: `drop`, `throttle`, `error` or None."""
+        draw = self.random.random()
+        for fault, ratio in (('drop', self.drops), ('throttle', self.throttle), ('error', self.errors)):
+            if draw < ratio:
+                return fault
+            draw -= ratio
+        return None
+
+
+class FakeApiServer(object):
+    """Serve the discovery fixtures and an in-memory store over HTTP.
+
+    :ivar Faults faults: adverse conditions injected into the requests (None for none)
+    :ivar collections.Counter stats: number of requests and of injected faults by type
+    """
+
+    def __init__(self, address='127.0.0.1', port=0, faults=None, history=10000):
+        """Constructor.
+
+        :param str address: address to listen on
+        :param int port: port to listen on (0 picks a free port)
+        :param Faults faults: adverse conditions injected into the requests
+        :param int history: number of changes kept for watches resuming from a resource version
+        """
+        self.address = (address, port)
+        self.faults = faults
+        self.stats = collections.Counter()
+        self.resource_version = 0
+        # objects keyed by (namespace, name), by collection (root, resource)
+        self._objects = collections.defaultdict(collections.OrderedDict)
+        # changes as (resource version, type, collection, object)
+        self._events = collections.deque(maxlen=history)
+        # encoded lists keyed by target and selectors, with their resource version
+        self._lists = {}
+        self._lock = threading.RLock()
+        self._changed = threading.Condition(self._lock)
+        self._stopping = False
+        self._server = None
+
+        self._discovery = {}
+        self._resources = {}
+        for path, filename in DISCOVERY.items():
+            with open(os.path.join(FIXTURE_DIR, filename), 'rb') as fd:
+                self._discovery[path] = fd.read()
+            data = json.loads(self._discovery[path].decode('utf-8'))
+            if 'resources' in data:
+                self._resources[path] = dict((r['name'], r) for r in data['resources'])
+
+    @property
+    def url(self):
+        """Base url of the server."""
+        return 'http://%s:%d' % self._server.server_address[:2]
+
+    def config(self):
+        """Build a kubeconfig targeting the server."""
+        return {
+            'kind': 'Config',
+            'apiVersion': 'v1',
+            'current-context': 'bench',
+            'contexts': [{'name': 'bench', 'context': {'cluster': 'bench', 'user': 'bench'}}],
+            'clusters': [{'name': 'bench', 'cluster': {'server': self.url}}],
+            'users': [{'name': 'bench', 'user': {'token': 'bench'}}],
+        }
+
+    def start(self):
+        """Listen from a background thread."""
+        self._stopping = False
+        self._server = _Server(self.address, _Handler)
+        self._server.api = self
+        thread = threading.Thread(target=self._server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        return self
+
+    def stop(self):
+        """Stop listening and end the watches."""
+        with self._changed:
+            self._stopping = True
+            self._changed.notify_all()
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+        return False
+
+    def count(self, name):
+        """Increment a counter of the stats."""
+        with self._lock:
+            self.stats[name] += 1
+
+    def resolve(self, path):
+        """Find the target of a request path, None when it is not a resource."""
+        segments = path.strip('/').split('/')
+        size = 3 if segments[0] == 'apis' else 2
+        root, rest = '/' + '/'.join(segments[:size]), segments[size:]
+        resources = self._resources.get(root)
+        if not resources or not rest:
+            return None
+
+        namespace = None
+        if len(rest) >= 3 and rest[0] == 'namespaces' and rest[2] in resources:
+            namespace, rest = rest[1], rest[2:]
+        if rest[0] not in resources:
+            return None
+        return Target(root, rest[0], namespace, rest[1] if len(rest) > 1 else None, rest[2] if len(rest) > 2 else None)
+
+    def populate(self, path, count, factory=make_pod):
+        """Add synthetic objects to a collection.
+
+        :param str path: path of the collection, such as /api/v1/namespaces/bench/pods
+        :param int count: number of objects
+        :param callable factory: builds an object from its index
+        """
+        target = self.resolve(path)
+        with self._changed:
+            start = len(self._objects[target[:2]])
+            for idx in range(start, start + count):
+                obj = factory(idx)
+                if target.namespace:
+                    obj['metadata']['namespace'] = target.namespace
+                self._store(target, obj, 'ADDED')
+            self._changed.notify_all()
+
+    def clear(self):
+        """Remove every object and forget the changes."""
+        with self._lock:
+            self._objects.clear()
+            self._events.clear()
+            self._lists.clear()
+
+    def objects(self, path):
+        """Objects stored in a collection (of every namespace for cluster-wide paths)."""
+        target = self.resolve(path)
+        with self._lock:
+            return [o for (ns, _), o in self._objects[target[:2]].items()
+                    if target.namespace is None or ns == target.namespace]
+
+    def _store(self, target, obj, event_type):
+        self.resource_version += 1
+        metadata = obj['metadata']
+        metadata['resourceVersion'] = str(self.resource_version)
+        key = (metadata.get('namespace'), metadata['name'])
+        collection = self._objects[target[:2]]
+        if event_type == 'DELETED':
+            collection.pop(key, None)
+        else:
+            collection[key] = obj
+        self._events.append((self.resource_version, event_type, target[:2], obj))
+
+    def _get(self, target):
+        obj = self._objects[target[:2]].get((target.namespace, target.name))
+        if obj is None:
+            raise ApiError(404, 'NotFound', '%s "%s" not found' % (target.resource, target.name))
+        return obj
+
+    def _matcher(self, target, query):
+        labels = label_matcher(query.get('labelSelector'))
+        fields = field_matcher(query.get('fieldSelector'))
+
+        def match(obj):
+            metadata = obj['metadata']
+            if target.namespace is not None and metadata.get('namespace') != target.namespace:
+                return False
+            return labels(metadata.get('labels') or {}) and fields(obj)
+        return match
+
+    def handle(self, method, path, query=None, body=None, content_type=None):
+        """Process a request, other than a watch.
+
+        :param str method: http method, in upper case
+        :param str path: path of the url
+        :param dict query: parameters of the query string
+        :param body: decoded content of the request
+        :param str content_type: content type of the request
+        :returns: status code and content of the response
+        :rtype: tuple
+        :raises ApiError: when the request fails
+        """
+        query = query or {}
+        path = path.rstrip('/')
+        if method == 'GET' and path in self._discovery:
+            return 200, self._discovery[path]
+        if path == '/version':
+            return 200, {'major': '1', 'minor': '6', 'gitVersion': 'v1.6.0-fake'}
+        if path in ('/api', '/oapi'):
+            return 200, {'kind': 'APIVersions', 'versions': ['v1']}
+
+        target = self.resolve(path)
+        if target is None:
+            raise ApiError(404, 'NotFound', 'the server could not find the requested resource')
+
+        dry_run = query.get('dryRun') == 'All'
+        with self._changed:
+            if target.subresource:
+                result = self._subresource(method, target, body, content_type, dry_run)
+            elif method == 'GET' and target.name:
+                result = 200, self._get(target)
+            elif method == 'GET':
+                result = 200, self._list(target, query)
+            elif method == 'POST' and not target.name:
+                result = self._create(target, body, dry_run)
+            elif method == 'PUT' and target.name:
+                result = self._replace(target, body, dry_run)
+            elif method == 'PATCH' and target.name:
+                result = self._replace(target, self._patched(self._get(target), body, content_type), dry_run)
+            elif method == 'DELETE' and target.name:
+                obj = self._get(target)
+                if not dry_run:
+                    self._store(target, obj, 'DELETED')
+                result = 200, obj
+            else:
+                raise ApiError(405, 'MethodNotAllowed', '%s is not supported on %s' % (method, path))
+            self._changed.notify_all()
+        return result
+
+    def _list(self, target, query):
+        # lists are encoded once per version, the server should not slow down the clients
+        key = (target, query.get('labelSelector'), query.get('fieldSelector'))
+        cached = self._lists.get(key)
+        if cached is None or cached[0] != self.resource_version:
+            match = self._matcher(target, query)
+            items = [o for o in self._objects[target[:2]].values() if match(o)]
+            cached = self._lists[key] = (self.resource_version, json.dumps({
+                'kind': 'List', 'apiVersion': 'v1', 'items': items,
+                'metadata': {'resourceVersion': str(self.resource_version)}}).encode('utf-8'))
+        return cached[1]
+
+    def _create(self, target, obj, dry_run):
+        if target.root == '/oapi/v1' and target.resource == 'processedtemplates':
+            return 201, _process_template(obj)
+
+        obj = copy.deepcopy(obj or {})
+        metadata = obj.setdefault('metadata', {})
+        if not metadata.get('name') and metadata.get('generateName'):
+            metadata['name'] = metadata['generateName'] + ''.join(random.choice(string.ascii_lowercase) for _ in range(5))
+        if not metadata.get('name'):
+            raise ApiError(422, 'Invalid', 'metadata.name is required')
+        if target.namespace:
+            metadata['namespace'] = target.namespace
+        if (metadata.get('namespace'), metadata['name']) in self._objects[target[:2]]:
+            raise ApiError(409, 'AlreadyExists', '%s "%s" already exists' % (target.resource, metadata['name']))
+        metadata['uid'] = str(uuid.uuid4())
+        metadata['creationTimestamp'] = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+        if not dry_run:
+            self._store(target, obj, 'ADDED')
+        return 201, obj
+
+    def _replace(self, target, obj, dry_run):
+        current = self._get(target)
+        obj = copy.deepcopy(obj)
+        metadata = obj.setdefault('metadata', {})
+        version = metadata.get('resourceVersion')
+        if version and version != current['metadata']['resourceVersion']:
+            raise ApiError(409, 'Conflict', 'the object has been modified')
+        for key in ('uid', 'creationTimestamp', 'namespace', 'name'):
+            if key in current['metadata']:
+                metadata[key] = current['metadata'][key]
+        if not dry_run:
+            self._store(target, obj, 'MODIFIED')
+        return 200, obj
+
+    def _patched(self, obj, patch, content_type):
+        if content_type == 'application/json-patch+json':
+            return json_patch(obj, patch)
+        # lists of strategic merge patches are replaced rather than merged by key
+        return merge_patch(obj, patch)
+
+    def _subresource(self, method, target, body, content_type, dry_run):
+        if '%s/%s' % (target.resource, target.subresource) not in self._resources[target.root]:
+            raise ApiError(404, 'NotFound', 'the server could not find the requested resource')
+        obj = self._get(target)
+
+        if target.subresource == 'status':
+            if method == 'GET':
+                return 200, obj
+            if method == 'PATCH':
+                body = self._patched(obj, body, content_type)
+            if method in ('PUT', 'PATCH'):
+                changed = copy.deepcopy(obj)
+                changed['status'] = body.get('status')
+                return self._replace(target, changed, dry_run)
+        elif target.subresource == 'scale':
+            scale = {'kind': 'Scale', 'apiVersion': 'extensions/v1beta1',
+                     'metadata': {'name': target.name, 'namespace': target.namespace},
+                     'spec': {'replicas': obj.get('spec', {}).get('replicas', 0)},
+                     'status': {'replicas': obj.get('status', {}).get('replicas', 0)}}
+            if method == 'GET':
+                return 200, scale
+            if method == 'PATCH':
+                body = self._patched(scale, body, content_type)
+            if method in ('PUT', 'PATCH'):
+                changed = copy.deepcopy(obj)
+                changed.setdefault('spec', {})['replicas'] = body['spec']['replicas']
+                self._replace(target, changed, dry_run)
+                scale['spec']['replicas'] = body['spec']['replicas']
+                return 200, scale
+        elif target.subresource == 'log' and method == 'GET':
+            # the log of a pod is the content of its kubeshift.io/log annotation
+            return 200, obj['metadata'].get('annotations', {}).get('kubeshift.io/log', '').encode('utf-8')
+        elif target.subresource == 'eviction' and method == 'POST':
+            if not dry_run:
+                self._store(target, obj, 'DELETED')
+            return 201, {'kind': 'Status', 'apiVersion': 'v1', 'status': 'Success'}
+        raise ApiError(405, 'MethodNotAllowed', '%s is not supported on %s' % (method, target.subresource))
+
+    def watch(self, path, query=None):
+        """Changes of a collection, by batches of events.
+
+        Without resource version, the watch starts with an ADDED event for
+        every object of the collection. It ends after the timeoutSeconds of
+        the query or when the server stops.
+
+        :param str path: path of the collection
+        :param dict query: parameters of the query string
+        :returns: generator of lists of events
+        :raises ApiError: when the path is not a collection
+        """
+        query = query or {}
+        target = self.resolve(path.rstrip('/'))
+        if target is None or target.name:
+            raise ApiError(404, 'NotFound', 'the server could not find the requested resource')
+        return self._watch(target, query)
+
+    def _watch(self, target, query):
+        match = self._matcher(target, query)
+        timeout = float(query.get('timeoutSeconds') or 0)
+        deadline = time.time() + timeout if timeout else None
+
+        with self._lock:
+            since = query.get('resourceVersion')
+            if since in (None, '', '0'):
+                since = self.resource_version
+                initial = [o for o in self._objects[target[:2]].values() if match(o)]
+            else:
+                since, initial = int(since), []
+                oldest = self._events[0][0] if self._events else self.resource_version + 1
+                if since < oldest - 1:
+                    initial = None
+        if initial is None:
+            yield [{'type': 'ERROR', 'object': status(410, 'Expired', 'too old resource version: %d' % since)}]
+            return
+        if initial:
+            yield [{'type': 'ADDED', 'object': o} for o in initial]
+
+        while True:
+            with self._changed:
+                while not self._stopping and self.resource_version <= since:
+                    remaining = deadline - time.time() if deadline else 1
+                    if remaining <= 0:
+                        return
+                    self._changed.wait(min(remaining, 1))
+                if self._stopping:
+                    return
+                oldest = self._events[0][0]
+                pending = list(itertools.islice(self._events, max(since - oldest + 1, 0), None))
+                since = self.resource_version
+            events = [{'type': t, 'object': o} for _, t, key, o in pending if key == target[:2] and match(o)]
+            if events:
+                yield events
+
+
+def _process_template(template):
+    # substitute the ${NAME} parameters of the objects, as processedtemplates does
+    values = dict((p['name'], p.get('value', '')) for p in template.get('parameters', []))
+    content = re.sub(r'\$\{(\w+)\}', lambda m: values.get(m.group(1), m.group(0)), json.dumps(template.get('objects', [])))
+    processed = copy.deepcopy(template)
+    processed['objects'] = json.loads(content)
+    return processed
+
+
+class _Server(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
+class _Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    # keep connections alive, as the API server does
+    protocol_version = 'HTTP/1.1'
+    # send headers and content at once, small writes would wait for delayed acks
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def send_body(self, code, body, headers=None):
+        if isinstance(body, bytes):
+            content_type = 'application/json' if body[:1] in (b'{', b'[') else 'text/plain'
+        else:
+            content_type, body = 'application/json', json.dumps(body).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def stream(self, batches):
+        # chunked, as the API server does: clients read each chunk as soon as it is sent
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        try:
+            for events in batches:
+                data = b''.join(json.dumps(e).encode('utf-8') + b'\n' for e in events)
+                self.wfile.write(('%x\r\n' % len(data)).encode('ascii') + data + b'\r\n')
+                self.wfile.flush()
+            self.wfile.write(b'0\r\n\r\n')
+        except socket.error:
+            # the client stopped watching
+            self.close_connection = True
+
+    def inject_fault(self, path):
+        """Apply the faults of the server, True when the request must not be processed."""
+        api = self.server.api
+        faults = api.faults
+        path = path.rstrip('/')
+        if faults is None or (not faults.discovery and (path in api._discovery or path in DISCOVERY_PATHS)):
+            return False
+
+        delay = faults.delay()
+        if delay:
+            time.sleep(delay)
+        fault = faults.pick()
+        if fault:
+            api.count(fault)
+        if fault == 'drop':
+            self.close_connection = True
+        elif fault == 'throttle':
+            self.send_body(429, status(429, 'TooManyRequests', 'the server has received too many requests'),
+                           {'Retry-After': str(faults.retry_after)})
+        elif fault == 'error':
+            code = faults.random.choice((500, 503))
+            self.send_body(code, status(code, 'InternalError', 'injected failure'))
+        return fault is not None
+
+    def process(self):
+        api = self.server.api
+        api.count('requests')
+        parts = urlparse.urlparse(self.path)
+        query = dict((k, v[-1]) for k, v in urlparse.parse_qs(parts.query).items())
+        length = int(self.headers.get('Content-Length') or 0)
+        content = self.rfile.read(length) if length else b''
+
+        if self.inject_fault(parts.path):
+            return
+        try:
+            if self.command == 'GET' and query.get('watch') in ('true', '1'):
+                return self.stream(api.watch(parts.path, query))
+            body = json.loads(content.decode('utf-8')) if content else None
+            code, result = api.handle(self.command, parts.path, query, body, self.headers.get('Content-Type'))
+        except ApiError as ex:
+            code, result = ex.code, ex.body
+        except ValueError as ex:
+            code, result = 400, status(400, 'BadRequest', str(ex))
+        self.send_body(code, result)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = process
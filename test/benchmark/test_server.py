@@ -0,0 +1,150 @@
+import copy
+import itertools
+import unittest
+
+from kubeshift import KubernetesClient, OpenshiftClient
+from kubeshift.cassette import Cassette
+from kubeshift.exceptions import KubeConnectionError, KubeRequestError
+
+from server import FakeApiServer, Faults, json_patch, label_matcher, make_pod
+import run
+
+DEPLOYMENT = {
+    'apiVersion': 'extensions/v1beta1', 'kind': 'Deployment',
+    'metadata': {'name': 'web', 'labels': {'app': 'web'}},
+    'spec': {'replicas': 1, 'template': {'spec': {'containers': [{'name': 'web', 'image': 'web:1'}]}}},
+}
+
+
+class TestFakeApiServer(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FakeApiServer().start()
+        self.addCleanup(self.server.stop)
+        self.client = KubernetesClient(self.server.config())
+
+    def test_crud(self):
+        self.client.create(DEPLOYMENT, namespace='dev')
+        self.assertRaises(KubeRequestError, self.client.create, DEPLOYMENT, namespace='dev')
+
+        changed = copy.deepcopy(DEPLOYMENT)
+        changed['spec']['replicas'] = 3
+        self.client.replace(changed, namespace='dev')
+        self.client.modify({'apiVersion': 'extensions/v1beta1', 'kind': 'Deployment',
+                            'metadata': {'name': 'web', 'labels': {'tier': 'front'}}}, namespace='dev')
+        self.client.scale(DEPLOYMENT, namespace='dev', replicas=5)
+
+        obj = self.client.deployments('dev').by_name('web')
+        self.assertEqual(obj['spec']['replicas'], 5)
+        self.assertEqual(obj['metadata']['labels'], {'app': 'web', 'tier': 'front'})
+        self.assertEqual(self.client.deployments('other').all()['items'], [])
+
+        self.client.delete(DEPLOYMENT, namespace='dev')
+        self.assertRaises(KubeRequestError, self.client.deployments('dev').by_name, 'web')
+
+    def test_apply_removed_fields(self):
+        self.client.apply(DEPLOYMENT, namespace='dev')
+        changed = copy.deepcopy(DEPLOYMENT)
+        del changed['metadata']['labels']
+        self.client.apply(changed, namespace='dev')
+
+        obj = self.client.deployments('dev').by_name('web')
+        self.assertNotIn('labels', obj['metadata'])
+        self.assertEqual(self.client.apply_stats, {'created': 1, 'patched': 1, 'skipped': 0})
+
+    def test_selectors(self):
+        self.server.populate('/api/v1/namespaces/dev/pods', 20)
+        pods = self.client.pods('dev').by_selector([{'key': 'shard', 'value': ['1', '2']}])
+        self.assertEqual(sorted(p['metadata']['name'] for p in pods), ['pod-1', 'pod-11', 'pod-12', 'pod-2'])
+        events = self.client.pods('dev').watch(fields=[{'key': 'metadata.name', 'value': 'pod-3'}], timeout=1)
+        self.assertEqual([e['object']['metadata']['name'] for e in events], ['pod-3'])
+
+        match = label_matcher('app in (bench,web),shard!=1,!legacy')
+        self.assertTrue(match({'app': 'web', 'shard': '2'}))
+        self.assertFalse(match({'app': 'web', 'shard': '1'}))
+        self.assertFalse(match({'app': 'web', 'legacy': 'yes'}))
+
+    def test_json_patch(self):
+        obj = {'metadata': {'labels': {'a': '1'}}, 'items': [1, 2]}
+        patched = json_patch(obj, [{'op': 'replace', 'path': '/metadata/labels/a', 'value': '2'},
+                                   {'op': 'add', 'path': '/items/-', 'value': 3},
+                                   {'op': 'remove', 'path': '/items/0'}])
+        self.assertEqual(patched, {'metadata': {'labels': {'a': '2'}}, 'items': [2, 3]})
+
+    def test_watch(self):
+        self.server.populate('/api/v1/namespaces/dev/pods', 2)
+        version = self.client.pods('dev').all()['metadata']['resourceVersion']
+        self.server.handle('POST', '/api/v1/namespaces/dev/pods', body=make_pod(7))
+        self.server.handle('DELETE', '/api/v1/namespaces/dev/pods/pod-0')
+
+        events = self.client.pods('dev').watch(resource_version=version)
+        self.assertEqual([(e['type'], e['object']['metadata']['name']) for e in itertools.islice(events, 2)],
+                         [('ADDED', 'pod-7'), ('DELETED', 'pod-0')])
+        events.close()
+
+        events = list(self.client.pods('dev').watch(timeout=1))
+        self.assertEqual(sorted(e['object']['metadata']['name'] for e in events), ['pod-1', 'pod-7'])
+
+    def test_expired_watch(self):
+        server = FakeApiServer(history=5).start()
+        self.addCleanup(server.stop)
+        server.populate('/api/v1/namespaces/dev/pods', 10)
+
+        events = list(KubernetesClient(server.config()).pods('dev').watch(resource_version='1', timeout=1))
+        self.assertEqual(events[0]['type'], 'ERROR')
+        self.assertEqual(events[0]['object']['code'], 410)
+
+    def test_faults(self):
+        self.server.faults = Faults(throttle=1)
+        with self.assertRaises(KubeRequestError) as ctx:
+            self.client.pods('dev').all()
+        self.assertEqual(ctx.exception.status_code, 429)
+
+        self.server.faults = Faults(drops=1)
+        self.assertRaises(KubeConnectionError, self.client.pods('dev').all)
+
+        # the discovery is spared by default
+        KubernetesClient(self.server.config())
+        self.assertEqual(self.server.stats['throttle'], 1)
+        self.assertEqual(self.server.stats['drop'], 1)
+
+    def test_openshift_template(self):
+        client = OpenshiftClient(self.server.config())
+        client.create({
+            'apiVersion': 'v1', 'kind': 'Template', 'metadata': {'name': 't'},
+            'parameters': [{'name': 'NAME', 'value': 'web'}],
+            'objects': [{'apiVersion': 'v1', 'kind': 'Service', 'metadata': {'name': '${NAME}'}}],
+        }, namespace='dev')
+
+        self.assertEqual([s['metadata']['name'] for s in self.server.objects('/api/v1/namespaces/dev/services')], ['web'])
+
+    def test_record_replay(self):
+        cassette = Cassette()
+        client = KubernetesClient(self.server.config(), adapter=cassette.recorder())
+        client.create(DEPLOYMENT, namespace='dev')
+        self.assertEqual(len(client.deployments('dev').all()['items']), 1)
+
+        results = run.replay(cassette, repeat=1)
+        self.assertEqual(results['replay']['failures'], 0)
+        self.assertEqual(results['replay']['count'], len(cassette.interactions))
+
+    def test_record_elapsed(self):
+        self.server.faults = Faults(latency=0.01)
+        cassette = Cassette()
+        client = KubernetesClient(self.server.config(), adapter=cassette.recorder())
+        client.deployments('dev').all()
+
+        # the discovery is not slowed down by the faults
+        interaction = cassette.interactions[-1]
+        self.assertEqual(interaction.path, '/apis/extensions/v1beta1/namespaces/dev/deployments')
+        self.assertGreaterEqual(interaction.elapsed, 0.01)
+
+    def test_subresources(self):
+        self.server.populate('/api/v1/namespaces/dev/pods', 2)
+        pod = self.client.pods('dev').by_name('pod-0')
+        pod['status']['phase'] = 'Succeeded'
+        self.client.update_status(pod, namespace='dev')
+        self.assertEqual(self.client.pods('dev').by_name('pod-0')['status']['phase'], 'Succeeded')
+
+        self.client.evict(pod, namespace='dev')
+        self.assertEqual([p['metadata']['name'] for p in self.client.pods('dev').items()], ['pod-1'])
@@ -103,3 +103,10 @@ def make_response(code, content):
     if content is not None:
         r.raw = six.BytesIO(six.b(json.dumps(content)))
     return r
+
+
+def make_stream_response(code, lines):
+    r = requests.Response()
+    r.status_code = code
+    r.raw = six.BytesIO(six.b('\n'.join(json.dumps(l) if isinstance(l, dict) else l for l in lines)))
+    return r
@@ -0,0 +1,199 @@
+import asyncio
+import copy
+import json
+import unittest
+
+try:
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+    from kubeshift import aio
+except ImportError:  # pragma: no cover
+    aio = None
+
+from kubeshift.constants import LAST_APPLIED_CONFIG_ANNOTATION
+from kubeshift.exceptions import KubeBatchError, KubeRequestError
+
+import helper
+
+
+class FakeServer(object):
+    """Serve the discovery fixtures and canned responses over HTTP."""
+
+    def __init__(self):
+        self.requests = []
+        self.responses = {}
+
+    def add(self, method, path_qs, content=None, status=200, lines=None):
+        self.responses[(method, path_qs)] = (status, content, lines)
+
+    async def handle(self, request):
+        body = await request.text()
+        self.requests.append((request.method, request.raw_path, json.loads(body) if body else None))
+
+        if request.method == 'GET' and request.path in helper.API_MAP:
+            return web.json_response(helper.load_resource(request.path))
+        if request.path in ('/api/', '/version'):
+            return web.json_response({'major': '1', 'minor': '6'} if request.path == '/version' else {})
+
+        status, content, lines = self.responses.get((request.method, request.raw_path), (404, None, None))
+        if lines is not None:
+            resp = web.StreamResponse(status=status)
+            await resp.prepare(request)
+            for line in lines:
+                await resp.write((json.dumps(line) if isinstance(line, dict) else line).encode('utf-8') + b'\n')
+            await resp.write_eof()
+            return resp
+        return web.json_response(content, status=status)
+
+
+@unittest.skipIf(aio is None, 'aiohttp is not available')
+class TestAsyncClient(unittest.TestCase):
+
+    def setUp(self):
+        self.fake = FakeServer()
+
+    def run_client(self, coro_func, cls=None):
+        async def main():
+            app = web.Application()
+            app.router.add_route('*', '/{path:.*}', self.fake.handle)
+            server = TestServer(app)
+            await server.start_server()
+            config = copy.deepcopy(helper.TEST_CONFIG)
+            config['clusters'][0]['cluster']['server'] = str(server.make_url('')).rstrip('/')
+            try:
+                async with (cls or aio.AsyncKubernetesClient)(config) as client:
+                    return await coro_func(client)
+            finally:
+                await server.close()
+        return asyncio.run(main())
+
+    def test_discovery(self):
+        async def check(client):
+            return client._generate_url('v1', 'Pod', 'default'), client.has_subresource('extensions/v1beta1', 'Deployment', 'scale')
+
+        url, scale = self.run_client(check)
+        self.assertTrue(url.endswith('/api/v1/namespaces/default/pods'))
+        self.assertTrue(scale)
+
+    def test_discover_again(self):
+        async def check(client):
+            resources = client.api_resources
+            await client.discover()
+            return resources, client.api_resources, client.discovery_duration
+
+        before, after, duration = self.run_client(check)
+        self.assertIsNot(after, before)
+        self.assertEqual(after, before)
+        self.assertGreater(duration, 0)
+
+    def test_query(self):
+        self.fake.add('GET', '/api/v1/namespaces/default/pods', {'items': [{'metadata': {'name': 'a'}}]})
+        self.fake.add('GET', '/api/v1/namespaces/default/pods?labelSelector=app+in+%28web%29', {'items': []})
+
+        async def check(client):
+            return (await client.pods().metadata(),
+                    await client.pods().by_selector([{'key': 'app', 'value': 'web'}]),
+                    await client.pods().by_name(None))
+
+        self.assertEqual(self.run_client(check), ([{'name': 'a'}], [], {}))
+
+    def test_concurrent_writes(self):
+        for idx in range(50):
+            self.fake.add('POST', '/api/v1/namespaces/default/pods', {'kind': 'Pod'}, status=201)
+
+        async def check(client):
+            objs = [{'apiVersion': 'v1', 'kind': 'Pod', 'metadata': {'name': 'p%d' % i}} for i in range(50)]
+            return await asyncio.gather(*[client.create(o) for o in objs])
+
+        self.assertEqual(len(self.run_client(check)), 50)
+        created = sorted(r[2]['metadata']['name'] for r in self.fake.requests if r[0] == 'POST')
+        self.assertEqual(created, sorted('p%d' % i for i in range(50)))
+
+    def test_modify_scale_delete(self):
+        obj = {'apiVersion': 'extensions/v1beta1', 'kind': 'Deployment', 'metadata': {'name': 'web'},
+               'spec': {'replicas': 1}}
+        base = '/apis/extensions/v1beta1/namespaces/default/deployments/web'
+        self.fake.add('PATCH', base, obj)
+        self.fake.add('PATCH', base + '/scale', {'kind': 'Scale'})
+        self.fake.add('DELETE', base, {})
+
+        async def check(client):
+            changed = copy.deepcopy(obj)
+            changed['spec']['replicas'] = 2
+            await client.modify(changed, previous=obj, patch_type='merge')
+            unchanged = await client.modify(obj, previous=obj)
+            await client.scale(obj, replicas=3)
+            await client.delete(obj)
+            return unchanged
+
+        self.assertIsNone(self.run_client(check))
+        writes = [r for r in self.fake.requests if r[0] in ('PATCH', 'DELETE')]
+        self.assertEqual(writes, [
+            ('PATCH', base, {'spec': {'replicas': 2}}),
+            ('PATCH', base + '/scale', {'spec': {'replicas': 3}}),
+            ('DELETE', base, {'kind': 'DeleteOptions', 'apiVersion': 'v1', 'propagationPolicy': 'Background'}),
+        ])
+
+    def test_apply(self):
+        pods = '/api/v1/namespaces/default/pods'
+        self.fake.add('POST', pods, {}, status=201)
+        self.fake.add('DELETE', pods + '/web', {})
+        obj = {'apiVersion': 'v1', 'kind': 'Pod', 'metadata': {'name': 'web'}}
+
+        async def check(client):
+            await client.apply(obj)
+            await client.apply(obj)
+            # the deleted object is created again
+            await client.delete(obj)
+            await client.apply(obj)
+            return client.apply_stats
+
+        self.assertEqual(self.run_client(check), {'created': 2, 'patched': 0, 'skipped': 1})
+        requests = [r for r in self.fake.requests if r[1].startswith(pods)]
+        self.assertEqual([r[:2] for r in requests], [('GET', pods + '/web'), ('POST', pods), ('DELETE', pods + '/web'),
+                                                      ('GET', pods + '/web'), ('POST', pods)])
+        self.assertIn(LAST_APPLIED_CONFIG_ANNOTATION, requests[1][2]['metadata']['annotations'])
+
+    def test_request_error(self):
+        async def check(client):
+            with self.assertRaises(KubeRequestError) as ctx:
+                await client.pods().by_name('missing')
+            return ctx.exception.status_code
+
+        self.assertEqual(self.run_client(check), 404)
+
+    def test_watch_and_logs(self):
+        self.fake.add('GET', '/api/v1/namespaces/default/pods?watch=true&resourceVersion=5',
+                      lines=[{'type': 'ADDED', 'object': {'metadata': {'name': 'a'}}}])
+        self.fake.add('GET', '/api/v1/namespaces/default/pods/a/log?follow=true', lines=['x' * 200000, 'y'])
+
+        async def check(client):
+            events = [e async for e in client.pods().watch(resource_version='5')]
+            lines = [line async for line in client.pods().logs('a', follow=True)]
+            return events, lines
+
+        events, lines = self.run_client(check)
+        self.assertEqual(events, [{'type': 'ADDED', 'object': {'metadata': {'name': 'a'}}}])
+        self.assertEqual(lines, ['x' * 200000, 'y'])
+
+    def test_openshift_template(self):
+        self.fake.add('POST', '/api/v1/namespaces/default/services', {}, status=201)
+        self.fake.add('POST', '/oapi/v1/namespaces/default/deploymentconfigs', {}, status=500)
+        template = {
+            'apiVersion': 'v1', 'kind': 'Template', 'metadata': {'name': 't'},
+            'parameters': [{'name': 'NAME', 'value': 'web'}],
+            'objects': [
+                {'apiVersion': 'v1', 'kind': 'DeploymentConfig', 'metadata': {'name': '${NAME}'}},
+                {'apiVersion': 'v1', 'kind': 'Service', 'metadata': {'name': '${NAME}'}},
+            ]
+        }
+
+        async def check(client):
+            with self.assertRaises(KubeBatchError) as ctx:
+                await client.create(template)
+            return ctx.exception.errors
+
+        errors = self.run_client(check, aio.AsyncOpenshiftClient)
+        self.assertEqual([e[:2] for e in errors], [('DeploymentConfig', 'web')])
+        posts = [r[1] for r in self.fake.requests if r[0] == 'POST']
+        self.assertEqual(posts[0], '/api/v1/namespaces/default/services')
@@ -17,8 +17,10 @@ class FakeKubeBase(KubeBase):
         self.kubeconfig = Config(helper.TEST_CONFIG)
         self.base_url = self.kubeconfig.cluster.get('server')
 
+        self._init_process()
         self.session = self._connection()
         self.api_resources = {}
+        self.api_subresources = {}
 
     def request(self, method, url, data=None):
         return helper.load_resource(url)
@@ -91,6 +93,43 @@ class TestBaseResources(unittest.TestCase):
         url = self.client._generate_url('v1', 'Pod', 'sample', None, [('labelSelector', 'name=test')])
         self.assertEqual(url, 'http://localhost:8080/api/v1/namespaces/sample/pods?labelSelector=name%3Dtest')
 
+    def test_subresources(self):
+        self.client._load_resources('api/v1/', 'v1')
+        self.client._load_group_resources('apis/')
+        self.assertTrue(self.client.has_subresource('v1', 'ReplicationController', 'scale'))
+        self.assertTrue(self.client.has_subresource('extensions/v1beta1', 'Deployment', 'scale'))
+        self.assertFalse(self.client.has_subresource('v1', 'Pod', 'scale'))
+        self.assertNotIn('Scale', self.client.api_resources['v1'])
+
+    def test_subresources_index(self):
+        self.client._load_resources('api/v1/', 'v1')
+        self.client._load_group_resources('apis/')
+        self.assertEqual(self.client.subresources('v1', 'Pod'),
+                         ['attach', 'binding', 'eviction', 'exec', 'log', 'portforward', 'proxy', 'status'])
+        self.assertEqual(self.client.subresources('extensions/v1beta1', 'Deployment'), ['rollback', 'scale', 'status'])
+        self.assertEqual(self.client.subresources('v1', 'Secret'), [])
+        # kinds with the same subresources share them
+        self.assertIs(self.client.api_subresources['v1']['Node'], self.client.api_subresources['v1']['Service'])
+        url = self.client._generate_url('v1', 'Pod', 'default', 'web', subresource='log')
+        self.assertEqual(url, 'http://localhost:8080/api/v1/namespaces/default/pods/web/log')
+
+    def test_resources_prefer_kind_name(self):
+        self.client._load_resources('oapi/v1/', 'v1')
+        url = self.client._generate_url('v1', 'DeploymentConfig', 'default')
+        self.assertEqual(url, 'http://localhost:8080/oapi/v1/namespaces/default/deploymentconfigs')
+        self.assertTrue(self.client.has_subresource('v1', 'DeploymentConfig', 'scale'))
+
+    def test_generate_url_subresource(self):
+        self.client._load_group_resources('apis/')
+        url = self.client._generate_url('extensions/v1beta1', 'Deployment', 'default', 'web', subresource='scale')
+        self.assertEqual(url, 'http://localhost:8080/apis/extensions/v1beta1/namespaces/default/deployments/web/scale')
+
+    def test_generate_url_subresource_fail(self):
+        self.client._load_group_resources('apis/')
+        self.assertRaises(KubeShiftError, self.client._generate_url, 'batch/v1', 'Job', 'default', 'test', None, 'scale')
+        self.assertRaises(KubeShiftError, self.client._generate_url, 'extensions/v1beta1', 'Deployment', 'default',
+                          None, None, 'scale')
+
 
 class TestClientBase(unittest.TestCase):
 
@@ -0,0 +1,109 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from mock import patch
+
+from kubeshift.base import KubeBase
+from kubeshift.cassette import Cassette, Interaction
+from kubeshift.config import Config
+from kubeshift.exceptions import KubeConnectionError, KubeRequestError, KubeShiftError
+
+import helper
+
+POD = {'apiVersion': 'v1', 'kind': 'Pod', 'metadata': {'name': 'web'}}
+PODS = '/api/v1/namespaces/default/pods'
+
+
+def _interaction(method, path, status, content, reason='OK'):
+    interaction = Interaction(method, path, None, status, reason, {'Content-Type': 'application/json'}, 0.01)
+    interaction.chunks = [content if isinstance(content, bytes) else json.dumps(content).encode('utf-8')]
+    return interaction
+
+
+class TestCassette(unittest.TestCase):
+
+    def setUp(self):
+        self.config = Config(helper.TEST_CONFIG)
+
+        patched_test_connection = patch.object(KubeBase, '_test_connection', side_effect=helper.test_connection)
+        self.addCleanup(patched_test_connection.stop)
+        self.mock_tc = patched_test_connection.start()
+
+        patched_get_groups = patch.object(KubeBase, '_get_groups', side_effect=helper.get_groups)
+        self.addCleanup(patched_get_groups.stop)
+        self.mock_groups = patched_get_groups.start()
+
+        patched_get_resources = patch.object(KubeBase, '_get_resources', side_effect=helper.get_resources)
+        self.addCleanup(patched_get_resources.stop)
+        self.mock_resources = patched_get_resources.start()
+
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+
+        # the traffic of a server, answered by a cassette
+        self.server = Cassette()
+        self.server.interactions = [
+            _interaction('POST', PODS, 201, POD, 'Created'),
+            _interaction('GET', PODS, 200, {'items': [POD]}),
+            _interaction('GET', PODS, 200, {'items': []}),
+            _interaction('GET', PODS + '/missing', 404, {'message': 'not found'}, 'Not Found'),
+            _interaction('GET', PODS + '?watch=true', 200, b'{"type": "ADDED", "object": {}}\n{"type": "DELETED", "object": {}}'),
+        ]
+
+    def test_replay(self):
+        client = KubeBase(self.config, adapter=self.server.player())
+
+        self.assertEqual(client.create(POD), POD)
+        self.assertEqual(client.pods().all(), {'items': [POD]})
+        self.assertEqual(client.pods().all(), {'items': []})
+        # the responses start over once all of them were replayed
+        self.assertEqual(client.pods().all(), {'items': [POD]})
+        self.assertRaises(KubeRequestError, client.pods().by_name, 'missing')
+        self.assertEqual([e['type'] for e in client.pods().watch()], ['ADDED', 'DELETED'])
+
+        self.server.rewind()
+        self.assertEqual(client.pods().all(), {'items': [POD]})
+
+    def test_replay_unknown_request(self):
+        client = KubeBase(self.config, adapter=self.server.player())
+        self.assertRaises(KubeConnectionError, client.delete, POD)
+
+    def test_replay_timing(self):
+        client = KubeBase(self.config, adapter=self.server.player(timing=2))
+        with patch('kubeshift.cassette.time.sleep') as mock_sleep:
+            client.pods().all()
+        mock_sleep.assert_called_once_with(0.02)
+
+    def test_record_save_load(self):
+        path = os.path.join(self.tmpdir, 'session.jsonl.gz')
+        cassette = Cassette(path)
+        client = KubeBase(self.config, adapter=cassette.recorder(self.server.player()))
+        client.create(POD)
+        client.pods().all()
+        self.assertRaises(KubeRequestError, client.pods().by_name, 'missing')
+        list(client.pods().watch())
+        cassette.save()
+
+        loaded = Cassette.load(path)
+        self.assertEqual([(i.method, i.path, i.status) for i in loaded.interactions],
+                         [('POST', PODS, 201), ('GET', PODS, 200), ('GET', PODS + '/missing', 404),
+                          ('GET', PODS + '?watch=true', 200)])
+        self.assertEqual(json.loads(loaded.interactions[0].body.decode('utf-8')), POD)
+        self.assertEqual(loaded.interactions[0].headers, {'Content-Type': 'application/json'})
+        self.assertEqual(loaded.interactions[3].content, self.server.interactions[4].content)
+
+        client = KubeBase(self.config, adapter=loaded.player())
+        self.assertEqual(client.create(POD), POD)
+        self.assertEqual(client.pods().all(), {'items': [POD]})
+
+    def test_binary_content(self):
+        interaction = _interaction('GET', '/logs', 200, b'\xff\xfe')
+        data = interaction.to_dict()
+        self.assertNotIn('c', data)
+        self.assertEqual(Interaction.from_dict(data).content, b'\xff\xfe')
+
+    def test_save_without_path(self):
+        self.assertRaises(KubeShiftError, Cassette().save)
@@ -0,0 +1,43 @@
+import unittest
+
+from kubeshift import conditions
+from kubeshift.exceptions import KubeShiftError
+
+
+class TestConditions(unittest.TestCase):
+
+    def test_get(self):
+        self.assertIs(conditions.get('Ready'), conditions.ready)
+        self.assertIs(conditions.get(len), len)
+        with self.assertRaises(KubeShiftError):
+            conditions.get('Fake')
+        with self.assertRaises(KubeShiftError):
+            conditions.get(None)
+
+    def test_phase(self):
+        check = conditions.phase('Running')
+        self.assertTrue(check({'status': {'phase': 'Running'}}))
+        self.assertFalse(check({'status': {'phase': 'Pending'}}))
+        self.assertFalse(check(None))
+
+    def test_ready(self):
+        self.assertTrue(conditions.ready({'status': {'conditions': [{'type': 'Ready', 'status': 'True'}]}}))
+        self.assertFalse(conditions.ready({'status': {'conditions': [{'type': 'Ready', 'status': 'False'}]}}))
+        self.assertFalse(conditions.ready({'status': {}}))
+
+    def test_observed(self):
+        self.assertTrue(conditions.observed({'metadata': {}}))
+        self.assertTrue(conditions.observed({'metadata': {'generation': 2}, 'status': {'observedGeneration': 2}}))
+        self.assertFalse(conditions.observed({'metadata': {'generation': 2}, 'status': {'observedGeneration': 1}}))
+        self.assertFalse(conditions.observed({'metadata': {'generation': 2}, 'status': {}}))
+
+    def test_available(self):
+        deployment = {'metadata': {'generation': 1}, 'spec': {'replicas': 2},
+                      'status': {'observedGeneration': 1, 'updatedReplicas': 2, 'availableReplicas': 1}}
+        self.assertFalse(conditions.available(deployment))
+        deployment['status']['availableReplicas'] = 2
+        self.assertTrue(conditions.available(deployment))
+
+    def test_deleted(self):
+        self.assertTrue(conditions.deleted(None))
+        self.assertFalse(conditions.deleted({}))
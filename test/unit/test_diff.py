@@ -0,0 +1,84 @@
+import unittest
+
+from kubeshift import diff
+
+
+DEPLOYMENT = {
+    'apiVersion': 'extensions/v1beta1',
+    'kind': 'Deployment',
+    'metadata': {'name': 'web', 'labels': {'app': 'web'}},
+    'spec': {
+        'replicas': 2,
+        'template': {
+            'spec': {
+                'containers': [
+                    {'name': 'web', 'image': 'nginx:1.10'},
+                    {'name': 'sidecar', 'image': 'busybox'}
+                ]
+            }
+        }
+    }
+}
+
+
+class TestJsonPatch(unittest.TestCase):
+
+    def test_no_change(self):
+        self.assertEqual(diff.json_patch(DEPLOYMENT, DEPLOYMENT), [])
+
+    def test_replace_leaf(self):
+        desired = {'spec': {'replicas': 3}}
+        self.assertEqual(diff.json_patch({'spec': {'replicas': 2}}, desired),
+                         [{'op': 'replace', 'path': '/spec/replicas', 'value': 3}])
+
+    def test_add_remove_keys(self):
+        ops = diff.json_patch({'metadata': {'labels': {'a': '1'}}},
+                              {'metadata': {'labels': {'b/c': '2'}}})
+        self.assertEqual(ops, [
+            {'op': 'remove', 'path': '/metadata/labels/a'},
+            {'op': 'add', 'path': '/metadata/labels/b~1c', 'value': '2'},
+        ])
+
+    def test_list_element(self):
+        desired = {'containers': [{'name': 'web', 'image': 'nginx:1.11'}]}
+        ops = diff.json_patch({'containers': [{'name': 'web', 'image': 'nginx:1.10'}]}, desired)
+        self.assertEqual(ops, [{'op': 'replace', 'path': '/containers/0/image', 'value': 'nginx:1.11'}])
+
+    def test_list_append_and_truncate(self):
+        self.assertEqual(diff.json_patch({'a': [1]}, {'a': [1, 2]}),
+                         [{'op': 'add', 'path': '/a/-', 'value': 2}])
+        self.assertEqual(diff.json_patch({'a': [1, 2, 3]}, {'a': [1]}),
+                         [{'op': 'remove', 'path': '/a/2'}, {'op': 'remove', 'path': '/a/1'}])
+
+    def test_type_change(self):
+        self.assertEqual(diff.json_patch({'a': 1}, {'a': True}),
+                         [{'op': 'replace', 'path': '/a', 'value': True}])
+
+
+class TestMergePatch(unittest.TestCase):
+
+    def test_no_change(self):
+        self.assertEqual(diff.merge_patch(DEPLOYMENT, DEPLOYMENT), {})
+
+    def test_nested_change(self):
+        self.assertEqual(diff.merge_patch({'spec': {'replicas': 2, 'paused': False}},
+                                          {'spec': {'replicas': 3, 'paused': False}}),
+                         {'spec': {'replicas': 3}})
+
+    def test_removed_key(self):
+        self.assertEqual(diff.merge_patch({'a': 1, 'b': 2}, {'a': 1}), {'b': None})
+
+    def test_list_replaced(self):
+        self.assertEqual(diff.merge_patch({'a': [1, 2]}, {'a': [1]}), {'a': [1]})
+
+
+class TestServerFields(unittest.TestCase):
+
+    def test_without_server_fields(self):
+        live = {'kind': 'Pod', 'status': {'phase': 'Running'},
+                'metadata': {'name': 'web', 'uid': 'u', 'resourceVersion': '7', 'generation': 2,
+                             'creationTimestamp': 't', 'selfLink': '/l', 'managedFields': []}}
+        self.assertEqual(diff.without_server_fields(live), {'kind': 'Pod', 'metadata': {'name': 'web'}})
+        # the object itself is left untouched
+        self.assertEqual(live['metadata']['uid'], 'u')
+        self.assertIn('status', live)
@@ -0,0 +1,29 @@
+import subprocess
+import sys
+import unittest
+
+import kubeshift
+
+
+def _imported(statement):
+    """Import in a new interpreter, the heavy modules it loaded."""
+    script = ('import sys\n%s\n'
+              'print(" ".join(m for m in ("requests", "yaml", "kubeshift.base") if m in sys.modules))') % statement
+    return subprocess.check_output([sys.executable, '-c', script]).decode('ascii').split()
+
+
+class TestImports(unittest.TestCase):
+
+    @unittest.skipIf(sys.version_info < (3, 7), 'clients are imported eagerly before python 3.7')
+    def test_lazy_clients(self):
+        self.assertEqual(_imported('import kubeshift.config, kubeshift.validator'), [])
+        self.assertEqual(_imported('from kubeshift import Config'), [])
+        self.assertEqual(_imported('from kubeshift import KubernetesClient'), ['requests', 'kubeshift.base'])
+
+    def test_attributes(self):
+        from kubeshift.kubernetes import KubernetesClient
+        from kubeshift.openshift import OpenshiftClient
+        self.assertIs(kubeshift.KubernetesClient, KubernetesClient)
+        self.assertIs(kubeshift.OpenshiftClient, OpenshiftClient)
+        self.assertIn('OpenshiftClient', dir(kubeshift))
+        self.assertRaises(AttributeError, getattr, kubeshift, 'Missing')
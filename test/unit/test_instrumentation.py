@@ -0,0 +1,167 @@
+import json
+import pickle
+import unittest
+
+from mock import patch
+import requests
+
+from kubeshift.base import KubeBase
+from kubeshift.config import Config
+from kubeshift.exceptions import KubeConnectionError, KubeRequestError, KubeShiftError
+from kubeshift import instrumentation
+
+import helper
+
+
+class TestDescribeUrl(unittest.TestCase):
+
+    def setUp(self):
+        resources = {
+            'v1': {
+                'Pod': 'http://localhost:8080/api/v1/namespaces/{namespace}/pods',
+                'Namespace': 'http://localhost:8080/api/v1/namespaces',
+                'Node': 'http://localhost:8080/api/v1/nodes',
+                'DeploymentConfig': 'http://localhost:8080/oapi/v1/namespaces/{namespace}/deploymentconfigs',
+            },
+            'extensions/v1beta1': {
+                'Deployment': 'http://localhost:8080/apis/extensions/v1beta1/namespaces/{namespace}/deployments',
+            },
+        }
+        self.index = instrumentation.resource_index(resources)
+
+    def describe(self, path):
+        return instrumentation.describe_url('http://localhost:8080' + path, self.index)
+
+    def test_resource_index(self):
+        self.assertEqual(self.index[('/api/v1', 'pods')], 'Pod')
+        self.assertEqual(self.index[('/oapi/v1', 'deploymentconfigs')], 'DeploymentConfig')
+        self.assertEqual(self.index[('/apis/extensions/v1beta1', 'deployments')], 'Deployment')
+
+    def test_namespaced(self):
+        self.assertEqual(self.describe('/api/v1/namespaces/default/pods?labelSelector=a%3Db'),
+                         ('/api/v1/namespaces/{namespace}/pods', 'Pod'))
+        self.assertEqual(self.describe('/api/v1/namespaces/default/pods/web/log'),
+                         ('/api/v1/namespaces/{namespace}/pods/{name}/log', 'Pod'))
+        self.assertEqual(self.describe('/apis/extensions/v1beta1/namespaces/dev/deployments/web/scale'),
+                         ('/apis/extensions/v1beta1/namespaces/{namespace}/deployments/{name}/scale', 'Deployment'))
+        self.assertEqual(self.describe('/oapi/v1/namespaces/dev/deploymentconfigs'),
+                         ('/oapi/v1/namespaces/{namespace}/deploymentconfigs', 'DeploymentConfig'))
+
+    def test_cluster_scoped(self):
+        self.assertEqual(self.describe('/api/v1/nodes/node-1'), ('/api/v1/nodes/{name}', 'Node'))
+        self.assertEqual(self.describe('/api/v1/namespaces/dev'), ('/api/v1/namespaces/{name}', 'Namespace'))
+        self.assertEqual(self.describe('/api/v1/namespaces/dev/finalize'),
+                         ('/api/v1/namespaces/{name}/finalize', 'Namespace'))
+
+    def test_other_apis(self):
+        self.assertEqual(self.describe('/api/'), ('/api/', None))
+        self.assertEqual(self.describe('/version'), ('/version', None))
+        self.assertEqual(self.describe('/apis/batch/v1'), ('/apis/batch/v1', None))
+
+
+class TestLatencyCollector(unittest.TestCase):
+
+    def event(self, method, kind, duration, status=200):
+        event = instrumentation.RequestEvent(method, 'http://localhost', '/', kind, 10)
+        event.finish(status, 100)
+        event.duration = duration
+        return event
+
+    def test_histogram(self):
+        hist = instrumentation.Histogram((0.1, 1))
+        for value in (0.05, 0.1, 0.5, 3):
+            hist.observe(value)
+        self.assertEqual(hist.counts, [2, 1, 1])
+        self.assertEqual(hist.count, 4)
+        self.assertAlmostEqual(hist.mean, 0.9125)
+        self.assertEqual(hist.quantile(0.5), 0.1)
+        self.assertEqual(hist.quantile(0.75), 1)
+        self.assertEqual(hist.quantile(1), 3)
+
+    def test_record(self):
+        collector = instrumentation.LatencyCollector()
+        collector.record(self.event('get', 'Pod', 0.01))
+        collector.record(self.event('get', 'Pod', 0.02, 404))
+        collector.record(self.event('post', 'Service', 2))
+
+        self.assertEqual(collector.histograms[('GET', 'Pod')].count, 2)
+        self.assertEqual(collector.requests[('GET', 'Pod', 404)], 1)
+        self.assertEqual(collector.bytes_sent[('GET', 'Pod')], 20)
+        self.assertEqual(collector.bytes_received[('POST', 'Service')], 100)
+        self.assertEqual([s[:2] for s in collector.slowest()], [('POST', 'Service'), ('GET', 'Pod')])
+        self.assertEqual(len(collector.slowest(1)), 1)
+
+        clone = pickle.loads(pickle.dumps(collector))
+        self.assertEqual(clone.requests, collector.requests)
+
+        collector.reset()
+        self.assertEqual(collector.slowest(), [])
+
+
+class TestRequestHooks(unittest.TestCase):
+
+    def setUp(self):
+        self.config = Config(helper.TEST_CONFIG)
+
+        patched_test_connection = patch.object(KubeBase, '_test_connection', side_effect=helper.test_connection)
+        self.addCleanup(patched_test_connection.stop)
+        self.mock_tc = patched_test_connection.start()
+
+        patched_get_groups = patch.object(KubeBase, '_get_groups', side_effect=helper.get_groups)
+        self.addCleanup(patched_get_groups.stop)
+        self.mock_groups = patched_get_groups.start()
+
+        patched_get_resources = patch.object(KubeBase, '_get_resources', side_effect=helper.get_resources)
+        self.addCleanup(patched_get_resources.stop)
+        self.mock_resources = patched_get_resources.start()
+
+        self.client = KubeBase(self.config)
+
+    def test_hooks(self):
+        events = []
+        self.client.register_hook('before', lambda e: events.append(('before', e.status)))
+        self.client.register_hook('after', lambda e: events.append(('after', e.status)))
+        collector = instrumentation.LatencyCollector().attach(self.client)
+
+        def send(adapter, request, **kwargs):
+            res = helper.make_response(201, {'a': 1})
+            res.request = request
+            return res
+
+        obj = {'apiVersion': 'v1', 'kind': 'Pod', 'metadata': {'name': 'web'}}
+        with patch.object(requests.adapters.HTTPAdapter, 'send', autospec=True, side_effect=send):
+            self.client.create(obj)
+
+        self.assertEqual(events, [('before', None), ('after', 201)])
+        self.assertEqual(collector.requests, {('POST', 'Pod', 201): 1})
+        self.assertEqual(collector.bytes_received[('POST', 'Pod')], 8)
+        self.assertEqual(collector.bytes_sent[('POST', 'Pod')], len(json.dumps(obj)))
+
+    def test_error_hooks(self):
+        errors = []
+        self.client.register_hook('error', errors.append)
+        self.client.register_hook('after', lambda e: self.fail('after hook called on error'))
+
+        with patch.object(self.client.session, 'request', return_value=helper.make_response(404, None)):
+            self.assertRaises(KubeRequestError, self.client.pods().by_name, 'web')
+        with patch.object(self.client.session, 'request', side_effect=requests.exceptions.ConnectionError):
+            self.assertRaises(KubeConnectionError, self.client.pods().all)
+
+        self.assertEqual([(e.template, e.kind, e.status) for e in errors], [
+            ('/api/v1/namespaces/{namespace}/pods/{name}', 'Pod', 404),
+            ('/api/v1/namespaces/{namespace}/pods', 'Pod', None),
+        ])
+        self.assertIsInstance(errors[1].error, KubeConnectionError)
+        self.assertTrue(errors[0].duration >= 0)
+
+    def test_failing_hook(self):
+        hook = lambda e: 1 / 0  # noqa
+        self.client.register_hook('before', hook)
+        with patch.object(self.client.session, 'request', return_value=helper.make_response(200, {})):
+            self.assertEqual(self.client.pods().all(), {})
+
+        self.assertTrue(self.client.deregister_hook('before', hook))
+        self.assertFalse(self.client.deregister_hook('before', hook))
+
+    def test_unknown_hook(self):
+        self.assertRaises(KubeShiftError, self.client.register_hook, 'response', lambda e: None)
@@ -1,17 +1,29 @@
+import multiprocessing
 import os
+import pickle
+import threading
 import unittest
 
 from mock import patch
+import requests
 
+from kubeshift.base import _applied_hash
+from kubeshift.constants import LAST_APPLIED_ANNOTATION, LAST_APPLIED_CONFIG_ANNOTATION
 from kubeshift.kubernetes import KubernetesClient
 from kubeshift.config import Config
-from kubeshift.exceptions import KubeRequestError, KubeShiftError
+from kubeshift.exceptions import KubeBatchError, KubeRequestError, KubeShiftError, KubeTimeoutError
+from kubeshift.queries.dynamic import version_order
 
 import helper
 
 FIXTURE_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'fixtures')
 
 
+def _pod_url(args):
+    client, namespace = args
+    return client._generate_url('v1', 'Pod', namespace)
+
+
 class TestKubernetesClient(unittest.TestCase):
 
     def setUp(self):
@@ -164,3 +176,482 @@ class TestKubernetesClient(unittest.TestCase):
                 client.delete_by_file(os.path.join(FIXTURE_DIR, 'yaml', 'service-account.yaml'))
             except KubeRequestError:
                 self.fail('create raised KubeRequestError unexpectedly')
+
+    def test_apply_create(self):
+        client = KubernetesClient(self.config)
+        responses = [helper.make_response(404, None), helper.make_response(201, {})]
+        with patch.object(client.session, 'request', side_effect=responses) as mock_req:
+            client.apply({'apiVersion': 'v1', 'kind': 'Pod', 'metadata': {'name': 'test'}})
+            self.assertEqual(mock_req.call_args[0][0], 'post')
+        self.assertEqual(client.apply_stats, {'created': 1, 'patched': 0, 'skipped': 0})
+
+    def test_apply_patch(self):
+        client = KubernetesClient(self.config)
+        live = {'apiVersion': 'v1', 'kind': 'Pod', 'metadata': {'name': 'test'}}
+        responses = [helper.make_response(200, live), helper.make_response(200, {})]
+        with patch.object(client.session, 'request', side_effect=responses) as mock_req:
+            client.apply({'apiVersion': 'v1', 'kind': 'Pod', 'metadata': {'name': 'test', 'labels': {'a': 'b'}}})
+            self.assertEqual(mock_req.call_args[0][0], 'patch')
+        self.assertEqual(client.apply_stats, {'created': 0, 'patched': 1, 'skipped': 0})
+
+    def test_apply_three_way(self):
+        client = KubernetesClient(self.config)
+        applied = {'apiVersion': 'v1', 'kind': 'Pod', 'metadata': {'name': 'test', 'labels': {'a': 'b'}}}
+        desired = {'apiVersion': 'v1', 'kind': 'Pod', 'metadata': {'name': 'test'}}
+        responses = [helper.make_response(404, None), helper.make_response(201, {})]
+        with patch.object(client.session, 'request', side_effect=responses) as mock_req:
+            client.apply(applied)
+            live = mock_req.call_args[1]['json']
+        annotations = live['metadata']['annotations']
+        self.assertEqual(annotations[LAST_APPLIED_ANNOTATION], _applied_hash(applied))
+
+        live['metadata']['labels']['other'] = 'c'
+        responses = [helper.make_response(200, live), helper.make_response(200, {})]
+        with patch.object(client.session, 'request', side_effect=responses) as mock_req:
+            client.apply(desired)
+            # the label dropped from the manifest is removed, the others are kept
+            self.assertEqual(mock_req.call_args[1]['headers'], {'Content-Type': 'application/merge-patch+json'})
+            self.assertEqual(mock_req.call_args[1]['json'], {'metadata': {'labels': None, 'annotations': {
+                LAST_APPLIED_ANNOTATION: _applied_hash(desired),
+                LAST_APPLIED_CONFIG_ANNOTATION: '{"apiVersion":"v1","kind":"Pod","metadata":{"name":"test"}}'}}})
+        self.assertEqual(client.apply_stats, {'created': 1, 'patched': 1, 'skipped': 0})
+
+    def test_apply_custom_resource(self):
+        client = KubernetesClient(self.config)
+        live = {'apiVersion': 'v1', 'kind': 'Pod', 'metadata': {'name': 'test'}}
+        responses = [helper.make_response(200, live), helper.make_response(415, None), helper.make_response(200, {})]
+        with patch.object(client.session, 'request', side_effect=responses) as mock_req:
+            client.apply({'apiVersion': 'v1', 'kind': 'Pod', 'metadata': {'name': 'test', 'labels': {'a': 'b'}}})
+            self.assertEqual([c[1].get('headers') for c in mock_req.call_args_list[1:]],
+                             [{'Content-Type': 'application/strategic-merge-patch+json'},
+                              {'Content-Type': 'application/merge-patch+json'}])
+        self.assertEqual(client.apply_stats, {'created': 0, 'patched': 1, 'skipped': 0})
+
+    def test_apply_skip(self):
+        client = KubernetesClient(self.config)
+        obj = {'apiVersion': 'v1', 'kind': 'Pod', 'metadata': {'name': 'test'}}
+        responses = [helper.make_response(404, None), helper.make_response(201, {})]
+        with patch.object(client.session, 'request', side_effect=responses):
+            client.apply(obj)
+
+        with patch.object(client.session, 'request') as mock_req:
+            client.apply(obj)
+            self.assertFalse(mock_req.called)
+
+        with patch.object(client.session, 'request', return_value=helper.make_response(200, {
+                'apiVersion': 'v1', 'kind': 'Pod', 'metadata': {
+                    'name': 'test', 'annotations': {LAST_APPLIED_ANNOTATION: _applied_hash(obj)}}})) as mock_req:
+            client.apply(obj, refresh=True)
+            self.assertEqual(mock_req.call_count, 1)
+        self.assertEqual(client.apply_stats, {'created': 1, 'patched': 0, 'skipped': 2})
+
+    def test_apply_after_other_writes(self):
+        client = KubernetesClient(self.config)
+        obj = {'apiVersion': 'v1', 'kind': 'Pod', 'metadata': {'name': 'test', 'labels': {'app': 'web'}}}
+        created = [helper.make_response(404, None), helper.make_response(201, {})]
+        with patch.object(client.session, 'request', side_effect=created):
+            client.apply(obj)
+        with patch.object(client.session, 'request', return_value=helper.make_response(200, {})):
+            client.delete(obj)
+
+        # the deleted object is created again
+        with patch.object(client.session, 'request', side_effect=list(created)) as mock_req:
+            client.apply(obj)
+            self.assertEqual([c[0][0] for c in mock_req.call_args_list], ['get', 'post'])
+
+        with patch.object(client.session, 'request', return_value=helper.make_response(200, {})):
+            client.modify({'apiVersion': 'v1', 'kind': 'Pod', 'metadata': {'name': 'test', 'labels': {'app': 'db'}}})
+        with patch.object(client.session, 'request', return_value=helper.make_response(200, {})) as mock_req:
+            client.apply(obj)
+            self.assertTrue(mock_req.called)
+
+        with patch.object(client.session, 'request', return_value=helper.make_response(200, {})):
+            client.pods().delete([{'key': 'app', 'value': 'web'}])
+        with patch.object(client.session, 'request', return_value=helper.make_response(200, {})) as mock_req:
+            client.apply(obj)
+            self.assertTrue(mock_req.called)
+        self.assertEqual(client.apply_stats, {'created': 4, 'patched': 0, 'skipped': 0})
+
+    def test_apply_error(self):
+        client = KubernetesClient(self.config)
+        with patch.object(client.session, 'request', return_value=helper.make_response(500, None)):
+            with self.assertRaises(KubeRequestError):
+                client.apply({'apiVersion': 'v1', 'kind': 'Pod', 'metadata': {'name': 'test'}})
+
+    def test_modify_json_patch(self):
+        client = KubernetesClient(self.config)
+        previous = {'apiVersion': 'v1', 'kind': 'Pod', 'metadata': {'name': 'test', 'resourceVersion': '7'}}
+        desired = {'apiVersion': 'v1', 'kind': 'Pod', 'metadata': {'name': 'test', 'resourceVersion': '7',
+                                                                   'labels': {'a': 'b'}}}
+        with patch.object(client.session, 'request', return_value=helper.make_response(200, {})) as mock_req:
+            client.modify(desired, previous=previous)
+            self.assertEqual(mock_req.call_args[1]['json'], [
+                {'op': 'test', 'path': '/metadata/resourceVersion', 'value': '7'},
+                {'op': 'add', 'path': '/metadata/labels', 'value': {'a': 'b'}},
+            ])
+            self.assertEqual(mock_req.call_args[1]['headers'], {'Content-Type': 'application/json-patch+json'})
+
+    def test_modify_merge_patch(self):
+        client = KubernetesClient(self.config)
+        previous = {'apiVersion': 'v1', 'kind': 'Pod', 'metadata': {'name': 'test'}, 'spec': {'a': 1, 'b': 2}}
+        desired = {'apiVersion': 'v1', 'kind': 'Pod', 'metadata': {'name': 'test'}, 'spec': {'a': 1, 'b': 3}}
+        with patch.object(client.session, 'request', return_value=helper.make_response(200, {})) as mock_req:
+            client.modify(desired, previous=previous, patch_type='merge')
+            self.assertEqual(mock_req.call_args[1]['json'], {'spec': {'b': 3}})
+
+    def test_modify_from_live(self):
+        client = KubernetesClient(self.config)
+        live = {'apiVersion': 'v1', 'kind': 'Pod', 'status': {'phase': 'Running'},
+                'metadata': {'name': 'test', 'uid': 'u', 'resourceVersion': '7', 'generation': 1,
+                             'creationTimestamp': 't', 'selfLink': '/l', 'managedFields': []}}
+        desired = {'apiVersion': 'v1', 'kind': 'Pod', 'metadata': {'name': 'test', 'labels': {'a': 'b'}}}
+        with patch.object(client.session, 'request', return_value=helper.make_response(200, {})) as mock_req:
+            client.modify(desired, previous=live)
+            self.assertEqual(mock_req.call_args[1]['json'], [
+                {'op': 'test', 'path': '/metadata/resourceVersion', 'value': '7'},
+                {'op': 'add', 'path': '/metadata/labels', 'value': {'a': 'b'}},
+            ])
+            client.modify(desired, previous=live, patch_type='merge')
+            self.assertEqual(mock_req.call_args[1]['json'], {'metadata': {'labels': {'a': 'b'}}})
+
+    def test_modify_unchanged(self):
+        client = KubernetesClient(self.config)
+        obj = {'apiVersion': 'v1', 'kind': 'Pod', 'metadata': {'name': 'test'}}
+        with patch.object(client.session, 'request') as mock_req:
+            self.assertIsNone(client.modify(obj, previous=obj))
+            self.assertFalse(mock_req.called)
+
+    def test_modify_unknown_patch_type(self):
+        client = KubernetesClient(self.config)
+        obj = {'apiVersion': 'v1', 'kind': 'Pod', 'metadata': {'name': 'test'}}
+        with self.assertRaises(KubeShiftError):
+            client.modify(obj, previous=obj, patch_type='fake')
+
+    def test_dry_run(self):
+        client = KubernetesClient(self.config)
+        client._server_version = (1, 5)
+        obj = {'apiVersion': 'v1', 'kind': 'ReplicationController', 'metadata': {'name': 'test'}}
+        with patch.object(client.session, 'request', return_value=helper.make_response(200, {})) as mock_req:
+            for func in [client.create, client.replace, client.modify, client.delete]:
+                func(obj, dry_run=True)
+                self.assertTrue(mock_req.call_args[0][1].endswith('?dryRun=All'))
+            # no scale down of the replication controller when validating the delete
+            self.assertEqual(mock_req.call_count, 4)
+
+    def test_create_by_file_dry_run_workers(self):
+        client = KubernetesClient(self.config)
+        with patch.object(requests.Session, 'request', return_value=helper.make_response(200, {})) as mock_req:
+            resp = client.create_by_file(os.path.join(FIXTURE_DIR, 'yaml', 'es-rc.yaml'), dry_run=True, workers=4)
+            self.assertEqual(len(resp), 2)
+            self.assertEqual(mock_req.call_count, 2)
+            for call in mock_req.call_args_list:
+                self.assertTrue(call[0][1].endswith('?dryRun=All'))
+
+    def test_by_file_batch_error(self):
+        client = KubernetesClient(self.config)
+        path = os.path.join(FIXTURE_DIR, 'yaml', 'es-rc.yaml')
+        for workers in (1, 4):
+            responses = [helper.make_response(422, None), helper.make_response(200, {'created': True})]
+            with patch.object(requests.Session, 'request', side_effect=responses) as mock_req:
+                with self.assertRaises(KubeBatchError) as ctx:
+                    client.create_by_file(path, dry_run=True, workers=workers)
+                # every object is sent, whatever the number of workers
+                self.assertEqual(mock_req.call_count, 2)
+            self.assertEqual(len(ctx.exception.errors), 1)
+            self.assertEqual(ctx.exception.errors[0][2].status_code, 422)
+            self.assertEqual(sorted(ctx.exception.results, key=bool), [None, {'created': True}])
+
+    def test_by_file_fail_fast(self):
+        client = KubernetesClient(self.config)
+        path = os.path.join(FIXTURE_DIR, 'yaml', 'es-rc.yaml')
+        responses = [helper.make_response(422, None), helper.make_response(200, {'created': True})]
+        with patch.object(requests.Session, 'request', side_effect=responses) as mock_req:
+            with self.assertRaises(KubeRequestError) as ctx:
+                client.create_by_file(path)
+            # the objects after the failed one are not sent
+            self.assertEqual(mock_req.call_count, 1)
+        self.assertEqual(ctx.exception.status_code, 422)
+        self.assertTrue(issubclass(KubeBatchError, KubeShiftError))
+
+    def test_server_version(self):
+        client = KubernetesClient(self.config)
+        with patch.object(client.session, 'request',
+                          return_value=helper.make_response(200, {'major': '1', 'minor': '6+'})) as mock_req:
+            self.assertEqual(client.server_version(), (1, 6))
+            self.assertEqual(client.server_version(), (1, 6))
+            self.assertEqual(mock_req.call_count, 1)
+
+    def test_server_version_unknown(self):
+        client = KubernetesClient(self.config)
+        with patch.object(client.session, 'request', return_value=helper.make_response(404, None)):
+            self.assertEqual(client.server_version(), (0, 0))
+
+    def test_delete_rc_propagation(self):
+        client = KubernetesClient(self.config)
+        client._server_version = (1, 6)
+        with patch.object(client.session, 'request', return_value=helper.make_response(200, {})) as mock_req:
+            client.delete({'apiVersion': 'v1', 'kind': 'ReplicationController', 'metadata': {'name': 'test'}})
+            self.assertEqual(mock_req.call_count, 1)
+            self.assertEqual(mock_req.call_args[0][0], 'delete')
+            self.assertEqual(mock_req.call_args[1]['json'], {
+                'kind': 'DeleteOptions', 'apiVersion': 'v1', 'propagationPolicy': 'Background'})
+
+    def test_delete_rc_legacy(self):
+        client = KubernetesClient(self.config)
+        client._server_version = (1, 5)
+        with patch.object(client.session, 'request', return_value=helper.make_response(200, {})) as mock_req:
+            client.delete({'apiVersion': 'v1', 'kind': 'ReplicationController', 'metadata': {'name': 'test'}})
+            self.assertEqual([c[0][0] for c in mock_req.call_args_list], ['patch', 'delete'])
+            self.assertIsNone(mock_req.call_args[1]['json'])
+
+    def test_delete_options(self):
+        client = KubernetesClient(self.config)
+        with patch.object(client.session, 'request', return_value=helper.make_response(200, {})) as mock_req:
+            client.delete({'apiVersion': 'v1', 'kind': 'Pod', 'metadata': {'name': 'test'}},
+                          propagation_policy='Orphan', grace_period=0)
+            self.assertEqual(mock_req.call_args[1]['json'], {
+                'kind': 'DeleteOptions', 'apiVersion': 'v1', 'propagationPolicy': 'Orphan', 'gracePeriodSeconds': 0})
+
+    def test_delete_unknown_propagation(self):
+        client = KubernetesClient(self.config)
+        with self.assertRaises(KubeShiftError):
+            client.delete({'apiVersion': 'v1', 'kind': 'Pod', 'metadata': {'name': 'test'}}, propagation_policy='Fake')
+
+    def test_scale_subresource(self):
+        client = KubernetesClient(self.config)
+        with patch.object(client.session, 'request', return_value=helper.make_response(200, {})) as mock_req:
+            client.scale({'apiVersion': 'extensions/v1beta1', 'kind': 'Deployment', 'metadata': {'name': 'test'}},
+                         replicas=3)
+            self.assertEqual(mock_req.call_args[0][1],
+                             'http://localhost:8080/apis/extensions/v1beta1/namespaces/default/deployments/test/scale')
+            self.assertEqual(mock_req.call_args[1]['json'], {'spec': {'replicas': 3}})
+            self.assertEqual(mock_req.call_args[1]['headers'], {'Content-Type': 'application/merge-patch+json'})
+
+    def test_update_status(self):
+        client = KubernetesClient(self.config)
+        pod = {'apiVersion': 'v1', 'kind': 'Pod', 'metadata': {'name': 'test'}, 'status': {'phase': 'Failed'}}
+        with patch.object(client.session, 'request', return_value=helper.make_response(200, {})) as mock_req:
+            client.update_status(pod, namespace='dev')
+            self.assertEqual(mock_req.call_args[0][:2], ('put', 'http://localhost:8080/api/v1/namespaces/dev/pods/test/status'))
+            self.assertEqual(mock_req.call_args[1]['json'], pod)
+        self.assertRaises(KubeShiftError, client.update_status, {'apiVersion': 'v1', 'kind': 'Secret', 'metadata': {'name': 's'}})
+
+    def test_evict(self):
+        client = KubernetesClient(self.config)
+        with patch.object(client.session, 'request', return_value=helper.make_response(201, {})) as mock_req:
+            client.evict({'apiVersion': 'v1', 'kind': 'Pod', 'metadata': {'name': 'test'}}, grace_period=5, dry_run=True)
+            self.assertEqual(mock_req.call_args[0][:2],
+                             ('post', 'http://localhost:8080/api/v1/namespaces/default/pods/test/eviction?dryRun=All'))
+            self.assertEqual(mock_req.call_args[1]['json'], {
+                'apiVersion': 'policy/v1beta1', 'kind': 'Eviction', 'metadata': {'name': 'test', 'namespace': 'default'},
+                'deleteOptions': {'kind': 'DeleteOptions', 'apiVersion': 'v1', 'gracePeriodSeconds': 5}})
+
+    def test_scale_many(self):
+        client = KubernetesClient(self.config)
+        objs = [{'apiVersion': 'v1', 'kind': 'ReplicationController', 'metadata': {'name': 'rc%d' % i}} for i in range(20)]
+        with patch.object(requests.Session, 'request', return_value=helper.make_response(200, {})) as mock_req:
+            resp = client.scale_many(objs, replicas=0, workers=5)
+            self.assertEqual(len(resp), 20)
+            self.assertEqual(mock_req.call_count, 20)
+            urls = sorted(c[0][1] for c in mock_req.call_args_list)
+            self.assertEqual(urls[0], 'http://localhost:8080/api/v1/namespaces/default/replicationcontrollers/rc0/scale')
+
+    def test_scale_many_errors(self):
+        client = KubernetesClient(self.config)
+        objs = [{'apiVersion': 'v1', 'kind': 'ReplicationController', 'metadata': {'name': 'rc%d' % i}} for i in range(3)]
+
+        def respond(method, url, **kwargs):
+            return helper.make_response(404 if '/rc1/' in url else 200, {'name': url})
+
+        with patch.object(requests.Session, 'request', side_effect=respond):
+            with self.assertRaises(KubeBatchError) as ctx:
+                client.scale_many(objs, replicas=0, workers=2)
+        self.assertEqual([(kind, name) for kind, name, _ in ctx.exception.errors], [('ReplicationController', 'rc1')])
+        self.assertEqual([bool(r) for r in ctx.exception.results], [True, False, True])
+
+    def test_watch(self):
+        client = KubernetesClient(self.config)
+        events = [{'type': 'ADDED', 'object': {'metadata': {'name': 'a'}}}, '',
+                  {'type': 'DELETED', 'object': {'metadata': {'name': 'a'}}}]
+        with patch.object(client.session, 'request', return_value=helper.make_stream_response(200, events)) as mock_req:
+            result = list(client.pods().watch(selectors=[{'key': 'app'}], resource_version='10', timeout=30))
+            self.assertEqual([e['type'] for e in result], ['ADDED', 'DELETED'])
+            self.assertEqual(mock_req.call_args[0][1],
+                             'http://localhost:8080/api/v1/namespaces/default/pods'
+                             '?labelSelector=app&watch=true&resourceVersion=10&timeoutSeconds=30')
+            self.assertTrue(mock_req.call_args[1]['stream'])
+
+    def test_watch_error(self):
+        client = KubernetesClient(self.config)
+        with patch.object(client.session, 'request', return_value=helper.make_stream_response(403, [])):
+            with self.assertRaises(KubeRequestError):
+                list(client.pods().watch())
+
+    def test_wait_for_already_satisfied(self):
+        client = KubernetesClient(self.config)
+        pod = {'apiVersion': 'v1', 'kind': 'Pod', 'metadata': {'name': 'test'}, 'status': {'phase': 'Running'}}
+        with patch.object(client.session, 'request', return_value=helper.make_response(200, {'items': [pod]})) as mock_req:
+            self.assertEqual(client.wait_for(pod, 'Running', timeout=5), pod)
+            self.assertEqual(mock_req.call_count, 1)
+            self.assertEqual(mock_req.call_args[0][1], 'http://localhost:8080/api/v1/namespaces/default/pods'
+                                                       '?fieldSelector=metadata.name%3Dtest')
+
+    def test_wait_for_watch(self):
+        client = KubernetesClient(self.config)
+        pod = {'apiVersion': 'v1', 'kind': 'Pod', 'metadata': {'name': 'test'}}
+        running = {'apiVersion': 'v1', 'kind': 'Pod', 'metadata': {'name': 'test', 'resourceVersion': '12'},
+                   'status': {'phase': 'Running'}}
+        responses = [
+            helper.make_response(200, {'metadata': {'resourceVersion': '10'}, 'items': [pod]}),
+            helper.make_stream_response(200, [{'type': 'MODIFIED', 'object': pod},
+                                              {'type': 'MODIFIED', 'object': running}]),
+        ]
+        with patch.object(client.session, 'request', side_effect=responses) as mock_req:
+            self.assertEqual(client.wait_for(pod, 'Running', timeout=5), running)
+            self.assertIn('watch=true&resourceVersion=10', mock_req.call_args[0][1])
+
+    def test_wait_for_all(self):
+        client = KubernetesClient(self.config)
+        pods = [{'apiVersion': 'v1', 'kind': 'Pod', 'metadata': {'name': name}} for name in ['a', 'b']]
+        responses = [
+            helper.make_response(200, {'metadata': {'resourceVersion': '1'}, 'items': pods}),
+            helper.make_stream_response(200, [{'type': 'ERROR', 'object': {'code': 410}}]),
+            helper.make_response(200, {'metadata': {'resourceVersion': '5'}, 'items': pods[1:]}),
+            helper.make_stream_response(200, [{'type': 'DELETED', 'object': pods[1]}]),
+        ]
+        with patch.object(client.session, 'request', side_effect=responses) as mock_req:
+            self.assertEqual(client.wait_for_all(pods, 'Deleted', timeout=5), [None, None])
+            self.assertEqual(mock_req.call_count, 4)
+            self.assertEqual(mock_req.call_args_list[0][0][1], 'http://localhost:8080/api/v1/namespaces/default/pods')
+
+    def test_wait_for_watch_error(self):
+        client = KubernetesClient(self.config)
+        pod = {'apiVersion': 'v1', 'kind': 'Pod', 'metadata': {'name': 'test'}}
+        responses = [
+            helper.make_response(200, {'metadata': {'resourceVersion': '1'}, 'items': [pod]}),
+            helper.make_stream_response(200, [{'type': 'ERROR', 'object': {'code': 500, 'message': 'boom'}}]),
+        ]
+        with patch.object(client.session, 'request', side_effect=responses) as mock_req:
+            with self.assertRaises(KubeRequestError) as ctx:
+                client.wait_for(pod, 'Running', timeout=5)
+            # no list again, only expired resource versions are listed again
+            self.assertEqual(mock_req.call_count, 2)
+        self.assertEqual(ctx.exception.status_code, 500)
+
+    def test_wait_for_timeout(self):
+        client = KubernetesClient(self.config)
+        pod = {'apiVersion': 'v1', 'kind': 'Pod', 'metadata': {'name': 'test'}}
+        with patch.object(client.session, 'request', return_value=helper.make_response(200, {'items': [pod]})):
+            with self.assertRaises(KubeTimeoutError):
+                client.wait_for(pod, 'Running', timeout=0)
+
+    def test_wait_for_unknown_condition(self):
+        client = KubernetesClient(self.config)
+        with self.assertRaises(KubeShiftError):
+            client.wait_for({'apiVersion': 'v1', 'kind': 'Pod', 'metadata': {'name': 'test'}}, 'Fake')
+
+    def test_session_per_thread(self):
+        client = KubernetesClient(self.config)
+        sessions = []
+        threads = [threading.Thread(target=lambda: sessions.append(client.session)) for _ in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(set(id(s) for s in sessions + [client.session])), 4)
+        self.assertTrue(all(s.headers['Authorization'] == 'Bearer foobar' for s in sessions))
+        # every thread keeps its session
+        self.assertIs(client.session, client.session)
+        # the sessions share their connections
+        url = 'http://localhost:8080/api/v1'
+        self.assertEqual(set(id(s.get_adapter(url)) for s in sessions + [client.session]), set([id(client._pool)]))
+
+    def test_connections_shared_by_workers(self):
+        client = KubernetesClient(self.config)
+        objs = [{'apiVersion': 'v1', 'kind': 'ReplicationController', 'metadata': {'name': 'rc%d' % i}}
+                for i in range(4)]
+        with patch.object(requests.adapters.HTTPAdapter, 'send', autospec=True,
+                          return_value=helper.make_response(200, {})) as mock_send:
+            client.scale_many(objs, workers=4)
+            client.scale_many(objs, workers=4)
+        self.assertEqual(mock_send.call_count, 8)
+        self.assertTrue(all(c[0][0] is client._pool for c in mock_send.call_args_list))
+
+    def test_discover_replaces_resources(self):
+        client = KubernetesClient(self.config)
+        resources = client.api_resources
+        client.discover()
+        self.assertIsNot(client.api_resources, resources)
+        self.assertEqual(client.api_resources, resources)
+        self.assertEqual(client._generate_url('v1', 'Pod', 'default'),
+                         'http://localhost:8080/api/v1/namespaces/default/pods')
+
+    def test_session_after_fork(self):
+        client = KubernetesClient(self.config)
+        session = client.session
+        with patch('kubeshift.base.os.getpid', return_value=client._pid + 1):
+            self.assertIsNot(client.session, session)
+            self.assertIs(client.session, client.session)
+        self.assertEqual(client._pid, os.getpid() + 1)
+
+    def test_pickle(self):
+        client = KubernetesClient(self.config)
+        client._server_version = (1, 6)
+        self.mock_resources.reset_mock()
+
+        clone = pickle.loads(pickle.dumps(client))
+        self.assertFalse(self.mock_resources.called)
+        self.assertEqual(clone.api_resources, client.api_resources)
+        self.assertEqual(clone.server_version(), (1, 6))
+        self.assertIsNot(clone.session, client.session)
+        self.assertEqual(clone.session.headers['Authorization'], 'Bearer foobar')
+
+    @unittest.skipUnless(hasattr(os, 'fork') and hasattr(multiprocessing, 'get_context'), 'fork is not available')
+    def test_process_pool(self):
+        client = KubernetesClient(self.config)
+        pool = multiprocessing.get_context('fork').Pool(2)
+        try:
+            urls = pool.map(_pod_url, [(client, 'a'), (client, 'b')])
+        finally:
+            pool.close()
+            pool.join()
+        self.assertEqual(urls, ['http://localhost:8080/api/v1/namespaces/a/pods',
+                                'http://localhost:8080/api/v1/namespaces/b/pods'])
+
+    def test_resource(self):
+        client = KubernetesClient(self.config)
+        # the newest version served: batch/v1 rather than batch/v2alpha1 or extensions/v1beta1
+        self.assertEqual(client.resource('Job', namespace='dev').url,
+                         'http://localhost:8080/apis/batch/v1/namespaces/dev/jobs')
+        self.assertEqual(client.resource('Job', 'extensions/v1beta1').url,
+                         'http://localhost:8080/apis/extensions/v1beta1/namespaces/default/jobs')
+        self.assertEqual(client.resource('horizontalpodautoscalers').url,
+                         'http://localhost:8080/apis/autoscaling/v1/namespaces/default/horizontalpodautoscalers')
+        self.assertEqual(client.resource('PetSet', 'apps/v1alpha1').url,
+                         'http://localhost:8080/apis/apps/v1alpha1/namespaces/default/petsets')
+        # cluster wide resources ignore the namespace
+        self.assertEqual(client.resource('Node', namespace='dev').url, 'http://localhost:8080/api/v1/nodes')
+        self.assertRaises(KubeShiftError, client.resource, 'Missing')
+        self.assertRaises(KubeShiftError, client.resource, 'Job', 'apps/v1alpha1')
+
+    def test_resource_attribute(self):
+        client = KubernetesClient(self.config)
+        self.assertEqual(client.tokenreviews('dev').url, 'http://localhost:8080/apis/authentication.k8s.io/v1beta1/tokenreviews')
+        self.assertEqual(client.petsets().url, 'http://localhost:8080/apis/apps/v1alpha1/namespaces/default/petsets')
+        self.assertIs(client.tokenreviews, client.tokenreviews)
+        # named query APIs keep their version
+        self.assertEqual(client.jobs().url, 'http://localhost:8080/apis/extensions/v1beta1/namespaces/default/jobs')
+        self.assertFalse(hasattr(client, 'missings'))
+        self.assertFalse(hasattr(client, 'Pod'))
+
+        # accessors follow a new discovery
+        self.mock_resources.side_effect = lambda url: [] if 'authentication' in url else helper.get_resources(url)
+        client.discover()
+        self.assertFalse(hasattr(client, 'tokenreviews'))
+
+    def test_version_order(self):
+        versions = ['extensions/v1beta1', 'apps/v1alpha1', 'v1', 'apps/v1', 'apps/v1beta2', 'batch/v2alpha1', 'custom']
+        self.assertEqual(sorted(versions, key=version_order),
+                         ['v1', 'apps/v1', 'apps/v1beta2', 'extensions/v1beta1', 'batch/v2alpha1', 'apps/v1alpha1',
+                          'custom'])
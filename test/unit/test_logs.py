@@ -0,0 +1,168 @@
+import re
+import threading
+import unittest
+
+from mock import patch
+import requests
+
+from kubeshift.base import KubeBase
+from kubeshift.config import Config
+from kubeshift.exceptions import KubeRequestError
+from kubeshift.logs import LogMultiplexer, _started_containers
+
+import helper
+
+
+def _pod(name, *containers, **kwargs):
+    state = kwargs.get('state', {'running': {}})
+    return {
+        'metadata': {'name': name, 'resourceVersion': kwargs.get('version', '1')},
+        'status': {'containerStatuses': [{'name': c, 'state': state, 'containerID': kwargs.get('instance')}
+                                         for c in containers]}
+    }
+
+
+class TestLogMultiplexer(unittest.TestCase):
+
+    def setUp(self):
+        self.config = Config(helper.TEST_CONFIG)
+
+        patched_test_connection = patch.object(KubeBase, '_test_connection', side_effect=helper.test_connection)
+        self.addCleanup(patched_test_connection.stop)
+        self.mock_tc = patched_test_connection.start()
+
+        patched_get_groups = patch.object(KubeBase, '_get_groups', side_effect=helper.get_groups)
+        self.addCleanup(patched_get_groups.stop)
+        self.mock_groups = patched_get_groups.start()
+
+        patched_get_resources = patch.object(KubeBase, '_get_resources', side_effect=helper.get_resources)
+        self.addCleanup(patched_get_resources.stop)
+        self.mock_resources = patched_get_resources.start()
+
+        self.client = KubeBase(self.config)
+
+    def _serve(self, watches, logs):
+        """Serve watch events (list per connection) and log lines by (pod, container)."""
+        watches = list(watches)
+        lock = threading.Lock()
+
+        def request(method, url, **kwargs):
+            if 'watch=true' in url:
+                with lock:
+                    events = watches.pop(0) if watches else []
+                return helper.make_stream_response(200, events)
+            for (pod, container), lines in logs.items():
+                if '/pods/%s/log?container=%s&' % (pod, container) in url:
+                    return helper.make_stream_response(200, lines)
+            return helper.make_stream_response(404, [])
+        return request
+
+    def _collect(self, mux, count):
+        lines = []
+        for line in mux:
+            lines.append(line)
+            if len(lines) == count:
+                mux.stop()
+        return lines
+
+    def test_started_containers(self):
+        pod = _pod('p', 'a', 'b')
+        pod['status']['containerStatuses'].append({'name': 'c', 'state': {'waiting': {}}})
+        pod['status']['containerStatuses'][1]['state'] = {'terminated': {}}
+        self.assertEqual(_started_containers(pod), ['a', 'b'])
+        self.assertEqual(_started_containers({}), [])
+
+    def test_interleaved_prefixed_lines(self):
+        watches = [[{'type': 'ADDED', 'object': _pod('web-1', 'app', 'proxy')},
+                    {'type': 'ADDED', 'object': _pod('web-2', 'app')}]]
+        logs = {('web-1', 'app'): ['a1', 'a2'], ('web-1', 'proxy'): ['p1'], ('web-2', 'app'): ['b1']}
+        with patch.object(requests.Session, 'request', side_effect=self._serve(watches, logs)) as mock_req:
+            mux = LogMultiplexer(self.client, [{'key': 'app', 'value': 'web'}])
+            mux.retry_interval = 0.01
+            lines = self._collect(mux, 4)
+
+        self.assertEqual(sorted(lines), ['[web-1 app] a1', '[web-1 app] a2', '[web-1 proxy] p1', '[web-2 app] b1'])
+        self.assertTrue(lines.index('[web-1 app] a1') < lines.index('[web-1 app] a2'))
+        urls = [c[0][1] for c in mock_req.call_args_list]
+        self.assertIn('http://localhost:8080/api/v1/namespaces/default/pods'
+                      '?labelSelector=app+in+%28web%29&watch=true', urls)
+        self.assertIn('http://localhost:8080/api/v1/namespaces/default/pods/web-1/log'
+                      '?container=proxy&follow=true', urls)
+
+    def test_attach_started_containers(self):
+        watches = [[{'type': 'ADDED', 'object': _pod('web-1', 'app', state={'waiting': {}})},
+                    {'type': 'MODIFIED', 'object': _pod('web-1', 'app', version='2')}],
+                   [{'type': 'ADDED', 'object': _pod('web-2', 'app', version='3')}]]
+        logs = {('web-1', 'app'): ['started'], ('web-2', 'app'): ['added']}
+        with patch.object(requests.Session, 'request', side_effect=self._serve(watches, logs)) as mock_req:
+            mux = LogMultiplexer(self.client, [{'key': 'app', 'value': 'web'}], tail_lines=5, prefix='{pod}: ')
+            mux.retry_interval = 0.01
+            lines = self._collect(mux, 2)
+
+        self.assertEqual(sorted(lines), ['web-1: started', 'web-2: added'])
+        urls = [c[0][1] for c in mock_req.call_args_list]
+        self.assertIn('http://localhost:8080/api/v1/namespaces/default/pods/web-1/log'
+                      '?container=app&follow=true&tailLines=5', urls)
+        # watch resumes from the last seen version
+        self.assertIn('http://localhost:8080/api/v1/namespaces/default/pods'
+                      '?labelSelector=app+in+%28web%29&watch=true&resourceVersion=2', urls)
+
+    def test_backpressure(self):
+        watches = [[{'type': 'ADDED', 'object': _pod('web-1', 'app')}]]
+        logs = {('web-1', 'app'): ['l%d' % i for i in range(10)]}
+        with patch.object(requests.Session, 'request', side_effect=self._serve(watches, logs)):
+            mux = LogMultiplexer(self.client, [{'key': 'app', 'value': 'web'}], buffer_size=2)
+            mux.retry_interval = 0.01
+            lines = self._collect(mux, 10)
+
+        self.assertEqual(lines, ['[web-1 app] l%d' % i for i in range(10)])
+
+    def test_watch_error(self):
+        with patch.object(requests.Session, 'request', return_value=helper.make_stream_response(403, [])):
+            mux = LogMultiplexer(self.client, [{'key': 'app', 'value': 'web'}])
+            with self.assertRaises(KubeRequestError):
+                list(mux)
+
+    def test_watch_expired(self):
+        watches = [[{'type': 'ERROR', 'object': {'code': 410, 'message': 'too old'}}],
+                   [{'type': 'ADDED', 'object': _pod('web-1', 'app')}]]
+        logs = {('web-1', 'app'): ['l1']}
+        with patch.object(requests.Session, 'request', side_effect=self._serve(watches, logs)):
+            mux = LogMultiplexer(self.client, [{'key': 'app', 'value': 'web'}])
+            mux.retry_interval = 0.01
+            self.assertEqual(self._collect(mux, 1), ['[web-1 app] l1'])
+
+    def test_watch_error_event(self):
+        watches = [[{'type': 'ERROR', 'object': {'code': 500, 'message': 'internal error'}}]]
+        with patch.object(requests.Session, 'request', side_effect=self._serve(watches, {})) as mock_req:
+            mux = LogMultiplexer(self.client, [{'key': 'app', 'value': 'web'}])
+            mux.retry_interval = 0.01
+            with self.assertRaises(KubeRequestError) as ctx:
+                list(mux)
+        self.assertEqual(ctx.exception.status_code, 500)
+        self.assertEqual(mock_req.call_count, 1)
+
+    def test_follow_containers_once(self):
+        logs = {('web-1', 'app'): ['l1']}
+        with patch.object(requests.Session, 'request', side_effect=self._serve([], logs)) as mock_req:
+            mux = LogMultiplexer(self.client, [{'key': 'app', 'value': 'web'}], since=60)
+            # streams are followed synchronously
+            mux._spawn = lambda target, *args: target(*args)
+
+            def urls():
+                return [c[0][1].split('?', 1)[1] for c in mock_req.call_args_list]
+
+            mux._attach(_pod('web-1', 'app', instance='docker://1'))
+            self.assertEqual(urls(), ['container=app&follow=true&sinceSeconds=60'])
+            # the stream of the running container ended: only the lines written since
+            mux._attach(_pod('web-1', 'app', instance='docker://1', state={'terminated': {}}))
+            self.assertTrue(re.match(r'^container=app&follow=true&sinceTime=\d{4}-.*\.\d{6}Z$', urls()[-1]))
+            # every line of the terminated container was read
+            mux._attach(_pod('web-1', 'app', instance='docker://1', state={'terminated': {}}))
+            self.assertEqual(mock_req.call_count, 2)
+            # the restarted container is followed from its start
+            mux._attach(_pod('web-1', 'app', instance='docker://2'))
+            self.assertEqual(urls()[-1], 'container=app&follow=true')
+
+            mux._forget(_pod('web-1'))
+            self.assertEqual((mux.streams, mux._ended), ([], {}))
@@ -0,0 +1,76 @@
+import unittest
+
+from mock import patch
+import requests
+
+from kubeshift.base import KubeBase
+from kubeshift.config import Config
+from kubeshift.exceptions import KubeConnectionError
+from kubeshift.metrics import CONTENT_TYPE, ClientMetrics
+
+import helper
+
+
+class TestClientMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.config = Config(helper.TEST_CONFIG)
+
+        patched_test_connection = patch.object(KubeBase, '_test_connection', side_effect=helper.test_connection)
+        self.addCleanup(patched_test_connection.stop)
+        self.mock_tc = patched_test_connection.start()
+
+        patched_get_groups = patch.object(KubeBase, '_get_groups', side_effect=helper.get_groups)
+        self.addCleanup(patched_get_groups.stop)
+        self.mock_groups = patched_get_groups.start()
+
+        patched_get_resources = patch.object(KubeBase, '_get_resources', side_effect=helper.get_resources)
+        self.addCleanup(patched_get_resources.stop)
+        self.mock_resources = patched_get_resources.start()
+
+        self.client = KubeBase(self.config)
+        self.metrics = ClientMetrics(buckets=(0.1, 1)).attach(self.client)
+
+    def test_render(self):
+        with patch.object(self.client.session, 'request', return_value=helper.make_response(201, {'a': 1})):
+            self.client.create({'apiVersion': 'v1', 'kind': 'Pod', 'metadata': {'name': 'web'}})
+        with patch.object(self.client.session, 'request', side_effect=requests.exceptions.ConnectionError):
+            self.assertRaises(KubeConnectionError, self.client.pods().all)
+        with patch.object(self.client.session, 'request', return_value=helper.make_stream_response(200, [])):
+            list(self.client.pods().watch())
+
+        lines = self.metrics.render().splitlines()
+        self.assertIn('# TYPE kubeshift_requests_total counter', lines)
+        self.assertIn('kubeshift_requests_total{kind="Pod",status="201",verb="POST"} 1', lines)
+        self.assertIn('kubeshift_requests_total{kind="Pod",status="error",verb="GET"} 1', lines)
+        self.assertIn('kubeshift_requests_total{kind="Pod",status="200",verb="GET"} 1', lines)
+        self.assertIn('# TYPE kubeshift_request_duration_seconds histogram', lines)
+        self.assertIn('kubeshift_request_duration_seconds_bucket{kind="Pod",le="+Inf",verb="POST"} 1', lines)
+        self.assertIn('kubeshift_request_duration_seconds_count{kind="Pod",verb="GET"} 2', lines)
+        self.assertIn('kubeshift_received_bytes_total{kind="Pod",verb="POST"} 8', lines)
+        self.assertIn('kubeshift_watch_requests_total{kind="Pod"} 1', lines)
+        self.assertTrue(any(line.startswith('kubeshift_discovery_duration_seconds{server="http://localhost:8080"} ')
+                            for line in lines))
+
+    def test_render_buckets_cumulative(self):
+        event = type('Event', (), dict(method='GET', kind=None, status=200, url='http://localhost/version',
+                                       bytes_sent=0, bytes_received=0))
+        for duration in (0.05, 0.5, 0.5, 5):
+            event.duration = duration
+            self.metrics.record(event)
+
+        lines = self.metrics.render().splitlines()
+        self.assertIn('kubeshift_request_duration_seconds_bucket{kind="",le="0.1",verb="GET"} 1', lines)
+        self.assertIn('kubeshift_request_duration_seconds_bucket{kind="",le="1",verb="GET"} 3', lines)
+        self.assertIn('kubeshift_request_duration_seconds_bucket{kind="",le="+Inf",verb="GET"} 4', lines)
+        self.assertIn('kubeshift_request_duration_seconds_sum{kind="",verb="GET"} 6.05', lines)
+
+    def test_serve(self):
+        server = self.metrics.serve(port=0)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        resp = requests.get('http://127.0.0.1:%d/metrics' % server.server_address[1])
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.headers['Content-Type'], CONTENT_TYPE)
+        self.assertIn('# TYPE kubeshift_requests_total counter', resp.text)
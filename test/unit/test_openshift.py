@@ -1,10 +1,11 @@
 import unittest
 
 from mock import patch
+import requests
 
 from kubeshift.openshift import OpenshiftClient
 from kubeshift.config import Config
-from kubeshift.exceptions import KubeRequestError
+from kubeshift.exceptions import KubeBatchError, KubeRequestError
 from kubeshift.queries.base import Query
 
 import helper
@@ -133,3 +134,140 @@ class TestOpenshiftClient(unittest.TestCase):
             self.assertIsNotNone(getattr(client, api, None))
             result = getattr(client, api)()
             self.assertIsInstance(result, Query)
+
+    def test_create_template_dry_run(self):
+        client = OpenshiftClient(self.config)
+        template = {'apiVersion': 'v1', 'kind': 'Template', 'metadata': {'name': 'test'}, 'objects': [
+            {'apiVersion': 'v1', 'kind': 'BuildConfig', 'metadata': {'name': 'test'}}
+        ]}
+        with patch.object(client.session, 'request', return_value=helper.make_response(200, template)) as mock_req:
+            client.create(template, dry_run=True)
+            self.assertTrue(mock_req.call_args[0][1].endswith('/buildconfigs?dryRun=All'))
+
+    def test_create_template_order(self):
+        client = OpenshiftClient(self.config)
+        client._server_version = (1, 6)
+        template = {'apiVersion': 'v1', 'kind': 'Template', 'metadata': {'name': 'test'}, 'objects': [
+            {'apiVersion': 'v1', 'kind': 'DeploymentConfig', 'metadata': {'name': 'dc'}},
+            {'apiVersion': 'v1', 'kind': 'Service', 'metadata': {'name': 'svc'}},
+            {'apiVersion': 'v1', 'kind': 'Secret', 'metadata': {'name': 'secret'}},
+            {'apiVersion': 'v1', 'kind': 'ConfigMap', 'metadata': {'name': 'cm'}},
+        ]}
+        with patch.object(requests.Session, 'request', return_value=helper.make_response(200, template)) as mock_req:
+            client.create(template)
+            urls = [c[0][1].rsplit('/', 1)[-1] for c in mock_req.call_args_list]
+            self.assertEqual(sorted(urls[:2]), ['configmaps', 'secrets'])
+            self.assertEqual(urls[2:], ['services', 'deploymentconfigs'])
+
+            mock_req.reset_mock()
+            client.delete(template)
+            urls = [c[0][1].rsplit('/', 2)[-2] for c in mock_req.call_args_list]
+            self.assertEqual(urls[:2], ['deploymentconfigs', 'services'])
+            self.assertEqual(sorted(urls[2:]), ['configmaps', 'secrets'])
+
+    def test_create_template_errors(self):
+        client = OpenshiftClient(self.config)
+        template = {'apiVersion': 'v1', 'kind': 'Template', 'metadata': {'name': 'test'}, 'objects': [
+            {'apiVersion': 'v1', 'kind': 'Secret', 'metadata': {'name': 'a'}},
+            {'apiVersion': 'v1', 'kind': 'Secret', 'metadata': {'name': 'b'}},
+            {'apiVersion': 'v1', 'kind': 'Service', 'metadata': {'name': 'svc'}},
+        ]}
+
+        def respond(method, url, **kwargs):
+            if url.endswith('/processedtemplates'):
+                return helper.make_response(200, template)
+            return helper.make_response(409, None)
+
+        with patch.object(requests.Session, 'request', side_effect=respond) as mock_req:
+            with self.assertRaises(KubeBatchError) as ctx:
+                client.create(template)
+            self.assertEqual(sorted(e[1] for e in ctx.exception.errors), ['a', 'b'])
+            # services depending on the failed secrets are not created
+            self.assertEqual(mock_req.call_count, 2)
+
+    def test_delete_template_errors(self):
+        client = OpenshiftClient(self.config)
+        template = {'apiVersion': 'v1', 'kind': 'Template', 'metadata': {'name': 'test'}, 'objects': [
+            {'apiVersion': 'v1', 'kind': 'Secret', 'metadata': {'name': 'a'}},
+            {'apiVersion': 'v1', 'kind': 'Service', 'metadata': {'name': 'svc'}},
+        ]}
+
+        def respond(method, url, **kwargs):
+            if url.endswith('/processedtemplates'):
+                return helper.make_response(200, template)
+            return helper.make_response(404, None)
+
+        with patch.object(client.session, 'request', side_effect=respond) as mock_req:
+            with self.assertRaises(KubeBatchError) as ctx:
+                client.delete(template)
+            self.assertEqual(len(ctx.exception.errors), 2)
+            self.assertEqual(mock_req.call_count, 2)
+
+    def test_template_cache(self):
+        client = OpenshiftClient(self.config)
+        client.local_templates = False
+        template = {'apiVersion': 'v1', 'kind': 'Template', 'metadata': {'name': 'test'}, 'objects': [
+            {'apiVersion': 'v1', 'kind': 'BuildConfig', 'metadata': {'name': 'test'}}
+        ]}
+        with patch.object(client.session, 'request', return_value=helper.make_response(200, template)) as mock_req:
+            client.create(template)
+            self.assertEqual(mock_req.call_args_list[0][0][1],
+                             'http://localhost:8080/oapi/v1/namespaces/default/processedtemplates')
+            self.assertEqual(mock_req.call_count, 2)
+
+            client.create(template)
+            self.assertEqual(mock_req.call_count, 3)
+
+            changed = dict(template, parameters=[{'name': 'A', 'value': 'b'}])
+            client.create(changed)
+            self.assertEqual(mock_req.call_count, 5)
+
+            # processed again in another namespace
+            client.create(template, namespace='other')
+            self.assertEqual(mock_req.call_count, 7)
+
+    def test_template_cache_generated(self):
+        client = OpenshiftClient(self.config)
+        template = {'apiVersion': 'v1', 'kind': 'Template', 'metadata': {'name': 'test'},
+                    'parameters': [{'name': 'PASSWORD', 'generate': 'expression', 'from': '[a-z]{16}'}],
+                    'objects': [{'apiVersion': 'v1', 'kind': 'Secret', 'metadata': {'name': 'db'},
+                                 'stringData': {'password': '${PASSWORD}'}}]}
+        with patch.object(client.session, 'request', return_value=helper.make_response(200, {})) as mock_req:
+            first = client.create(template)
+            second = client.create(template)
+            self.assertNotEqual(first['objects'][0]['stringData'], second['objects'][0]['stringData'])
+
+            # the delete finds the objects of the last create
+            self.assertEqual(client.delete(template), second)
+            self.assertEqual(mock_req.call_count, 3)
+
+    def test_create_template_local(self):
+        client = OpenshiftClient(self.config)
+        template = {'apiVersion': 'v1', 'kind': 'Template', 'metadata': {'name': 'test'},
+                    'parameters': [{'name': 'NAME', 'value': 'web'}, {'name': 'REPLICAS', 'value': '2'}],
+                    'objects': [{'apiVersion': 'v1', 'kind': 'DeploymentConfig',
+                                 'metadata': {'name': '${NAME}'}, 'spec': {'replicas': '${{REPLICAS}}'}}]}
+        with patch.object(client.session, 'request', return_value=helper.make_response(200, {})) as mock_req:
+            data = client.create(template)
+            self.assertEqual(mock_req.call_count, 1)
+            self.assertEqual(mock_req.call_args[0][1], 'http://localhost:8080/oapi/v1/namespaces/default/deploymentconfigs')
+            self.assertEqual(mock_req.call_args[1]['json']['metadata']['name'], 'web')
+            self.assertEqual(mock_req.call_args[1]['json']['spec']['replicas'], 2)
+            self.assertEqual(data['objects'], [mock_req.call_args[1]['json']])
+
+    def test_create_template_local_fallback(self):
+        client = OpenshiftClient(self.config)
+        template = {'apiVersion': 'v1', 'kind': 'Template', 'metadata': {'name': 'test'}, 'labels': {'app': 'test'},
+                    'objects': [{'apiVersion': 'v1', 'kind': 'BuildConfig', 'metadata': {'name': 'test'}}]}
+        with patch.object(client.session, 'request', return_value=helper.make_response(200, template)) as mock_req:
+            client.create(template)
+            self.assertEqual(mock_req.call_args_list[0][0][1],
+                             'http://localhost:8080/oapi/v1/namespaces/default/processedtemplates')
+            self.assertEqual(mock_req.call_count, 2)
+
+    def test_build_logs(self):
+        client = OpenshiftClient(self.config)
+        with patch.object(client.session, 'request', return_value=helper.make_stream_response(200, ['step 1'])) as mock_req:
+            self.assertEqual(list(client.builds().logs('app-1', follow=True)), ['step 1'])
+            self.assertEqual(mock_req.call_args[0][1],
+                             'http://localhost:8080/oapi/v1/namespaces/default/builds/app-1/log?follow=true')
@@ -0,0 +1,82 @@
+import os
+import pstats
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from mock import patch
+import requests
+
+from kubeshift.base import KubeBase
+from kubeshift.config import Config
+from kubeshift.constants import PROFILE_ENV
+from kubeshift import profiling
+
+import helper
+
+
+class TestProfiling(unittest.TestCase):
+
+    def setUp(self):
+        self.config = Config(helper.TEST_CONFIG)
+
+        patched_test_connection = patch.object(KubeBase, '_test_connection', side_effect=helper.test_connection)
+        self.addCleanup(patched_test_connection.stop)
+        self.mock_tc = patched_test_connection.start()
+
+        patched_get_groups = patch.object(KubeBase, '_get_groups', side_effect=helper.get_groups)
+        self.addCleanup(patched_get_groups.stop)
+        self.mock_groups = patched_get_groups.start()
+
+        patched_get_resources = patch.object(KubeBase, '_get_resources', side_effect=helper.get_resources)
+        self.addCleanup(patched_get_resources.stop)
+        self.mock_resources = patched_get_resources.start()
+
+        self.client = KubeBase(self.config)
+
+        fd, self.path = tempfile.mkstemp(suffix='.yaml')
+        self.addCleanup(os.remove, self.path)
+        with os.fdopen(fd, 'w') as f:
+            f.write('\n---\n'.join('{apiVersion: v1, kind: Pod, metadata: {name: p%d}}' % i for i in range(3)))
+
+    def test_disabled(self):
+        self.assertIs(profiling.measure('url'), profiling._NOOP_MEASURE)
+        self.assertEqual(self.client._generate_url('v1', 'Pod', 'default'),
+                         'http://localhost:8080/api/v1/namespaces/default/pods')
+
+    @patch.object(requests.Session, 'request')
+    def test_profile(self, mock_request):
+        mock_request.side_effect = lambda *args, **kwargs: helper.make_response(201, {'kind': 'Pod'})
+
+        with profiling.profile() as profiler:
+            self.client.create_by_file(self.path, workers=2)
+        self.assertIsNone(profiling._active)
+
+        self.assertEqual(profiler.calls['yaml'], 1)
+        self.assertEqual(profiler.calls['url'], 3)
+        self.assertEqual(profiler.calls['network'], 6)
+        self.assertEqual(profiler.calls['json'], 3)
+        self.assertTrue(profiler.elapsed > 0)
+
+        report = profiler.report().splitlines()
+        self.assertTrue(report[0].startswith('kubeshift profile: '))
+        self.assertEqual(sorted(line.split()[0] for line in report[2:]), sorted(profiling.SUBSYSTEMS))
+
+    def test_pstats(self):
+        fd, stats_path = tempfile.mkstemp(suffix='.pstats')
+        os.close(fd)
+        self.addCleanup(os.remove, stats_path)
+
+        with profiling.profile(stats_path):
+            self.client._generate_url('v1', 'Pod', 'default')
+
+        stats = pstats.Stats(stats_path)
+        self.assertTrue(any(func[2] == '_generate_url' for func in stats.stats))
+
+    def test_environment(self):
+        env = dict(os.environ, **{PROFILE_ENV: '1'})
+        proc = subprocess.Popen([sys.executable, '-c', 'import kubeshift'], env=env, stderr=subprocess.PIPE)
+        _, err = proc.communicate()
+        self.assertEqual(proc.returncode, 0)
+        self.assertIn(b'kubeshift profile: ', err)
@@ -4,6 +4,7 @@ from mock import patch
 
 from kubeshift.base import KubeBase
 from kubeshift.config import Config
+from kubeshift.exceptions import KubeShiftError
 from kubeshift.queries.base import Query
 
 import helper
@@ -115,3 +116,51 @@ class TestQuery(unittest.TestCase):
         with patch.object(client.session, 'request', return_value=helper.make_response(200, {})):
             data = client.nodes().by_name('test')
             self.assertEqual(data, {})
+
+    def test_delete_by_selector(self):
+        client = KubeBase(self.config)
+        with patch.object(client.session, 'request', return_value=helper.make_response(200, {})) as mock_req:
+            client.pods().delete(selectors=[{'key': 'app', 'value': 'test'}])
+            self.assertEqual(mock_req.call_args[0][0], 'delete')
+            self.assertEqual(mock_req.call_args[0][1],
+                             'http://localhost:8080/api/v1/namespaces/default/pods?labelSelector=app+in+%28test%29')
+            self.assertIsNone(mock_req.call_args[1]['json'])
+
+    def test_delete_by_fields(self):
+        client = KubeBase(self.config)
+        with patch.object(client.session, 'request', return_value=helper.make_response(200, {})) as mock_req:
+            client.pods().delete(selectors=[{'key': 'app'}], fields=[{'key': 'status.phase', 'value': 'Failed'}],
+                                 dry_run=True, propagation_policy='Foreground')
+            self.assertEqual(mock_req.call_args[0][1],
+                             'http://localhost:8080/api/v1/namespaces/default/pods'
+                             '?labelSelector=app&fieldSelector=status.phase%3DFailed&dryRun=All')
+            self.assertEqual(mock_req.call_args[1]['json']['propagationPolicy'], 'Foreground')
+
+    def test_delete_no_selectors(self):
+        client = KubeBase(self.config)
+        with patch.object(client.session, 'request') as mock_req:
+            with self.assertRaises(KubeShiftError):
+                client.pods().delete()
+            with self.assertRaises(KubeShiftError):
+                client.pods().delete(selectors=[{'key': 'app', 'op': 'x'}])
+            self.assertFalse(mock_req.called)
+
+    def test_logs(self):
+        client = KubeBase(self.config)
+        with patch.object(client.session, 'request', return_value=helper.make_stream_response(200, ['a', 'b', '', 'c'])) as mock_req:
+            lines = client.pods().logs('test')
+            self.assertFalse(mock_req.called)
+            self.assertEqual(list(lines), ['a', 'b', '', 'c'])
+            self.assertEqual(mock_req.call_args[0][1], 'http://localhost:8080/api/v1/namespaces/default/pods/test/log')
+            self.assertTrue(mock_req.call_args[1]['stream'])
+
+    def test_logs_params(self):
+        client = KubeBase(self.config)
+        responses = [helper.make_stream_response(200, []), helper.make_stream_response(200, [])]
+        with patch.object(client.session, 'request', side_effect=responses) as mock_req:
+            list(client.pods().logs('test', container='web', follow=True, since=60, tail_lines=10))
+            self.assertEqual(mock_req.call_args[0][1], 'http://localhost:8080/api/v1/namespaces/default/pods/test/log'
+                                                       '?container=web&follow=true&sinceSeconds=60&tailLines=10')
+            list(client.pods().logs('test', since='2016-10-01T00:00:00Z'))
+            self.assertEqual(mock_req.call_args[0][1], 'http://localhost:8080/api/v1/namespaces/default/pods/test/log'
+                                                       '?sinceTime=2016-10-01T00%3A00%3A00Z')
@@ -1,5 +1,6 @@
 import unittest
 
+from kubeshift.exceptions import KubeShiftError
 from kubeshift.queries import utils
 
 
@@ -121,3 +122,23 @@ class TestQueryUtils(unittest.TestCase):
                                    {'key': 'name', 'op': '!=', 'value': 'testapp'}]),
             '?labelSelector=tier+in+%28proxy%2Cweb%29%2Cname+notin+%28testapp%29'
         )
+
+    def test_fields_invalid_inputs(self):
+        self.assertIsNone(utils.fields_to_qs(None))
+        self.assertIsNone(utils.fields_to_qs([]))
+        self.assertIsNone(utils.fields_to_qs([{'key': 'metadata.name'}]))
+        self.assertIsNone(utils.fields_to_qs([{'key': 'metadata.name', 'value': 'x', 'op': 'in'}]))
+
+    def test_fields(self):
+        self.assertEqual(
+            utils.fields_to_qs([{'key': 'metadata.name', 'value': 'test'},
+                                {'key': 'status.phase', 'value': 'Running', 'op': '!='}]),
+            '?fieldSelector=metadata.name%3Dtest%2Cstatus.phase%21%3DRunning'
+        )
+
+    def test_delete_options(self):
+        self.assertIsNone(utils.delete_options())
+        self.assertEqual(utils.delete_options('Orphan', 5), {
+            'kind': 'DeleteOptions', 'apiVersion': 'v1', 'propagationPolicy': 'Orphan', 'gracePeriodSeconds': 5})
+        with self.assertRaises(KubeShiftError):
+            utils.delete_options('Fake')
@@ -0,0 +1,155 @@
+import os
+import pickle
+import re
+import shutil
+import tempfile
+import unittest
+
+from kubeshift.exceptions import KubeShiftError
+from kubeshift import templates
+
+
+TEMPLATE = {'apiVersion': 'v1', 'kind': 'Template', 'metadata': {'name': 'test'},
+            'parameters': [{'name': 'NAME', 'value': 'web'}],
+            'objects': [{'apiVersion': 'v1', 'kind': 'Service', 'metadata': {'name': '${NAME}'}}]}
+
+PROCESSED = {'apiVersion': 'v1', 'kind': 'Template', 'metadata': {'name': 'test'},
+             'objects': [{'apiVersion': 'v1', 'kind': 'Service', 'metadata': {'name': 'web'}}]}
+
+
+class TestTemplateCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def test_key(self):
+        other = dict(TEMPLATE, parameters=[{'name': 'NAME', 'value': 'db'}])
+        self.assertEqual(templates.TemplateCache.key(TEMPLATE), templates.TemplateCache.key(dict(TEMPLATE)))
+        self.assertNotEqual(templates.TemplateCache.key(TEMPLATE), templates.TemplateCache.key(other))
+        self.assertNotEqual(templates.TemplateCache.key(TEMPLATE, 'dev'), templates.TemplateCache.key(TEMPLATE, 'prod'))
+
+    def test_not_persisted(self):
+        cache = templates.TemplateCache(self.directory)
+        cache.set('a', PROCESSED, persist=False)
+        self.assertEqual(cache.get('a'), PROCESSED)
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_generates_values(self):
+        self.assertFalse(templates.generates_values(TEMPLATE))
+        generated = dict(TEMPLATE, parameters=[{'name': 'PASSWORD', 'generate': 'expression', 'from': '[a-z]{8}'}])
+        self.assertTrue(templates.generates_values(generated))
+        given = dict(TEMPLATE, parameters=[{'name': 'PASSWORD', 'generate': 'expression', 'value': 'secret'}])
+        self.assertFalse(templates.generates_values(given))
+
+    def test_memory(self):
+        cache = templates.TemplateCache()
+        key = cache.key(TEMPLATE)
+        self.assertIsNone(cache.get(key))
+        cache.set(key, PROCESSED)
+        self.assertEqual(cache.get(key), PROCESSED)
+
+        # cached content is not shared with callers
+        cache.get(key)['objects'].pop()
+        self.assertEqual(cache.get(key), PROCESSED)
+
+    def test_memory_eviction(self):
+        cache = templates.TemplateCache(size=2)
+        for key in ['a', 'b', 'c']:
+            cache.set(key, PROCESSED)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get('c'), PROCESSED)
+
+    def test_pickle(self):
+        cache = templates.TemplateCache(size=2)
+        cache.set('a', PROCESSED)
+        clone = pickle.loads(pickle.dumps(cache))
+        self.assertEqual(clone.get('a'), PROCESSED)
+        clone.set('b', PROCESSED)
+        self.assertIsNone(cache.get('b'))
+
+    def test_disk(self):
+        directory = os.path.join(self.directory, 'templates')
+        key = templates.TemplateCache.key(TEMPLATE)
+        templates.TemplateCache(directory).set(key, PROCESSED)
+        self.assertTrue(os.path.isfile(os.path.join(directory, 'kubeshift-template-' + key + '.json')))
+        with open(os.path.join(directory, 'other.json'), 'w') as fd:
+            fd.write('{}')
+
+        cache = templates.TemplateCache(directory)
+        self.assertEqual(cache.get(key), PROCESSED)
+
+        cache.clear()
+        self.assertIsNone(cache.get(key))
+        # files the cache did not write are left alone
+        self.assertEqual(os.listdir(directory), ['other.json'])
+
+    def test_disk_write_error(self):
+        cache = templates.TemplateCache(self.directory)
+        self.assertRaises(TypeError, cache.set, 'a', {'objects': [object()]})
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_disk_unreadable(self):
+        with open(os.path.join(self.directory, 'kubeshift-template-bad.json'), 'w') as fd:
+            fd.write('{')
+        self.assertIsNone(templates.TemplateCache(self.directory).get('bad'))
+
+
+class TestRender(unittest.TestCase):
+
+    def test_generate(self):
+        value = templates.generate('[a-z0-9]{12}')
+        self.assertEqual(len(value), 12)
+        self.assertTrue(re.match('^[a-z0-9]{12}$', value))
+
+        value = templates.generate('user-[\\d]{4}')
+        self.assertTrue(re.match('^user-[0-9]{4}$', value))
+
+        value = templates.generate('[\\w\\A]{40}')
+        self.assertEqual(len(value), 40)
+
+    def test_generate_unsupported(self):
+        for expression in [None, 'plain', '[\\x]{4}', '[z-a]{4}', '[a-z]{1000}']:
+            with self.assertRaises(templates.UnsupportedTemplate):
+                templates.generate(expression)
+
+    def test_render(self):
+        template = {
+            'apiVersion': 'v1', 'kind': 'Template', 'metadata': {'name': 'test'},
+            'parameters': [
+                {'name': 'NAME', 'value': 'web'},
+                {'name': 'REPLICAS', 'value': '3'},
+                {'name': 'PASSWORD', 'generate': 'expression', 'from': '[a-zA-Z]{8}'},
+                {'name': 'OPTIONAL'},
+            ],
+            'objects': [
+                {'apiVersion': 'v1', 'kind': 'DeploymentConfig', 'metadata': {'name': '${NAME}-dc'},
+                 'spec': {'replicas': '${{REPLICAS}}', 'labels': {'${NAME}': '${OPTIONAL}${UNKNOWN}'}}},
+                {'apiVersion': 'v1', 'kind': 'Secret', 'metadata': {'name': '${NAME}'},
+                 'stringData': {'password': '${PASSWORD}', 'name': '${{NAME}}'}},
+            ]
+        }
+        processed = templates.render(template)
+        password = processed['parameters'][2]['value']
+        self.assertEqual(len(password), 8)
+        self.assertEqual(processed['parameters'][3]['value'], '')
+        self.assertEqual(processed['objects'], [
+            {'apiVersion': 'v1', 'kind': 'DeploymentConfig', 'metadata': {'name': 'web-dc'},
+             'spec': {'replicas': 3, 'labels': {'web': '${UNKNOWN}'}}},
+            {'apiVersion': 'v1', 'kind': 'Secret', 'metadata': {'name': 'web'},
+             'stringData': {'password': password, 'name': 'web'}},
+        ])
+        # the template itself is left untouched
+        self.assertNotIn('value', template['parameters'][2])
+
+    def test_render_required(self):
+        template = {'parameters': [{'name': 'NAME', 'required': True}], 'objects': []}
+        with self.assertRaises(KubeShiftError):
+            templates.render(template)
+
+    def test_render_unsupported(self):
+        for template in [{'labels': {'app': 'test'}},
+                         {'parameters': [{'name': 'A', 'generate': 'other'}]},
+                         {'parameters': [{'name': 'A', 'value': '1'}], 'objects': [{'a': 'x${{A}}'}]}]:
+            with self.assertRaises(templates.UnsupportedTemplate):
+                templates.render(template)
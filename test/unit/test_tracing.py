@@ -0,0 +1,99 @@
+import os
+import tempfile
+import unittest
+
+from mock import patch
+import requests
+
+try:
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+except ImportError:  # pragma: no cover
+    TracerProvider = None
+
+from kubeshift.base import KubeBase
+from kubeshift.config import Config
+from kubeshift.exceptions import KubeRequestError
+from kubeshift import tracing
+
+import helper
+
+
+class TestNoopTracing(unittest.TestCase):
+
+    def test_disabled(self):
+        self.assertFalse(tracing.enabled())
+        with tracing.span('noop', {'a': 1}) as span:
+            span.set_attribute('b', 2)
+            self.assertFalse(span.is_recording())
+
+        func = lambda: None  # noqa
+        self.assertIs(tracing.wrap(func), func)
+
+
+@unittest.skipIf(TracerProvider is None, 'opentelemetry-sdk is not available')
+class TestTracing(unittest.TestCase):
+
+    def setUp(self):
+        self.config = Config(helper.TEST_CONFIG)
+
+        patched_test_connection = patch.object(KubeBase, '_test_connection', side_effect=helper.test_connection)
+        self.addCleanup(patched_test_connection.stop)
+        self.mock_tc = patched_test_connection.start()
+
+        patched_get_groups = patch.object(KubeBase, '_get_groups', side_effect=helper.get_groups)
+        self.addCleanup(patched_get_groups.stop)
+        self.mock_groups = patched_get_groups.start()
+
+        patched_get_resources = patch.object(KubeBase, '_get_resources', side_effect=helper.get_resources)
+        self.addCleanup(patched_get_resources.stop)
+        self.mock_resources = patched_get_resources.start()
+
+        self.client = KubeBase(self.config)
+
+        self.exporter = InMemorySpanExporter()
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(self.exporter))
+        tracing.enable(provider)
+        self.addCleanup(tracing.disable)
+
+    def spans(self):
+        return dict((s.name, s) for s in self.exporter.get_finished_spans())
+
+    def test_request_phases(self):
+        with patch.object(self.client.session, 'request', return_value=helper.make_response(200, {'items': []})):
+            self.client.pods().all()
+
+        spans = self.spans()
+        parent = spans['GET /api/v1/namespaces/{namespace}/pods']
+        self.assertEqual(parent.attributes['kubeshift.kind'], 'Pod')
+        self.assertEqual(parent.attributes['http.response.status_code'], 200)
+        for name in ('http.send', 'http.read', 'json.decode'):
+            self.assertEqual(spans[name].parent.span_id, parent.context.span_id)
+        self.assertEqual(spans['http.read'].attributes['http.response.body.size'], 13)
+
+    def test_request_error(self):
+        with patch.object(self.client.session, 'request', return_value=helper.make_response(404, None)):
+            self.assertRaises(KubeRequestError, self.client.pods().by_name, 'web')
+
+        span = self.spans()['GET /api/v1/namespaces/{namespace}/pods/{name}']
+        self.assertFalse(span.status.is_ok)
+        self.assertEqual(span.events[0].attributes['exception.type'], 'kubeshift.exceptions.KubeRequestError')
+
+    @patch.object(requests.Session, 'request')
+    def test_by_file_workers(self, mock_request):
+        mock_request.side_effect = lambda *args, **kwargs: helper.make_response(201, {})
+        fd, path = tempfile.mkstemp(suffix='.yaml')
+        self.addCleanup(os.remove, path)
+        with os.fdopen(fd, 'w') as f:
+            f.write('\n---\n'.join('{apiVersion: v1, kind: Pod, metadata: {name: p%d}}' % i for i in range(4)))
+
+        self.client.create_by_file(path, workers=4)
+
+        finished = self.exporter.get_finished_spans()
+        parent = [s for s in finished if s.name == 'kubeshift.create_by_file'][0]
+        posts = [s for s in finished if s.name == 'POST /api/v1/namespaces/{namespace}/pods']
+        self.assertEqual(len(posts), 4)
+        for span in posts:
+            self.assertEqual(span.parent.span_id, parent.context.span_id)